@@ -0,0 +1,78 @@
+"""composite_query_indexes
+
+Revision ID: b7d41c2e9a10
+Revises: f2aa549ef632
+Create Date: 2026-10-17 10:00:00.000000
+
+Índices compuestos alineados con las consultas de services.py y las vistas.
+Los índices de una sola columna ``ix_loans_user_id`` e ``ix_sanctions_user_id``
+quedan cubiertos por el prefijo de los nuevos compuestos y se eliminan.
+"""
+from alembic import op
+
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d41c2e9a10'
+down_revision = 'f2aa549ef632'
+branch_labels = None
+depends_on = None
+
+
+# (nombre, tabla, columnas)
+NEW_INDEXES = [
+    ("ix_loans_user_id_status", "loans", ["user_id", "status"]),
+    ("ix_loans_user_id_time_out", "loans", ["user_id", "time_out"]),
+    ("ix_loans_station_in_id_status", "loans", ["station_in_id", "status"]),
+    ("ix_loans_station_out_id_time_out", "loans", ["station_out_id", "time_out"]),
+    ("ix_loans_time_out", "loans", ["time_out"]),
+    ("ix_incidents_loan_id", "incidents", ["loan_id"]),
+    ("ix_incidents_return_report_id", "incidents", ["return_report_id"]),
+    (
+        "ix_sanctions_user_id_status_window",
+        "sanctions",
+        ["user_id", "status", "start_at", "end_at"],
+    ),
+    ("ix_sanctions_incident_id", "sanctions", ["incident_id"]),
+]
+
+# Índices reemplazados por el prefijo de un compuesto
+SUPERSEDED_INDEXES = [
+    ("ix_loans_user_id", "loans", ["user_id"]),
+    ("ix_sanctions_user_id", "sanctions", ["user_id"]),
+]
+
+
+# ---------------------------------------------------------------------------
+# Igual que en f2aa549ef632, la BD puede venir de ``create_all`` (migración
+# 0001) con parte de estos índices ya creados: sólo tocamos lo que falte.
+# ---------------------------------------------------------------------------
+
+
+def _index_names(inspector, table: str) -> set[str]:
+    return {ix["name"] for ix in inspector.get_indexes(table)}
+
+
+def upgrade() -> None:  # noqa: D401 – Alembic signature
+    inspector = inspect(op.get_bind())
+
+    for name, table, columns in NEW_INDEXES:
+        if name not in _index_names(inspector, table):
+            op.create_index(name, table, columns, unique=False)
+
+    for name, table, _columns in SUPERSEDED_INDEXES:
+        if name in _index_names(inspector, table):
+            op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    inspector = inspect(op.get_bind())
+
+    for name, table, columns in SUPERSEDED_INDEXES:
+        if name not in _index_names(inspector, table):
+            op.create_index(name, table, columns, unique=False)
+
+    for name, table, _columns in reversed(NEW_INDEXES):
+        if name in _index_names(inspector, table):
+            op.drop_index(name, table_name=table)
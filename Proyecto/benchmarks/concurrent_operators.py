@@ -0,0 +1,198 @@
+"""Benchmark de carga: N operadores concurrentes registrando préstamos y devoluciones.
+
+Cada operador simula una página de Flet en modo web: tiene su propio hilo,
+su propia estación y abre una sesión corta (``session_scope``) por acción,
+igual que hacen las vistas. Se mide la latencia de cada préstamo/devolución y
+el rendimiento total.
+
+Uso::
+
+    python benchmarks/concurrent_operators.py --operators 5 --iterations 50
+    python benchmarks/concurrent_operators.py --url postgresql://... --operators 20
+
+Sin ``--url`` se usa una BD SQLite temporal, de modo que nunca se tocan los
+datos reales.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine  # noqa: E402
+
+import database  # noqa: E402
+from database import apply_sqlite_pragmas, engine_options, session_scope  # noqa: E402
+from models import (  # noqa: E402
+    Base,
+    Bicycle,
+    BikeStatusEnum,
+    Station,
+    User,
+    UserAffiliationEnum,
+    UserRoleEnum,
+)
+from services import LoanService  # noqa: E402
+
+
+# ---------------------------------------------------------------------------
+# Preparación de datos
+# ---------------------------------------------------------------------------
+
+
+def _setup(operators: int, bikes_per_station: int) -> list[dict]:
+    """Crea una estación, bicicletas y usuarios por operador."""
+    plan = []
+    with session_scope() as db:
+        for op in range(operators):
+            station = Station(code=f"BEN{op:03d}", name=f"Benchmark {op}")
+            db.add(station)
+            db.flush()
+            bikes = [
+                Bicycle(
+                    serial_number=f"BEN-{op}-{i}",
+                    bike_code=f"BN{op:03d}{i:03d}",
+                    status=BikeStatusEnum.disponible,
+                    current_station_id=station.id,
+                )
+                for i in range(bikes_per_station)
+            ]
+            users = [
+                User(
+                    cedula=f"9{op:03d}{i:04d}",
+                    carnet=f"BEN_{op}_{i}",
+                    full_name=f"Usuario benchmark {op}-{i}",
+                    email=f"ben{op}_{i}@example.com",
+                    affiliation=UserAffiliationEnum.estudiante,
+                    role=UserRoleEnum.usuario,
+                )
+                for i in range(bikes_per_station)
+            ]
+            db.add_all(bikes + users)
+            db.flush()
+            plan.append(
+                {
+                    "station_id": station.id,
+                    "pairs": [(u.id, b.id) for u, b in zip(users, bikes)],
+                }
+            )
+        db.commit()
+    return plan
+
+
+# ---------------------------------------------------------------------------
+# Operador simulado
+# ---------------------------------------------------------------------------
+
+
+def _operator(work: dict, iterations: int, barrier: threading.Barrier, out: dict) -> None:
+    latencies: list[float] = []
+    errors = 0
+    pairs = work["pairs"]
+    station_id = work["station_id"]
+    barrier.wait()
+
+    for i in range(iterations):
+        user_id, bike_id = pairs[i % len(pairs)]
+        try:
+            start = time.perf_counter()
+            with session_scope() as db:
+                loan = LoanService.create_loan(db, user_id, bike_id, station_id, station_id)
+            latencies.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            with session_scope() as db:
+                LoanService.return_loan(db, loan.id, station_id)
+            latencies.append(time.perf_counter() - start)
+        except Exception as exc:  # noqa: BLE001
+            errors += 1
+            out.setdefault("samples", []).append(repr(exc))
+
+    out["latencies"] = latencies
+    out["errors"] = errors
+
+
+def run(operators: int, iterations: int, bikes_per_station: int) -> dict:
+    plan = _setup(operators, bikes_per_station)
+    barrier = threading.Barrier(operators + 1)
+    results = [dict() for _ in range(operators)]
+    threads = [
+        threading.Thread(target=_operator, args=(plan[i], iterations, barrier, results[i]))
+        for i in range(operators)
+    ]
+    for t in threads:
+        t.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = [x for r in results for x in r.get("latencies", [])]
+    errors = sum(r.get("errors", 0) for r in results)
+    samples = [s for r in results for s in r.get("samples", [])][:3]
+    return {
+        "operations": len(latencies),
+        "errors": errors,
+        "error_samples": samples,
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p95_ms": (
+            statistics.quantiles(latencies, n=20)[18] * 1000 if len(latencies) >= 20 else 0.0
+        ),
+        "max_ms": max(latencies) * 1000 if latencies else 0.0,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--operators", type=int, default=5, help="páginas concurrentes")
+    parser.add_argument(
+        "--iterations", type=int, default=50, help="préstamo+devolución por operador"
+    )
+    parser.add_argument("--bikes", type=int, default=10, help="bicicletas por estación")
+    parser.add_argument("--url", default=None, help="URL de BD (por defecto SQLite temporal)")
+    args = parser.parse_args(argv)
+
+    tmpdir = None
+    url = args.url
+    if url is None:
+        tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{os.path.join(tmpdir.name, 'benchmark.db')}"
+
+    engine = create_engine(url, **engine_options(url))
+    if url.startswith("sqlite"):
+        apply_sqlite_pragmas(engine)
+    Base.metadata.create_all(engine)
+    database.SessionLocal.configure(bind=engine)
+
+    try:
+        stats = run(args.operators, args.iterations, args.bikes)
+    finally:
+        engine.dispose()
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+    print(f"Operadores:   {args.operators}")
+    print(f"Operaciones:  {stats['operations']} ({stats['errors']} errores)")
+    print(f"Tiempo total: {stats['elapsed']:.2f} s")
+    print(f"Rendimiento:  {stats['throughput']:.1f} ops/s")
+    print(
+        f"Latencia:     p50 {stats['p50_ms']:.1f} ms · p95 {stats['p95_ms']:.1f} ms · máx {stats['max_ms']:.1f} ms"
+    )
+    for sample in stats["error_samples"]:
+        print(f"  error: {sample}")
+
+
+if __name__ == "__main__":
+    main()
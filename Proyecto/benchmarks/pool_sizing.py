@@ -0,0 +1,81 @@
+"""Benchmark del pool de conexiones para la capa de servicios.
+
+Corre el escenario de ``concurrent_operators`` (N operadores haciendo
+préstamos y devoluciones) con distintas configuraciones de pool: sin pool
+(``NullPool``, una conexión nueva por sesión) y ``QueuePool`` de varios
+tamaños. Sirve para validar ``DB_POOL_SIZE``/``DB_MAX_OVERFLOW`` antes de
+desplegar contra PostgreSQL.
+
+Uso::
+
+    python benchmarks/pool_sizing.py --operators 10
+    python benchmarks/pool_sizing.py --url postgresql://... --sizes 2 5 10 20
+
+Sin ``--url`` se usa una BD SQLite temporal (con ``SQLITE_PRAGMAS``). Contra
+una URL real se crean estaciones/bicicletas/usuarios con prefijo ``BEN``:
+use una BD de pruebas.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+import database  # noqa: E402
+from concurrent_operators import run  # noqa: E402
+from database import apply_sqlite_pragmas, engine_options  # noqa: E402
+from models import Base  # noqa: E402
+
+
+def _engine_for(url: str, pool_size: int | None):
+    options = engine_options(url)
+    if pool_size is None:
+        for key in ("pool_size", "max_overflow", "pool_timeout", "pool_recycle"):
+            options.pop(key, None)
+        options["poolclass"] = NullPool
+    else:
+        options.update(pool_size=pool_size, max_overflow=0)
+    engine = create_engine(url, **options)
+    if url.startswith("sqlite"):
+        apply_sqlite_pragmas(engine)
+    return engine
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--operators", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--bikes", type=int, default=10)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--url", default=None)
+    args = parser.parse_args(argv)
+
+    print(f"{'pool':<10} {'ops/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errores':>8}")
+    for size in [None, *args.sizes]:
+        with tempfile.TemporaryDirectory() as tmp:
+            url = args.url or f"sqlite:///{os.path.join(tmp, 'pool.db')}"
+            engine = _engine_for(url, size)
+            Base.metadata.create_all(engine)
+            database.SessionLocal.configure(bind=engine)
+            try:
+                stats = run(args.operators, args.iterations, args.bikes)
+            finally:
+                engine.dispose()
+
+        label = "NullPool" if size is None else f"Queue/{size}"
+        print(
+            f"{label:<10} {stats['throughput']:>8.1f} {stats['p50_ms']:>8.1f} "
+            f"{stats['p95_ms']:>8.1f} {stats['errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
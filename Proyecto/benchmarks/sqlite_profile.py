@@ -0,0 +1,65 @@
+"""Benchmark del perfil SQLite: préstamos/devoluciones con y sin ``SQLITE_PRAGMAS``.
+
+Ejecuta el mismo escenario de ``concurrent_operators`` sobre dos BD SQLite
+temporales: una con la configuración por defecto de SQLite (journal de
+*rollback*, ``synchronous=FULL``, sin ``busy_timeout``) y otra con el perfil
+definido en ``config.SQLITE_PRAGMAS``. Reporta rendimiento, latencias y los
+errores "database is locked" de cada una.
+
+Uso::
+
+    python benchmarks/sqlite_profile.py --operators 5 --iterations 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine  # noqa: E402
+
+import database  # noqa: E402
+from concurrent_operators import run  # noqa: E402
+from config import SQLITE_PRAGMAS  # noqa: E402
+from database import apply_sqlite_pragmas, engine_options  # noqa: E402
+from models import Base  # noqa: E402
+
+
+def _run_profile(pragmas: dict, operators: int, iterations: int, bikes: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'profile.db')}"
+        engine = create_engine(url, **engine_options(url))
+        apply_sqlite_pragmas(engine, pragmas)
+        Base.metadata.create_all(engine)
+        database.SessionLocal.configure(bind=engine)
+        try:
+            return run(operators, iterations, bikes)
+        finally:
+            engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--operators", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--bikes", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    print(f"{'perfil':<10} {'ops/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errores':>8}")
+    for name, pragmas in (("default", {}), ("tuned", SQLITE_PRAGMAS)):
+        stats = _run_profile(pragmas, args.operators, args.iterations, args.bikes)
+        print(
+            f"{name:<10} {stats['throughput']:>8.1f} {stats['p50_ms']:>8.1f} "
+            f"{stats['p95_ms']:>8.1f} {stats['errors']:>8}"
+        )
+        for sample in stats["error_samples"]:
+            print(f"  error: {sample[:100]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,149 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from config import DATABASE_URL
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, sessionmaker
+from config import (
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_TIMEOUT_MS,
+    INSTRUMENTATION,
+    SQLITE_PRAGMAS,
+)
 from models import Base
+import instrumentation
+
+# Pool dimensionado para varios operadores concurrentes (ver config.py)
+POOL_OPTIONS = {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_pre_ping": DB_POOL_PRE_PING,
+    "pool_recycle": DB_POOL_RECYCLE,
+}
+
+
+def engine_options(url: str) -> dict:
+    """Argumentos de ``create_engine`` adecuados para el motor de *url*."""
+    if url.startswith("postgresql"):
+        # For PostgreSQL, add encoding parameters (y límite por sentencia)
+        options = "-c client_encoding=utf8"
+        if DB_STATEMENT_TIMEOUT_MS:
+            options += f" -c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+        return {
+            "connect_args": {"client_encoding": "utf8", "options": options},
+            **POOL_OPTIONS,
+        }
+    if url.startswith("sqlite") and ":memory:" not in url:
+        # SQLite en archivo usa QueuePool: las sesiones se abren desde los hilos
+        # de cada página, por lo que la conexión no se ata a un único hilo
+        return {"connect_args": {"check_same_thread": False}, **POOL_OPTIONS}
+    # For other databases
+    return {}
+
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+
+
+def apply_sqlite_pragmas(target_engine, pragmas: dict | None = None) -> None:
+    """Ejecuta *pragmas* (por defecto ``SQLITE_PRAGMAS``) en cada conexión nueva."""
+    pragmas = SQLITE_PRAGMAS if pragmas is None else pragmas
+    if not pragmas:
+        return
 
-# Configure engine with proper encoding settings
-if DATABASE_URL.startswith("postgresql"):
-    # For PostgreSQL, add encoding parameters
-    engine = create_engine(
-        DATABASE_URL, connect_args={"client_encoding": "utf8", "options": "-c client_encoding=utf8"}
-    )
-else:
-    # For SQLite and other databases
-    engine = create_engine(DATABASE_URL)
+    @event.listens_for(target_engine, "connect")
+    def _set_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+if engine.dialect.name == "sqlite" and ":memory:" not in DATABASE_URL:
+    apply_sqlite_pragmas(engine)
+
+if INSTRUMENTATION:
+    instrumentation.enable(engine)
+
+# ``expire_on_commit=False``: los objetos siguen siendo legibles después de
+# cerrar la sesión (p.ej. el usuario autenticado que guarda la app).
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 
 def create_tables():
     Base.metadata.create_all(bind=engine)
 
 
+# ---------------------------------------------------------------------------
+# Versión del esquema
+# ---------------------------------------------------------------------------
+# Cabeza de ``alembic/versions``: actualizar junto con cada migración nueva.
+SCHEMA_REVISION = "b7d41c2e9a10"
+
+
+class SchemaVersionError(RuntimeError):
+    """La BD no está migrada a la revisión que espera el código."""
+
+
+def current_schema_revision(bind=None) -> str | None:
+    """Revisión de Alembic aplicada a la BD (``None`` si nunca se migró)."""
+    try:
+        with (bind or engine).connect() as conn:
+            return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except DBAPIError:
+        # Sin tabla alembic_version
+        return None
+
+
+def check_schema_revision(bind=None) -> None:
+    """Falla rápido si la BD no está en ``SCHEMA_REVISION``.
+
+    Es una sola consulta, pensada para el arranque en producción en lugar de
+    ``create_all`` (que refleja cada tabla).
+    """
+    revision = current_schema_revision(bind)
+    if revision != SCHEMA_REVISION:
+        raise SchemaVersionError(
+            f"Esquema en revisión {revision or 'ninguna'}, se esperaba {SCHEMA_REVISION}: "
+            "ejecute 'alembic upgrade head'"
+        )
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+@contextmanager
+def session_scope(session: Session | None = None) -> Iterator[Session]:
+    """Unidad de trabajo: una sesión corta por acción del usuario.
+
+    Abre una sesión nueva, la revierte si ocurre una excepción y siempre la
+    cierra al salir, de modo que el *identity map* no crece indefinidamente y
+    cada página/hilo trabaja con su propia conexión.
+
+    Si se pasa *session* (una sesión "fijada", p.ej. la que inyectan las
+    pruebas en ``app.db``) se reutiliza tal cual y no se cierra.
+    """
+    if session is not None:
+        yield session
+        return
+
+    db = SessionLocal()
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
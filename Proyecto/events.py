@@ -0,0 +1,240 @@
+"""Bus de eventos de dominio en proceso.
+
+Los servicios anuncian lo que cambiaron con eventos tipados (``LoanOpened``,
+``LoanClosed``, ``SanctionCreated``, ``FavoriteChanged``...) mediante
+``emit(db, evento)``. Los eventos se acumulan en la sesión y sólo se
+publican cuando la transacción se confirma (``after_commit``); un *rollback*
+los descarta, así nadie reacciona a un cambio que no llegó a la BD.
+
+Los suscriptores se registran por tipo de evento (una clase base recibe
+también sus subclases) y pueden ser funciones normales, que se llaman en el
+hilo que hizo el commit, o corrutinas, que se programan en el *event loop*
+indicado al suscribirse. Los suscriptores no deben usar la sesión que
+publicó el evento.
+
+Cada suscriptor pertenece a una etapa: primero corren los de
+``STAGE_UPDATE`` (modelos en memoria como occupancy.py o la caché de
+sanciones) y después los de ``STAGE_NOTIFY`` (live_updates.py), que leen
+esos modelos. Dentro de una etapa se respeta el orden de suscripción.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from bisect import bisect_right
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models import BikeStatusEnum
+
+logger = logging.getLogger("vecirun.events")
+
+_PENDING_KEY = "domain_events_pending"
+
+# Etapas de entrega (ver docstring del módulo)
+STAGE_UPDATE = 0
+STAGE_NOTIFY = 1
+
+
+# ----------------------------------------------------------------------
+# Eventos
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class DomainEvent:
+    """Base de todos los eventos.
+
+    ``topics`` son los datos afectados, con los mismos nombres que
+    ``View.cache_topics`` (ver view_cache.py).
+    """
+
+    topics = frozenset()
+
+
+@dataclass(frozen=True)
+class UserCreated(DomainEvent):
+    topics = frozenset({"users"})
+
+    user_id: uuid.UUID
+
+
+@dataclass(frozen=True)
+class BikeStatusChanged(DomainEvent):
+    topics = frozenset({"bikes"})
+
+    bike_id: uuid.UUID
+    status: BikeStatusEnum
+    previous_status: BikeStatusEnum | None = None
+    # Estación donde está la bicicleta (ver occupancy.py)
+    station_id: uuid.UUID | None = None
+
+
+@dataclass(frozen=True)
+class LoanOpened(DomainEvent):
+    topics = frozenset({"loans", "bikes"})
+
+    loan_id: uuid.UUID
+    user_id: uuid.UUID
+    bike_id: uuid.UUID
+    station_out_id: uuid.UUID
+    # Estación de llegada prevista, si se indicó al prestar
+    station_in_id: uuid.UUID | None = None
+    # Estación donde estaba disponible la bicicleta (ver occupancy.py)
+    previous_station_id: uuid.UUID | None = None
+
+
+@dataclass(frozen=True)
+class LoanClosed(DomainEvent):
+    topics = frozenset({"loans", "bikes"})
+
+    loan_id: uuid.UUID
+    user_id: uuid.UUID
+    bike_id: uuid.UUID
+    station_in_id: uuid.UUID
+    station_out_id: uuid.UUID | None = None
+    # Estación donde figuraba disponible la bicicleta antes de la devolución
+    # (normalmente ninguna: estaba prestada)
+    previous_station_id: uuid.UUID | None = None
+
+
+@dataclass(frozen=True)
+class FavoriteChanged(DomainEvent):
+    topics = frozenset({"favorites"})
+
+    user_id: uuid.UUID
+    bike_id: uuid.UUID | None
+
+
+@dataclass(frozen=True)
+class IncidentReported(DomainEvent):
+    topics = frozenset({"incidents"})
+
+    incident_id: uuid.UUID
+    loan_id: uuid.UUID
+    bike_id: uuid.UUID
+
+
+@dataclass(frozen=True)
+class ReturnReportCreated(DomainEvent):
+    topics = frozenset({"incidents"})
+
+    report_id: uuid.UUID
+    loan_id: uuid.UUID
+    total_incident_days: int
+
+
+@dataclass(frozen=True)
+class SanctionCreated(DomainEvent):
+    topics = frozenset({"sanctions"})
+
+    sanction_id: uuid.UUID
+    user_id: uuid.UUID
+    incident_id: uuid.UUID | None
+
+
+@dataclass(frozen=True)
+class SanctionAppealed(DomainEvent):
+    topics = frozenset({"sanctions"})
+
+    sanction_id: uuid.UUID
+    user_id: uuid.UUID
+
+
+@dataclass(frozen=True)
+class SanctionResolved(DomainEvent):
+    topics = frozenset({"sanctions"})
+
+    sanction_id: uuid.UUID
+    user_id: uuid.UUID
+    approved: bool
+
+
+# ----------------------------------------------------------------------
+# Bus
+# ----------------------------------------------------------------------
+Handler = Callable[[DomainEvent], object]
+
+
+class EventBus:
+    """Publicación/suscripción en proceso, segura entre hilos."""
+
+    def __init__(self) -> None:
+        self._subscribers: list[tuple[type, Handler, asyncio.AbstractEventLoop | None, int]] = []
+        self._lock = Lock()
+
+    def subscribe(
+        self,
+        event_type: type[DomainEvent],
+        handler: Handler,
+        *,
+        loop: asyncio.AbstractEventLoop | None = None,
+        stage: int = STAGE_UPDATE,
+    ) -> Callable[[], None]:
+        """Registra *handler* para *event_type* y devuelve la función para darse de baja.
+
+        Las corrutinas se ejecutan en *loop* (por defecto, el loop en curso).
+        *stage* decide si corre con los modelos en memoria o después de ellos.
+        """
+        if asyncio.iscoroutinefunction(handler) and loop is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                raise ValueError("Un suscriptor asíncrono requiere 'loop'") from None
+        entry = (event_type, handler, loop if asyncio.iscoroutinefunction(handler) else None, stage)
+        with self._lock:
+            # Al final de su etapa
+            index = bisect_right([e[3] for e in self._subscribers], stage)
+            self._subscribers.insert(index, entry)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if entry in self._subscribers:
+                    self._subscribers.remove(entry)
+
+        return unsubscribe
+
+    def publish(self, domain_event: DomainEvent) -> None:
+        """Entrega *domain_event* ahora; los errores de un suscriptor sólo se registran."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for event_type, handler, loop, _stage in subscribers:
+            if not isinstance(domain_event, event_type):
+                continue
+            try:
+                if loop is None:
+                    handler(domain_event)
+                elif not loop.is_closed():
+                    future = asyncio.run_coroutine_threadsafe(handler(domain_event), loop)
+                    future.add_done_callback(_log_async_failure)
+            except Exception:
+                logger.exception("Suscriptor %r falló con %r", handler, domain_event)
+
+
+def _log_async_failure(future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Suscriptor asíncrono falló", exc_info=future.exception())
+
+
+bus = EventBus()
+subscribe = bus.subscribe
+
+
+def emit(db: Session, domain_event: DomainEvent) -> None:
+    """Encola *domain_event* para publicarlo cuando se confirme *db*."""
+    db.info.setdefault(_PENDING_KEY, []).append(domain_event)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    for domain_event in session.info.pop(_PENDING_KEY, ()):
+        bus.publish(domain_event)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
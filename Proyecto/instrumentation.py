@@ -0,0 +1,191 @@
+"""Instrumentación opcional de consultas SQL por servicio y por vista.
+
+Con ``VECIRUN_INSTRUMENTATION=1`` se registran listeners
+``before_cursor_execute``/``after_cursor_execute`` sobre el motor de
+``database.py``. Cada sentencia se atribuye a los ámbitos activos en el hilo
+actual: los métodos públicos de las clases ``*Service`` (ver
+``instrument_class``) y ``<Vista>.build`` (ver ``views.base.View``). Los
+totales son inclusivos: un ``DashboardView.build`` cuenta también las
+sentencias de los servicios que invoca.
+
+Al cerrar cada ámbito se emite una línea JSON en el logger
+``vecirun.instrumentation`` y se acumula en ``stats``, que es lo que muestra el
+panel de administración (``views/instrumentation_view.py``). Desactivada, la
+única sobrecarga es comprobar una bandera por llamada.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from threading import Lock
+from typing import Callable, Iterator
+
+from sqlalchemy import event
+
+logger = logging.getLogger("vecirun.instrumentation")
+
+UNATTRIBUTED = "(sin atribuir)"
+_START_KEY = "instrumentation_start"
+
+_enabled = False
+# Pila de ámbitos activos: cada marco es [etiqueta, sentencias, sql_ms]
+_frames: ContextVar[tuple[list, ...]] = ContextVar("instrumentation_frames", default=())
+
+
+class QueryStats:
+    """Acumulado por ámbito: llamadas, sentencias y tiempos (ms)."""
+
+    def __init__(self) -> None:
+        self._data: dict[str, dict] = {}
+        self._lock = Lock()
+
+    def _entry(self, label: str) -> dict:
+        return self._data.setdefault(
+            label,
+            {
+                "calls": 0,
+                "statements": 0,
+                "max_statements": 0,
+                "sql_ms": 0.0,
+                "wall_ms": 0.0,
+            },
+        )
+
+    def record_statement(self, elapsed_ms: float) -> None:
+        """Sentencia fuera de cualquier ámbito instrumentado."""
+        with self._lock:
+            entry = self._entry(UNATTRIBUTED)
+            entry["statements"] += 1
+            entry["sql_ms"] += elapsed_ms
+
+    def record_call(self, label: str, statements: int, sql_ms: float, wall_ms: float) -> None:
+        with self._lock:
+            entry = self._entry(label)
+            entry["calls"] += 1
+            entry["statements"] += statements
+            entry["max_statements"] = max(entry["max_statements"], statements)
+            entry["sql_ms"] += sql_ms
+            entry["wall_ms"] += wall_ms
+
+    def snapshot(self) -> dict[str, dict]:
+        """Copia de los acumulados, segura para leer desde otro hilo."""
+        with self._lock:
+            return {label: dict(entry) for label, entry in self._data.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+stats = QueryStats()
+
+
+# ---------------------------------------------------------------------------
+# Activación
+# ---------------------------------------------------------------------------
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable(engine) -> None:
+    """Empieza a medir las sentencias de *engine* (idempotente)."""
+    global _enabled
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+    _enabled = True
+
+
+def disable(engine) -> None:
+    global _enabled
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", _after_cursor_execute)
+        event.remove(engine, "handle_error", _handle_error)
+    _enabled = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Inicio por cursor: una sentencia que falla no llega a after_cursor_execute
+    conn.info.setdefault(_START_KEY, {})[cursor] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info[_START_KEY].pop(cursor)) * 1000
+
+    frames = _frames.get()
+    if not frames:
+        stats.record_statement(elapsed_ms)
+        return
+    for frame in frames:
+        frame[1] += 1
+        frame[2] += elapsed_ms
+
+
+def _handle_error(exception_context) -> None:
+    conn, context = exception_context.connection, exception_context.execution_context
+    if conn is not None and context is not None:
+        conn.info.get(_START_KEY, {}).pop(context.cursor, None)
+
+
+# ---------------------------------------------------------------------------
+# Ámbitos
+# ---------------------------------------------------------------------------
+
+
+@contextmanager
+def traced(label: str) -> Iterator[None]:
+    """Atribuye a *label* las sentencias ejecutadas dentro del bloque."""
+    if not _enabled:
+        yield
+        return
+
+    frame = [label, 0, 0.0]
+    token = _frames.set(_frames.get() + (frame,))
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        wall_ms = (time.perf_counter() - start) * 1000
+        _frames.reset(token)
+        _, statements, sql_ms = frame
+        stats.record_call(label, statements, sql_ms, wall_ms)
+        logger.info(
+            json.dumps(
+                {
+                    "scope": label,
+                    "statements": statements,
+                    "sql_ms": round(sql_ms, 3),
+                    "wall_ms": round(wall_ms, 3),
+                }
+            )
+        )
+
+
+def traced_function(func: Callable, label: str) -> Callable:
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        with traced(label):
+            return func(*args, **kwargs)
+
+    wrapper.__instrumented__ = True
+    return wrapper
+
+
+def instrument_class(cls: type) -> type:
+    """Decorador de clase: instrumenta sus métodos estáticos públicos."""
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_") or not isinstance(attr, staticmethod):
+            continue
+        setattr(cls, name, staticmethod(traced_function(attr.__func__, f"{cls.__name__}.{name}")))
+    return cls
@@ -0,0 +1,94 @@
+"""Actualizaciones en vivo entre las páginas conectadas (Flet pubsub).
+
+Los eventos de préstamo, devolución y sanción del bus (``events.py``) se
+reenvían con ``page.pubsub.send_all_on_topic`` a todas las sesiones. Cada
+página tiene un ``LiveUpdates`` que los recibe y se los pasa a la vista
+montada (``VeciRunApp.mounted_view``) mediante ``View.on_live_event``; la
+vista modifica sólo los controles afectados (un conteo de estación, una
+fila de devolución, una tarjeta de bicicleta) y, si cambió algo, la página
+se actualiza una vez. Las vistas no montadas no necesitan el evento: la
+caché de vistas (view_cache.py) ya las invalidó y se reconstruyen al navegar.
+
+``broadcast`` se suscribe en la etapa ``STAGE_NOTIFY`` del bus: corre después
+de que occupancy.py y la caché de sanciones aplicaran el evento, así que las
+vistas ya leen los conteos y el bloqueo actualizados.
+"""
+
+from __future__ import annotations
+
+import logging
+from threading import Lock
+
+from events import (
+    STAGE_NOTIFY,
+    DomainEvent,
+    LoanClosed,
+    LoanOpened,
+    SanctionAppealed,
+    SanctionCreated,
+    SanctionResolved,
+    subscribe,
+)
+
+logger = logging.getLogger("vecirun.live_updates")
+
+# Tema de pubsub de cada tipo de evento que se difunde
+LIVE_TOPICS: dict[type[DomainEvent], str] = {
+    LoanOpened: "loans",
+    LoanClosed: "loans",
+    SanctionCreated: "sanctions",
+    SanctionAppealed: "sanctions",
+    SanctionResolved: "sanctions",
+}
+
+# Clientes pubsub de las páginas conectadas. El hub detrás es común a todas
+# las sesiones, así que se difunde con cualquiera de ellos.
+_clients: list = []
+_clients_lock = Lock()
+
+
+class LiveUpdates:
+    """Recibe los eventos difundidos para la página de *app*."""
+
+    def __init__(self, app: "VeciRunApp") -> None:  # noqa: F821
+        self.app = app
+        self._pubsub = app.page.pubsub
+        for topic in sorted(set(LIVE_TOPICS.values())):
+            self._pubsub.subscribe_topic(topic, self._on_message)
+        with _clients_lock:
+            _clients.append(self._pubsub)
+
+    def close(self) -> None:
+        """Deja de recibir eventos (la página se cerró)."""
+        # Tema por tema: ``unsubscribe_all`` de Flet 0.21 falla con suscripciones por tema
+        for topic in sorted(set(LIVE_TOPICS.values())):
+            self._pubsub.unsubscribe_topic(topic)
+        with _clients_lock:
+            if self._pubsub in _clients:
+                _clients.remove(self._pubsub)
+
+    def _on_message(self, _topic: str, domain_event: DomainEvent) -> None:
+        view = self.app.mounted_view
+        if view is None:
+            return
+        try:
+            changed = view.on_live_event(domain_event)
+        except Exception:
+            logger.exception("%s no pudo aplicar %r", type(view).__name__, domain_event)
+            return
+        if changed:
+            self.app.page.update()
+
+
+def broadcast(domain_event: DomainEvent) -> None:
+    """Difunde *domain_event* a todas las páginas si es de un tipo en vivo."""
+    topic = LIVE_TOPICS.get(type(domain_event))
+    if topic is None:
+        return
+    with _clients_lock:
+        pubsub = _clients[0] if _clients else None
+    if pubsub is not None:
+        pubsub.send_all_on_topic(topic, domain_event)
+
+
+subscribe(DomainEvent, broadcast, stage=STAGE_NOTIFY)
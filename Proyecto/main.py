@@ -22,7 +22,8 @@ except ModuleNotFoundError:  # Entorno sin flet-material (p.ej. CI)
 
     fm = _FMStub()  # type: ignore
 
-from database import get_db, create_tables
+from config import PRODUCTION, SEED_SAMPLE_DATA
+from database import check_schema_revision, create_tables, session_scope
 from services import UserService, BicycleService, StationService, LoanService
 from models import (
     User,
@@ -34,29 +35,69 @@ from models import (
     BikeStatusEnum,
     LoanStatusEnum,
 )
+import importlib
 import uuid
-from views.create_user import CreateUserView
-from views.availability import AvailabilityView
+from threading import Lock
 from views.home import HomeView
-from views.dashboard import DashboardView
-from views.loan import LoanView
-# Added view to display current open loan for regular users
-from views.return_view import ReturnView
-from views.current_loan import CurrentLoanView
-from views.loan_history import LoanHistoryView
-from views.favorite_bike import FavoriteBikeView
-from views.return_report_view import ReturnReportView
+import instrumentation
 from typing import Callable, Dict
 
 # noqa: F401 needed for typing
 from views.base import View
 from sample_data import populate_sample_data
+from occupancy import StationOccupancy
+from view_cache import ViewCache
+from live_updates import LiveUpdates
+
+# ----------------------------------------------------
+# Estado compartido por proceso
+# ----------------------------------------------------
+# En modo web cada página conectada tiene su propio ``VeciRunApp`` (usuario,
+# estación, navegación). Entre páginas sólo se comparten la BD (pool de
+# conexiones) y el modelo de ocupación, que es seguro entre hilos.
+_bootstrap_lock = Lock()
+_database_ready = False
+_shared_occupancy: StationOccupancy | None = None
+
+
+# ----------------------------------------------------
+# Vistas perezosas
+# ----------------------------------------------------
+# Sólo la pantalla de ingreso se importa al arrancar. El resto de vistas se
+# importan en la primera navegación que las necesita, de modo que un usuario
+# regular nunca carga los módulos de administración.
+_VIEW_MODULES = {
+    "DashboardView": "views.dashboard",
+    "CreateUserView": "views.create_user",
+    "LoanView": "views.loan",
+    "ReturnView": "views.return_view",
+    "LoanHistoryView": "views.loan_history",
+    "ReturnReportView": "views.return_report_view",
+    "InstrumentationView": "views.instrumentation_view",
+    "AvailabilityView": "views.availability",
+    "CurrentLoanView": "views.current_loan",
+    "FavoriteBikeView": "views.favorite_bike",
+}
+
+
+def view_class(name: str) -> type[View]:
+    """Clase de la vista *name*, importando su módulo la primera vez."""
+    return getattr(importlib.import_module(_VIEW_MODULES[name]), name)
 
 
 class VeciRunApp:
     def __init__(self):
-        self.db = next(get_db())
+        # Sesión "fijada" opcional (la inyectan las pruebas). En ejecución normal
+        # es ``None`` y cada acción de las vistas abre su propia sesión corta.
+        self.db = None
         self.current_user = None
+        # Se carga después del primer frame (ver ``main``)
+        self.occupancy: StationOccupancy | None = None
+        # Vistas ya construidas de esta página, por índice del rail
+        self.view_cache = ViewCache()
+        # Vista en pantalla y su contenido (recibe los eventos en vivo)
+        self._mounted: tuple[View | None, ft.Control | None] = (None, None)
+        self.live: LiveUpdates | None = None
 
     def main(self, page: ft.Page):
         self.page = page  # Store page reference
@@ -78,11 +119,8 @@ class VeciRunApp:
         if getattr(fm.Theme, "bgcolor", None):
             page.bgcolor = fm.Theme.bgcolor
 
-        # Initialize database
-        create_tables()
-
-        # Create sample data if empty
-        self.create_sample_data()
+        # Esquema (y datos de ejemplo en desarrollo) antes del primer frame
+        self.prepare_database()
 
         # Main navigation (will be updated based on role)
         self.nav_rail = ft.NavigationRail(
@@ -114,9 +152,17 @@ class VeciRunApp:
         self.nav_rail.visible = False
 
         # Show initial view
-        self.content_area.content = HomeView(self).build()
+        self.mount(HomeView(self))
         page.update()
 
+        # Trabajo no esencial después del primer frame: la pantalla de ingreso
+        # no necesita la ocupación por estación
+        self.occupancy = self.bootstrap()
+
+        # Préstamos, devoluciones y sanciones de otras páginas (pubsub)
+        self.live = LiveUpdates(self)
+        page.on_close = lambda _: self.live.close()
+
         # Initialize role-based navigation
         self.update_navigation_for_role("regular")
 
@@ -127,27 +173,60 @@ class VeciRunApp:
         if view_factory is None:
             return  # índice sin vista
 
-        self.content_area.content = view_factory().build()
+        # Reutilizar la vista si ningún commit tocó sus datos desde que se construyó
+        content = self.view_cache.get(index)
+        view = self.view_cache.get_view(index)
+        if content is None or view is None:
+            view = view_factory()
+            content = view.build()
+            self.view_cache.put(
+                index, content, view.cache_topics, view=view, expires_at=view.cache_expires_at
+            )
+
+        self.mount(view, content)
         self.page.update()
 
+    @property
+    def mounted_view(self) -> View | None:
+        """Vista cuyo contenido sigue en pantalla, o ``None``."""
+        view, content = self._mounted
+        content_area = getattr(self, "content_area", None)
+        if view is None or content_area is None or content_area.content is not content:
+            return None
+        return view
+
+    def mount(self, view: View, content: ft.Control | None = None) -> ft.Control:
+        """Muestra *view* (construyéndola si no se da *content*) en el área de contenido."""
+        if content is None:
+            content = view.build()
+        self.content_area.content = content
+        self._mounted = (view, content)
+        return content
+
     # show_home_view eliminado: la lógica se trasladó a HomeView
 
     def show_dashboard_view(self):
         """Wrapper para mostrar DashboardView (mantiene API pública)."""
-        self.content_area.content = DashboardView(self).build()
+        self.mount(view_class("DashboardView")(self))
         self.page.update()
 
+    def _view_factory(self, name: str) -> Callable[[], View]:
+        """Factory para ``view_registry``: importa y construye la vista al navegar."""
+        return lambda: view_class(name)(self)
+
     def update_navigation_for_role(self, role):
         """Update navigation based on user role"""
         # Diccionario índice -> factory de vista
         self.view_registry: Dict[int, Callable[[], View]] = {}
+        # Los índices cambian de vista según el rol
+        self.view_cache.clear()
 
         destinations = [
             ft.NavigationRailDestination(
                 icon=ft.icons.HOME, selected_icon=ft.icons.HOME, label="Inicio"
             )
         ]
-        self.view_registry[0] = lambda: DashboardView(self)
+        self.view_registry[0] = self._view_factory("DashboardView")
 
         if role == "admin":
             destinations += [
@@ -175,11 +254,22 @@ class VeciRunApp:
                     label="Reportes",
                 ),
             ]
-            self.view_registry[1] = lambda: CreateUserView(self)
-            self.view_registry[2] = lambda: LoanView(self)
-            self.view_registry[3] = lambda: ReturnView(self)
-            self.view_registry[4] = lambda: LoanHistoryView(self)
-            self.view_registry[5] = lambda: ReturnReportView(self)
+            self.view_registry[1] = self._view_factory("CreateUserView")
+            self.view_registry[2] = self._view_factory("LoanView")
+            self.view_registry[3] = self._view_factory("ReturnView")
+            self.view_registry[4] = self._view_factory("LoanHistoryView")
+            self.view_registry[5] = self._view_factory("ReturnReportView")
+
+            # Panel de rendimiento sólo si la instrumentación está activa
+            if instrumentation.is_enabled():
+                destinations.append(
+                    ft.NavigationRailDestination(
+                        icon=ft.icons.SPEED,
+                        selected_icon=ft.icons.SPEED,
+                        label="Rendimiento",
+                    )
+                )
+                self.view_registry[6] = self._view_factory("InstrumentationView")
         else:  # regular
             destinations += [
                 ft.NavigationRailDestination(
@@ -200,15 +290,15 @@ class VeciRunApp:
             ]
 
             # Índices coherentes con las posiciones de *destinations*
-            self.view_registry[1] = lambda: AvailabilityView(self)
-            self.view_registry[2] = lambda: CurrentLoanView(self)
-            self.view_registry[3] = lambda: FavoriteBikeView(self)
+            self.view_registry[1] = self._view_factory("AvailabilityView")
+            self.view_registry[2] = self._view_factory("CurrentLoanView")
+            self.view_registry[3] = self._view_factory("FavoriteBikeView")
 
         self.nav_rail.destinations = destinations
         self.page.update()
 
     def show_loan_view(self):  # Obsoletos: delegan a LoanView
-        self.content_area.content = LoanView(self).build()
+        self.mount(view_class("LoanView")(self))
         self.page.update()
 
     def refresh_loan_view(self, page: ft.Page):
@@ -230,14 +320,14 @@ class VeciRunApp:
         # Build a fresh LoanView and assign it so that the stubbed
         # ``ft.ElevatedButton`` inside the view is instantiated, allowing the
         # test to grab its callback.
-        self.content_area.content = LoanView(self).build()
+        self.mount(view_class("LoanView")(self))
 
         # Call update() on the provided page object if available.
         if hasattr(page, "update") and callable(getattr(page, "update")):
             page.update()
 
     def show_return_view(self):
-        self.content_area.content = ReturnView(self).build()
+        self.mount(view_class("ReturnView")(self))
         self.page.update()
 
     def clear_user_state(self):
@@ -248,6 +338,7 @@ class VeciRunApp:
         
         # Clear current user and role
         self.current_user = None
+        self.view_cache.clear()
         if hasattr(self, 'current_user_role'):
             delattr(self, 'current_user_role')
         
@@ -255,15 +346,54 @@ class VeciRunApp:
         if hasattr(self, 'nav_rail') and self.nav_rail:
             self.nav_rail.selected_index = 0
             if hasattr(self, 'content_area') and self.content_area:
-                self.content_area.content = DashboardView(self).build()
+                self.mount(view_class("DashboardView")(self))
                 if hasattr(self, 'page') and self.page:
                     self.page.update()
 
     def create_sample_data(self):
         """Create sample data for testing"""
-        populate_sample_data(self.db)
+        with session_scope(self.db) as db:
+            populate_sample_data(db)
+
+    def prepare_database(self) -> None:
+        """Deja la BD lista para el primer frame, una sola vez por proceso.
+
+        En desarrollo crea las tablas que falten; en producción (``VECIRUN_ENV``)
+        confía en Alembic y sólo comprueba la revisión del esquema. Los datos
+        de ejemplo se insertan únicamente si ``SEED_SAMPLE_DATA`` está activo.
+        """
+        global _database_ready
+        with _bootstrap_lock:
+            if _database_ready:
+                return
+            if PRODUCTION:
+                check_schema_revision()
+            else:
+                create_tables()
+            if SEED_SAMPLE_DATA:
+                self.create_sample_data()
+            _database_ready = True
+
+    def bootstrap(self) -> StationOccupancy:
+        """Prepara la BD una sola vez por proceso y devuelve la ocupación compartida.
+
+        La primera página que se conecta prepara la BD y construye el modelo
+        de ocupación en memoria; las siguientes lo reutilizan.
+        """
+        global _shared_occupancy
+        self.prepare_database()
+        with _bootstrap_lock:
+            if _shared_occupancy is None:
+                # Ocupación por estación en memoria (se actualiza con cada commit)
+                with session_scope(self.db) as db:
+                    _shared_occupancy = StationOccupancy.load(db)
+        return _shared_occupancy
+
+
+def run_page(page: ft.Page) -> None:
+    """Punto de entrada de Flet: cada página obtiene su propio ``VeciRunApp``."""
+    VeciRunApp().main(page)
 
 
 if __name__ == "__main__":
-    app = VeciRunApp()
-    ft.app(target=app.main)
+    ft.app(target=run_page)
@@ -10,8 +10,8 @@ from sqlalchemy import (
     SmallInteger,
     Date,
     Index,
+    Uuid,
 )
-from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import declarative_base  # SQLAlchemy 2.0 migration
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -89,7 +89,7 @@ class PrivilegeTypeEnum(enum.Enum):
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     cedula = Column(String(15), unique=True, nullable=False)
     carnet = Column(String(20), unique=True, nullable=False)
     full_name = Column(String(120), nullable=False)
@@ -100,7 +100,7 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     privilege = Column(Enum(PrivilegeTypeEnum))
-    favorite_bike_id = Column(UUID(as_uuid=True), ForeignKey("bicycles.id"))
+    favorite_bike_id = Column(Uuid(as_uuid=True), ForeignKey("bicycles.id"))
     stars = Column(SmallInteger, default=3)  # ⭐ AGREGADO AQUÍ
 
     # Relationships
@@ -122,11 +122,11 @@ class User(Base):
 class Bicycle(Base):
     __tablename__ = "bicycles"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     serial_number = Column(String(40), unique=True, nullable=False)
     bike_code = Column(String(10), unique=True, nullable=False)
     status = Column(Enum(BikeStatusEnum), default=BikeStatusEnum.disponible)
-    current_station_id = Column(UUID(as_uuid=True), ForeignKey("stations.id"))
+    current_station_id = Column(Uuid(as_uuid=True), ForeignKey("stations.id"))
     last_service_at = Column(Date)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -145,7 +145,7 @@ class Bicycle(Base):
 class Station(Base):
     __tablename__ = "stations"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     code = Column(String(10), unique=True, nullable=False)
     name = Column(String(80))
     geom = Column(Text)  # Placeholder for PostGIS POINT type
@@ -164,14 +164,14 @@ class Station(Base):
 class Loan(Base):
     __tablename__ = "loans"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    bike_id = Column(UUID(as_uuid=True), ForeignKey("bicycles.id"), nullable=False)
-    station_out_id = Column(UUID(as_uuid=True), ForeignKey("stations.id"), nullable=False)
-    operator_out_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    bike_id = Column(Uuid(as_uuid=True), ForeignKey("bicycles.id"), nullable=False)
+    station_out_id = Column(Uuid(as_uuid=True), ForeignKey("stations.id"), nullable=False)
+    operator_out_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"))
     time_out = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
-    station_in_id = Column(UUID(as_uuid=True), ForeignKey("stations.id"))
-    operator_in_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    station_in_id = Column(Uuid(as_uuid=True), ForeignKey("stations.id"))
+    operator_in_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"))
     time_in = Column(DateTime(timezone=True))
     duration_min = Column(Integer)
     status = Column(Enum(LoanStatusEnum), default=LoanStatusEnum.abierto)
@@ -183,9 +183,17 @@ class Loan(Base):
     station_in = relationship("Station", foreign_keys=[station_in_id], back_populates="loans_in")
     operator_out = relationship("User", foreign_keys=[operator_out_id])
     operator_in = relationship("User", foreign_keys=[operator_in_id])
+    incidents = relationship("Incident", back_populates="loan")
 
+    # Los índices compuestos siguen la forma de las consultas de services.py:
+    # préstamos abiertos por usuario, historial por usuario/estación
+    # (ORDER BY time_out DESC) y devoluciones pendientes por estación.
     __table_args__ = (
-        Index("ix_loans_user_id", "user_id"),
+        Index("ix_loans_user_id_status", "user_id", "status"),
+        Index("ix_loans_user_id_time_out", "user_id", "time_out"),
+        Index("ix_loans_station_in_id_status", "station_in_id", "status"),
+        Index("ix_loans_station_out_id_time_out", "station_out_id", "time_out"),
+        Index("ix_loans_time_out", "time_out"),
         Index("ix_loans_bike_id", "bike_id"),
         Index("ix_loans_status", "status"),
     )
@@ -199,10 +207,10 @@ class Loan(Base):
 class Reservation(Base):
     __tablename__ = "reservations"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    station_id = Column(UUID(as_uuid=True), ForeignKey("stations.id"))
-    bike_id = Column(UUID(as_uuid=True), ForeignKey("bicycles.id"))
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    station_id = Column(Uuid(as_uuid=True), ForeignKey("stations.id"))
+    bike_id = Column(Uuid(as_uuid=True), ForeignKey("bicycles.id"))
     reserved_from = Column(DateTime(timezone=True))
     reserved_until = Column(DateTime(timezone=True))
     status = Column(Enum(ReservationStatusEnum), default=ReservationStatusEnum.activa)
@@ -216,11 +224,11 @@ class Evaluation(Base):
     __tablename__ = "evaluations"
 
     loan_id = Column(
-        UUID(as_uuid=True), ForeignKey("loans.id", ondelete="CASCADE"), primary_key=True
+        Uuid(as_uuid=True), ForeignKey("loans.id", ondelete="CASCADE"), primary_key=True
     )
     stars = Column(SmallInteger)
     comment = Column(Text)
-    evaluator_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    evaluator_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     loan = relationship("Loan")
@@ -230,11 +238,11 @@ class Evaluation(Base):
 class Incident(Base):
     __tablename__ = "incidents"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    loan_id = Column(UUID(as_uuid=True), ForeignKey("loans.id"))
-    bike_id = Column(UUID(as_uuid=True), ForeignKey("bicycles.id"))
-    reporter_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
-    return_report_id = Column(UUID(as_uuid=True), ForeignKey("return_reports.id"))
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    loan_id = Column(Uuid(as_uuid=True), ForeignKey("loans.id"))
+    bike_id = Column(Uuid(as_uuid=True), ForeignKey("bicycles.id"))
+    reporter_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"))
+    return_report_id = Column(Uuid(as_uuid=True), ForeignKey("return_reports.id"))
     type = Column(Enum(IncidentTypeEnum))
     severity = Column(SmallInteger)  # 1=leve, 2=media, 3=grave, 4=maxima
     description = Column(Text)
@@ -242,21 +250,26 @@ class Incident(Base):
     resolved_at = Column(DateTime(timezone=True))
     resolution_notes = Column(Text)
 
-    loan = relationship("Loan")
+    loan = relationship("Loan", back_populates="incidents")
     bike = relationship("Bicycle", back_populates="incidents")
     reporter = relationship("User")
     return_report = relationship("ReturnReport", back_populates="incidents")
+    sanctions = relationship("Sanction", back_populates="incident")
 
-    __table_args__ = (Index("ix_incidents_bike_id", "bike_id"),)
+    __table_args__ = (
+        Index("ix_incidents_bike_id", "bike_id"),
+        Index("ix_incidents_loan_id", "loan_id"),
+        Index("ix_incidents_return_report_id", "return_report_id"),
+    )
 
 
 class Sanction(Base):
     __tablename__ = "sanctions"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
-    incident_id = Column(UUID(as_uuid=True), ForeignKey("incidents.id"))
-    operator_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"))
+    incident_id = Column(Uuid(as_uuid=True), ForeignKey("incidents.id"))
+    operator_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"))
     start_at = Column(DateTime(timezone=True), nullable=False)
     end_at = Column(DateTime(timezone=True), nullable=False)
     status = Column(Enum(SanctionStatusEnum), default=SanctionStatusEnum.activa)
@@ -264,19 +277,23 @@ class Sanction(Base):
     appeal_response = Column(Text)
 
     user = relationship("User", foreign_keys=[user_id])
-    incident = relationship("Incident")
+    incident = relationship("Incident", back_populates="sanctions")
     operator = relationship("User", foreign_keys=[operator_id])
 
-    __table_args__ = (Index("ix_sanctions_user_id", "user_id"),)
+    __table_args__ = (
+        # Sanción activa vigente: user_id = ? AND status = ? AND start_at <= ? AND end_at >= ?
+        Index("ix_sanctions_user_id_status_window", "user_id", "status", "start_at", "end_at"),
+        Index("ix_sanctions_incident_id", "incident_id"),
+    )
 
 
 class Privilege(Base):
     __tablename__ = "privileges"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"))
     type = Column(Enum(PrivilegeTypeEnum))
-    granted_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    granted_by = Column(Uuid(as_uuid=True), ForeignKey("users.id"))
     granted_at = Column(DateTime(timezone=True), server_default=func.now())
     expires_at = Column(DateTime(timezone=True))
 
@@ -287,9 +304,9 @@ class Privilege(Base):
 class Message(Base):
     __tablename__ = "messages"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    sender_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
-    receiver_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    sender_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"))
+    receiver_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"))
     subject = Column(String(120))
     body = Column(Text)
     sent_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -302,8 +319,8 @@ class Message(Base):
 class MaintenanceRecord(Base):
     __tablename__ = "maintenance_records"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    bike_id = Column(UUID(as_uuid=True), ForeignKey("bicycles.id"))
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    bike_id = Column(Uuid(as_uuid=True), ForeignKey("bicycles.id"))
     description = Column(Text)
     performed_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -313,9 +330,9 @@ class MaintenanceRecord(Base):
 class InventoryReport(Base):
     __tablename__ = "inventory_reports"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    station_id = Column(UUID(as_uuid=True), ForeignKey("stations.id"))
-    reporter_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    station_id = Column(Uuid(as_uuid=True), ForeignKey("stations.id"))
+    reporter_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"))
     report_date = Column(Date, nullable=False)
     available_qty = Column(SmallInteger)
     workshop_qty = Column(SmallInteger)
@@ -328,11 +345,11 @@ class InventoryReport(Base):
 class ReturnReport(Base):
     __tablename__ = "return_reports"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    loan_id = Column(UUID(as_uuid=True), ForeignKey("loans.id"), nullable=False)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    loan_id = Column(Uuid(as_uuid=True), ForeignKey("loans.id"), nullable=False)
     total_incident_days = Column(Integer, default=0)  # Suma total de días de todos los incidentes
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    created_by = Column(Uuid(as_uuid=True), ForeignKey("users.id"))
 
     loan = relationship("Loan")
     creator = relationship("User")
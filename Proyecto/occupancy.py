@@ -0,0 +1,161 @@
+"""Modelo de lectura en memoria con la ocupación de cada estación.
+
+``StationOccupancy`` se construye una vez desde la BD y luego se mantiene al
+día con los eventos del bus (events.py): ``LoanOpened``, ``LoanClosed`` y
+``BikeStatusChanged``. El bus sólo publica lo confirmado, así que un
+*rollback* no toca los conteos. Las vistas pueden mostrar conteos por
+estación en O(1) sin consultar la tabla de bicicletas.
+"""
+
+from __future__ import annotations
+
+import uuid
+import weakref
+from collections import defaultdict
+from threading import Lock
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from events import BikeStatusChanged, LoanClosed, LoanOpened, subscribe
+from models import Bicycle, BikeStatusEnum, Loan, LoanStatusEnum, Station
+
+# Modelos vivos: todos reciben los eventos del bus
+_instances: weakref.WeakSet["StationOccupancy"] = weakref.WeakSet()
+_instances_lock = Lock()
+
+
+class StationOccupancy:
+    """Conteos de bicicletas disponibles y prestadas por estación.
+
+    *Disponibles* son las bicicletas en estado ``disponible`` ubicadas en la
+    estación; *prestadas* son los préstamos abiertos que salieron de ella.
+    """
+
+    def __init__(self) -> None:
+        self._available: dict[uuid.UUID, int] = defaultdict(int)
+        self._borrowed: dict[uuid.UUID, int] = defaultdict(int)
+        self._codes: dict[str, uuid.UUID] = {}
+        self._lock = Lock()
+        with _instances_lock:
+            _instances.add(self)
+
+    # ------------------------------------------------------------------
+    # Construcción
+    # ------------------------------------------------------------------
+    @classmethod
+    def load(cls, db: Session) -> "StationOccupancy":
+        """Construye el modelo a partir del estado actual de la BD."""
+        occupancy = cls()
+        occupancy.resync(db)
+        return occupancy
+
+    @staticmethod
+    def _snapshot(db: Session) -> tuple[dict, dict, dict]:
+        available = dict(
+            db.query(Bicycle.current_station_id, func.count(Bicycle.id))
+            .filter(
+                Bicycle.status == BikeStatusEnum.disponible,
+                Bicycle.current_station_id.isnot(None),
+            )
+            .group_by(Bicycle.current_station_id)
+            .all()
+        )
+        borrowed = dict(
+            db.query(Loan.station_out_id, func.count(Loan.id))
+            .filter(Loan.status == LoanStatusEnum.abierto)
+            .group_by(Loan.station_out_id)
+            .all()
+        )
+        codes = dict(db.query(Station.code, Station.id).all())
+        return available, borrowed, codes
+
+    def resync(self, db: Session) -> None:
+        """Reemplaza los conteos en memoria con los de la BD."""
+        available, borrowed, codes = self._snapshot(db)
+        with self._lock:
+            self._available = defaultdict(int, available)
+            self._borrowed = defaultdict(int, borrowed)
+            self._codes = codes
+
+    def verify(self, db: Session) -> dict[uuid.UUID, dict[str, tuple[int, int]]]:
+        """Compara el modelo con la BD.
+
+        Devuelve ``{station_id: {"available"|"borrowed": (memoria, bd)}}`` con
+        las diferencias encontradas; un diccionario vacío indica consistencia.
+        """
+        available, borrowed, _ = self._snapshot(db)
+        mismatches: dict[uuid.UUID, dict[str, tuple[int, int]]] = {}
+        with self._lock:
+            for name, memory, actual in (
+                ("available", self._available, available),
+                ("borrowed", self._borrowed, borrowed),
+            ):
+                for station_id in set(memory) | set(actual):
+                    ours, theirs = memory.get(station_id, 0), actual.get(station_id, 0)
+                    if ours != theirs:
+                        mismatches.setdefault(station_id, {})[name] = (ours, theirs)
+        return mismatches
+
+    # ------------------------------------------------------------------
+    # Lecturas O(1)
+    # ------------------------------------------------------------------
+    def available(self, station_id: uuid.UUID | None) -> int:
+        with self._lock:
+            return self._available.get(station_id, 0)
+
+    def borrowed(self, station_id: uuid.UUID | None) -> int:
+        with self._lock:
+            return self._borrowed.get(station_id, 0)
+
+    def station_id(self, code: str | None) -> uuid.UUID | None:
+        return self._codes.get(code)
+
+    def available_counts(self) -> dict[uuid.UUID, int]:
+        with self._lock:
+            return {k: v for k, v in self._available.items() if v}
+
+    # ------------------------------------------------------------------
+    # Eventos
+    # ------------------------------------------------------------------
+    def _apply(self, deltas: list[tuple[str, uuid.UUID | None, int]]) -> None:
+        with self._lock:
+            for kind, station_id, delta in deltas:
+                if station_id is None:
+                    continue
+                target = self._available if kind == "available" else self._borrowed
+                target[station_id] += delta
+
+
+def _deltas(domain_event) -> list[tuple[str, uuid.UUID | None, int]]:
+    """Cambios de conteo que implica *domain_event*."""
+    if isinstance(domain_event, LoanOpened):
+        return [
+            ("available", domain_event.previous_station_id, -1),
+            ("borrowed", domain_event.station_out_id, 1),
+        ]
+    if isinstance(domain_event, LoanClosed):
+        return [
+            ("borrowed", domain_event.station_out_id, -1),
+            ("available", domain_event.previous_station_id, -1),
+            ("available", domain_event.station_in_id, 1),
+        ]
+    previous, status = domain_event.previous_status, domain_event.status
+    if previous == status or BikeStatusEnum.disponible not in (previous, status):
+        return []
+    delta = 1 if status == BikeStatusEnum.disponible else -1
+    return [("available", domain_event.station_id, delta)]
+
+
+def _on_domain_event(domain_event) -> None:
+    deltas = _deltas(domain_event)
+    if not deltas:
+        return
+    with _instances_lock:
+        instances = list(_instances)
+    for occupancy in instances:
+        occupancy._apply(deltas)
+
+
+for _event_type in (LoanOpened, LoanClosed, BikeStatusChanged):
+    subscribe(_event_type, _on_domain_event)
@@ -0,0 +1,151 @@
+"""Caché en memoria de los bloqueos por sanción de cada usuario.
+
+Antes de prestar hay que saber si el usuario tiene una sanción activa que
+cubra el momento actual. En lugar de consultar ``sanctions`` en cada préstamo,
+se guardan por usuario las *ventanas* ``(inicio, fin)`` de sus sanciones
+activas que aún no terminaron; con ellas se responde para cualquier instante
+sin volver a la BD, y se sabe exactamente cuándo se levanta el bloqueo. El
+caso común, un usuario sin sanciones, queda como una tupla vacía.
+
+Las entradas se invalidan con los eventos ``SanctionCreated``,
+``SanctionAppealed`` y ``SanctionResolved`` (events.py), que se publican
+después del commit. El TTL sólo cubre escrituras que no pasan por
+``SanctionService`` (scripts, otro proceso) y el tamaño máximo descarta los
+usuarios usados hace más tiempo (LRU).
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Callable, Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from config import SANCTION_CACHE_SIZE, SANCTION_CACHE_TTL
+from events import SanctionAppealed, SanctionCreated, SanctionResolved, subscribe
+from models import Sanction, SanctionStatusEnum
+
+Window = tuple[datetime, datetime]
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite devuelve fechas sin zona; se guardan en UTC
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+class SanctionBlockCache:
+    """Ventanas de sanción activas por usuario, con TTL y desalojo LRU."""
+
+    def __init__(
+        self,
+        ttl: float = SANCTION_CACHE_TTL,
+        max_users: int = SANCTION_CACHE_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_users = max_users
+        self._clock = clock
+        self._entries: OrderedDict[uuid.UUID, tuple[float, tuple[Window, ...]]] = OrderedDict()
+        # Cambia con cada invalidación: una carga que empezó antes no se guarda
+        self._generation = 0
+        self._lock = Lock()
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    def windows(
+        self, db: Session, user_ids: Iterable[uuid.UUID]
+    ) -> dict[uuid.UUID, tuple[Window, ...]]:
+        """Ventanas de cada usuario; los que no están en caché se cargan en una sola consulta."""
+        result: dict[uuid.UUID, tuple[Window, ...]] = {}
+        missing: set[uuid.UUID] = set()
+        now = self._clock()
+        with self._lock:
+            for user_id in user_ids:
+                entry = self._entries.get(user_id)
+                if entry is not None and entry[0] > now:
+                    self._entries.move_to_end(user_id)
+                    result[user_id] = entry[1]
+                else:
+                    missing.add(user_id)
+            generation = self._generation
+        if not missing:
+            return result
+
+        loaded = self._load(db, missing)
+        result.update(loaded)
+        with self._lock:
+            if generation == self._generation:
+                for user_id, user_windows in loaded.items():
+                    self._entries[user_id] = (now + self.ttl, user_windows)
+                    self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_users:
+                    self._entries.popitem(last=False)
+        return result
+
+    def blocked_until(self, db: Session, user_id: uuid.UUID, at: datetime) -> datetime | None:
+        """Fin de la sanción que bloquea a *user_id* en *at*, o ``None`` si no está bloqueado."""
+        at = _as_utc(at)
+        ends = [end for start, end in self.windows(db, [user_id])[user_id] if start <= at <= end]
+        return max(ends, default=None)
+
+    def blocked_users(
+        self, db: Session, user_ids: Iterable[uuid.UUID], at: datetime
+    ) -> set[uuid.UUID]:
+        """Usuarios de *user_ids* bloqueados en *at*."""
+        at = _as_utc(at)
+        return {
+            user_id
+            for user_id, user_windows in self.windows(db, user_ids).items()
+            if any(start <= at <= end for start, end in user_windows)
+        }
+
+    @staticmethod
+    def _load(db: Session, user_ids: set[uuid.UUID]) -> dict[uuid.UUID, tuple[Window, ...]]:
+        now_utc = datetime.now(timezone.utc)
+        rows = db.execute(
+            select(Sanction.user_id, Sanction.start_at, Sanction.end_at)
+            .where(
+                Sanction.user_id.in_(user_ids),
+                Sanction.status == SanctionStatusEnum.activa,
+                Sanction.end_at >= now_utc,
+            )
+            .order_by(Sanction.start_at)
+        )
+        loaded: dict[uuid.UUID, list[Window]] = {user_id: [] for user_id in user_ids}
+        for user_id, start_at, end_at in rows:
+            loaded[user_id].append((_as_utc(start_at), _as_utc(end_at)))
+        return {user_id: tuple(user_windows) for user_id, user_windows in loaded.items()}
+
+    # ------------------------------------------------------------------
+    # Invalidación
+    # ------------------------------------------------------------------
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._generation += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+cache = SanctionBlockCache()
+
+
+def _on_sanction_event(domain_event) -> None:
+    cache.invalidate(domain_event.user_id)
+
+
+for _event_type in (SanctionCreated, SanctionAppealed, SanctionResolved):
+    subscribe(_event_type, _on_sanction_event)
@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 from models import (
     User,
     Bicycle,
@@ -18,12 +18,32 @@ from models import (
 from datetime import datetime
 import uuid
 from datetime import timezone, timedelta
-from sqlalchemy import or_
+from sqlalchemy import and_, or_, select, func, update, insert
+from sanction_cache import cache as sanction_cache
+from events import (
+    BikeStatusChanged,
+    FavoriteChanged,
+    IncidentReported,
+    LoanClosed,
+    LoanOpened,
+    ReturnReportCreated,
+    SanctionAppealed,
+    SanctionCreated,
+    SanctionResolved,
+    UserCreated,
+    emit,
+)
+from instrumentation import instrument_class
 
 # Zona horaria de Colombia (UTC-5)
 CO_TZ = timezone(timedelta(hours=-5))
 
 
+class LoanConflictError(ValueError):
+    """La bicicleta dejó de estar disponible (p.ej. otro operador la prestó)."""
+
+
+@instrument_class
 class UserService:
     @staticmethod
     def create_user(
@@ -49,6 +69,8 @@ class UserService:
             role=role,
         )
         db.add(user)
+        db.flush()
+        emit(db, UserCreated(user.id))
         db.commit()
         db.refresh(user)
         return user
@@ -64,6 +86,7 @@ class UserService:
         return db.query(User).filter(User.carnet == carnet).first()
 
 
+@instrument_class
 class BicycleService:
     @staticmethod
     def get_available_bicycles(db: Session) -> list[Bicycle]:
@@ -75,14 +98,25 @@ class BicycleService:
         """Get bicycle by bike_code"""
         return db.query(Bicycle).filter(Bicycle.bike_code == bike_code).first()
 
+    @staticmethod
+    def get_bicycle_by_id(db: Session, bike_id: uuid.UUID) -> Bicycle:
+        """Get bicycle by ID"""
+        return db.query(Bicycle).filter(Bicycle.id == bike_id).first()
+
     @staticmethod
     def update_bicycle_status(db: Session, bicycle: Bicycle, status: BikeStatusEnum):
         """Update bicycle status"""
+        previous_status = bicycle.status
         bicycle.status = status
+        emit(
+            db,
+            BikeStatusChanged(bicycle.id, status, previous_status, bicycle.current_station_id),
+        )
         db.commit()
         db.refresh(bicycle)
 
 
+@instrument_class
 class StationService:
     @staticmethod
     def get_all_stations(db: Session) -> list[Station]:
@@ -94,7 +128,29 @@ class StationService:
         """Get station by code"""
         return db.query(Station).filter(Station.code == code).first()
 
+    @staticmethod
+    def get_availability_counts(db: Session) -> dict[uuid.UUID, dict[BikeStatusEnum, int]]:
+        """Cantidad de bicicletas por estación y estado.
+
+        Se resuelve con un único ``GROUP BY`` sobre ``bicycles`` (apoyado en los
+        índices de ``status`` y ``current_station_id``) en vez de cargar todas
+        las bicicletas y contarlas en Python. Devuelve
+        ``{station_id: {BikeStatusEnum: cantidad}}``; las estaciones sin
+        bicicletas no aparecen en el diccionario.
+        """
+        rows = (
+            db.query(Bicycle.current_station_id, Bicycle.status, func.count(Bicycle.id))
+            .filter(Bicycle.current_station_id.isnot(None))
+            .group_by(Bicycle.current_station_id, Bicycle.status)
+            .all()
+        )
+        counts: dict[uuid.UUID, dict[BikeStatusEnum, int]] = {}
+        for station_id, status, qty in rows:
+            counts.setdefault(station_id, {})[status] = qty
+        return counts
 
+
+@instrument_class
 class LoanService:
     @staticmethod
     def create_loan(
@@ -108,28 +164,49 @@ class LoanService:
 
         Antes de crear el préstamo se valida que el usuario no posea sanciones
         activas que coincidan con el rango de fechas actual. Si existe al
-        menos una sanción activa, se lanza ``ValueError``.
+        menos una sanción activa, se lanza ``ValueError``. La comprobación usa
+        ``SanctionService.is_user_blocked``, que normalmente no consulta la BD.
+
+        La bicicleta se reserva con un ``UPDATE`` condicional
+        (``... WHERE id = ? AND status = 'disponible'``) dentro de la misma
+        transacción que crea el préstamo: si dos operadores intentan prestar
+        la misma bicicleta a la vez, sólo uno lo logra y el otro recibe
+        ``LoanConflictError``.
         """
 
         # ---------------------------------------------------------------
         # Validar sanciones activas para el usuario
         # ---------------------------------------------------------------
-        now_utc = datetime.now(timezone.utc)
-        active_sanction = (
-            db.query(Sanction)
-            .filter(
-                Sanction.user_id == user_id,
-                Sanction.status == SanctionStatusEnum.activa,
-                Sanction.start_at <= now_utc,
-                Sanction.end_at >= now_utc,
-            )
-            .first()
-        )
-        if active_sanction:
+        if SanctionService.is_user_blocked(db, user_id):
             raise ValueError(
                 "El usuario posee una sanción activa y no puede registrar préstamos."
             )
 
+        # ---------------------------------------------------------------
+        # Reservar la bicicleta de forma atómica
+        # ---------------------------------------------------------------
+        row = db.query(Bicycle.current_station_id).filter(Bicycle.id == bike_id).first()
+        if row is None:
+            raise ValueError("Bicicleta no encontrada")
+        previous_station_id = row.current_station_id
+
+        reserved = db.execute(
+            update(Bicycle)
+            .where(
+                Bicycle.id == bike_id,
+                Bicycle.status == BikeStatusEnum.disponible,
+                # La bicicleta no se movió desde la lectura anterior
+                Bicycle.current_station_id == previous_station_id,
+            )
+            # La bicicleta ya no está en ninguna estación mientras está prestada
+            .values(status=BikeStatusEnum.prestada, current_station_id=None)
+        )
+        if reserved.rowcount != 1:
+            db.rollback()
+            raise LoanConflictError(
+                "La bicicleta ya no está disponible: otro préstamo la tomó."
+            )
+
         # Create the loan con timestamp en hora local de Colombia
         loan = Loan(
             user_id=user_id,
@@ -140,13 +217,18 @@ class LoanService:
             time_out=datetime.now(CO_TZ),
         )
         db.add(loan)
-
-        # Update bicycle status to 'prestada'
-        bicycle = db.query(Bicycle).filter(Bicycle.id == bike_id).first()
-        if bicycle:
-            bicycle.status = BikeStatusEnum.prestada
-            # La bicicleta ya no está en ninguna estación mientras está prestada
-            bicycle.current_station_id = None
+        db.flush()
+        emit(
+            db,
+            LoanOpened(
+                loan.id,
+                user_id,
+                bike_id,
+                station_out_id,
+                station_in_id,
+                previous_station_id=previous_station_id,
+            ),
+        )
 
         db.commit()
         db.refresh(loan)
@@ -168,16 +250,254 @@ class LoanService:
         loan.status = LoanStatusEnum.cerrado
 
         # Update bicycle status back to 'disponible' y asignar la estación de llegada
+        previous_station_id = None
         bicycle = db.query(Bicycle).filter(Bicycle.id == loan.bike_id).first()
         if bicycle:
+            if bicycle.status == BikeStatusEnum.disponible:
+                previous_station_id = bicycle.current_station_id
             bicycle.status = BikeStatusEnum.disponible
             # Actualizar la estación actual de la bicicleta para reflejar la estación de llegada
             bicycle.current_station_id = station_in_id
+        emit(
+            db,
+            LoanClosed(
+                loan.id,
+                loan.user_id,
+                loan.bike_id,
+                station_in_id,
+                loan.station_out_id,
+                previous_station_id,
+            ),
+        )
 
         db.commit()
         db.refresh(loan)
         return loan
 
+    # ------------------------------------------------------------------
+    # Operaciones masivas (grupos, cierre de jornada)
+    # ------------------------------------------------------------------
+    @staticmethod
+    def create_loans_bulk(
+        db: Session,
+        items: list[tuple[uuid.UUID, uuid.UUID]],
+        station_out_id: uuid.UUID,
+        station_in_id: uuid.UUID | None = None,
+    ) -> dict:
+        """Registrar varios préstamos ``(user_id, bike_id)`` en una sola transacción.
+
+        Las sanciones se validan con una única consulta, las bicicletas se
+        reservan con un ``UPDATE ... WHERE status = 'disponible'`` por
+        conjunto y los préstamos se insertan con ``executemany``. Los ítems
+        que no se pueden prestar no abortan el resto: se devuelven en
+        ``failed`` como ``(item, motivo)`` junto a ``loans`` (los creados).
+        """
+        if not items:
+            return {"loans": [], "failed": []}
+
+        sanctioned = SanctionService.blocked_users(db, {user_id for user_id, _ in items})
+
+        # Motivo de rechazo por posición, para reportar en el orden recibido
+        reasons: dict[int, str] = {}
+        candidates: list[int] = []
+        seen_bikes: set[uuid.UUID] = set()
+        for pos, (user_id, bike_id) in enumerate(items):
+            if user_id in sanctioned:
+                reasons[pos] = "El usuario posee una sanción activa."
+            elif bike_id in seen_bikes:
+                reasons[pos] = "Bicicleta repetida en la solicitud."
+            else:
+                seen_bikes.add(bike_id)
+                candidates.append(pos)
+
+        # Estación de origen de cada bicicleta (para el modelo de ocupación)
+        stations = {}
+        if seen_bikes:
+            stations = dict(
+                db.execute(
+                    select(Bicycle.id, Bicycle.current_station_id).where(Bicycle.id.in_(seen_bikes))
+                ).all()
+            )
+        reserved = LoanService._reserve_bikes(
+            db, {b: stations[b] for b in seen_bikes if b in stations}
+        )
+
+        rows = []
+        now_local = datetime.now(CO_TZ)
+        for pos in candidates:
+            user_id, bike_id = items[pos]
+            if bike_id not in stations:
+                reasons[pos] = "Bicicleta no encontrada."
+                continue
+            if bike_id not in reserved:
+                reasons[pos] = "La bicicleta no está disponible."
+                continue
+            rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": user_id,
+                    "bike_id": bike_id,
+                    "station_out_id": station_out_id,
+                    "station_in_id": station_in_id,
+                    "status": LoanStatusEnum.abierto,
+                    "time_out": now_local,
+                }
+            )
+            emit(
+                db,
+                LoanOpened(
+                    rows[-1]["id"],
+                    user_id,
+                    bike_id,
+                    station_out_id,
+                    station_in_id,
+                    previous_station_id=stations[bike_id],
+                ),
+            )
+
+        if rows:
+            db.execute(insert(Loan), rows)
+        db.commit()
+
+        loans = (
+            db.query(Loan).filter(Loan.id.in_([r["id"] for r in rows])).all() if rows else []
+        )
+        failed = [(items[pos], reasons[pos]) for pos in sorted(reasons)]
+        return {"loans": loans, "failed": failed}
+
+    @staticmethod
+    def _reserve_bikes(
+        db: Session, stations: dict[uuid.UUID, uuid.UUID | None]
+    ) -> set[uuid.UUID]:
+        """Marcar como prestadas las bicicletas aún disponibles; devuelve cuáles lo lograron.
+
+        ``stations`` es la estación leída para cada bicicleta: si otra
+        transacción la movió desde entonces, la bicicleta no se reserva y el
+        ``previous_station_id`` del evento no queda desactualizado.
+        """
+        if not stations:
+            return set()
+        by_station: dict[uuid.UUID | None, list[uuid.UUID]] = {}
+        for bike_id, station_id in stations.items():
+            by_station.setdefault(station_id, []).append(bike_id)
+        stmt = (
+            update(Bicycle)
+            .where(
+                Bicycle.status == BikeStatusEnum.disponible,
+                or_(
+                    *(
+                        and_(Bicycle.current_station_id == station_id, Bicycle.id.in_(bike_ids))
+                        for station_id, bike_ids in by_station.items()
+                    )
+                ),
+            )
+            .values(status=BikeStatusEnum.prestada, current_station_id=None)
+        )
+        if db.get_bind().dialect.update_returning:
+            return set(db.scalars(stmt.returning(Bicycle.id)))
+
+        # Motores sin UPDATE ... RETURNING: una sentencia condicional por bicicleta
+        reserved = set()
+        for bike_id, station_id in stations.items():
+            result = db.execute(
+                update(Bicycle)
+                .where(
+                    Bicycle.id == bike_id,
+                    Bicycle.status == BikeStatusEnum.disponible,
+                    Bicycle.current_station_id == station_id,
+                )
+                .values(status=BikeStatusEnum.prestada, current_station_id=None)
+            )
+            if result.rowcount == 1:
+                reserved.add(bike_id)
+        return reserved
+
+    @staticmethod
+    def return_loans_bulk(
+        db: Session, loan_ids: list[uuid.UUID], station_in_id: uuid.UUID
+    ) -> dict:
+        """Cerrar varios préstamos en la estación ``station_in_id`` con un solo commit.
+
+        Pensado para el cierre de jornada: préstamos y bicicletas se
+        actualizan con sentencias por conjunto. Devuelve ``{"loans": [...],
+        "failed": [(loan_id, motivo), ...]}``.
+        """
+        failed: list[tuple[uuid.UUID, str]] = []
+        if not loan_ids:
+            return {"loans": [], "failed": failed}
+
+        found = {
+            row.id: row
+            for row in db.execute(
+                select(Loan.id, Loan.user_id, Loan.bike_id, Loan.station_out_id, Loan.status).where(
+                    Loan.id.in_(set(loan_ids))
+                )
+            )
+        }
+        open_ids = []
+        for loan_id in dict.fromkeys(loan_ids):
+            row = found.get(loan_id)
+            if row is None:
+                failed.append((loan_id, "Préstamo no encontrado."))
+            elif row.status != LoanStatusEnum.abierto:
+                failed.append((loan_id, "El préstamo no está abierto."))
+            else:
+                open_ids.append(loan_id)
+
+        closed: set[uuid.UUID] = set()
+        if open_ids:
+            stmt = (
+                update(Loan)
+                .where(Loan.id.in_(open_ids), Loan.status == LoanStatusEnum.abierto)
+                .values(
+                    status=LoanStatusEnum.cerrado,
+                    station_in_id=station_in_id,
+                    time_in=datetime.now(CO_TZ),
+                )
+            )
+            if db.get_bind().dialect.update_returning:
+                closed = set(db.scalars(stmt.returning(Loan.id)))
+            else:
+                db.execute(stmt)
+                closed = set(open_ids)
+        for loan_id in open_ids:
+            if loan_id not in closed:
+                failed.append((loan_id, "El préstamo no está abierto."))
+
+        bike_ids = {found[loan_id].bike_id for loan_id in closed}
+        # Bicicletas que figuraban disponibles en otra estación dejan de contarse allí
+        previous_stations = {}
+        if bike_ids:
+            previous_stations = dict(
+                db.execute(
+                    select(Bicycle.id, Bicycle.current_station_id).where(
+                        Bicycle.id.in_(bike_ids), Bicycle.status == BikeStatusEnum.disponible
+                    )
+                ).all()
+            )
+            db.execute(
+                update(Bicycle)
+                .where(Bicycle.id.in_(bike_ids))
+                .values(status=BikeStatusEnum.disponible, current_station_id=station_in_id)
+            )
+        for loan_id in closed:
+            row = found[loan_id]
+            emit(
+                db,
+                LoanClosed(
+                    loan_id,
+                    row.user_id,
+                    row.bike_id,
+                    station_in_id,
+                    row.station_out_id,
+                    previous_stations.get(row.bike_id),
+                ),
+            )
+        db.commit()
+
+        loans = db.query(Loan).filter(Loan.id.in_(closed)).all() if closed else []
+        return {"loans": loans, "failed": failed}
+
     @staticmethod
     def get_open_loans_by_user(db: Session, user_id: uuid.UUID) -> list[Loan]:
         """Get all open loans for a user"""
@@ -223,6 +543,27 @@ class LoanService:
             .all()
         )
 
+    @staticmethod
+    def get_loan_history_with_incidents(db: Session, user_id: uuid.UUID) -> list[Loan]:
+        """Get all loans for a user with bike, stations, incidents and sanctions preloaded.
+
+        Las relaciones se cargan con ``selectinload`` de modo que el número de
+        consultas es fijo sin importar cuántos préstamos o incidentes tenga el
+        usuario. Usar junto con ``IncidentService.summarize_loan_incidents``.
+        """
+        return (
+            db.query(Loan)
+            .options(
+                selectinload(Loan.bike),
+                selectinload(Loan.station_out),
+                selectinload(Loan.station_in),
+                selectinload(Loan.incidents).selectinload(Incident.sanctions),
+            )
+            .filter(Loan.user_id == user_id)
+            .order_by(Loan.time_out.desc())
+            .all()
+        )
+
     @staticmethod
     def get_all_loans(db: Session) -> list[Loan]:
         """Get all loans ordered by latest time_out first"""
@@ -240,7 +581,64 @@ class LoanService:
             .all()
         )
 
+    @staticmethod
+    def search_loans(
+        db: Session,
+        station_code: str | None = None,
+        cedula_prefix: str = "",
+        page: int = 1,
+        page_size: int = 5,
+        after: tuple[datetime, uuid.UUID] | None = None,
+    ) -> tuple[list[Loan], int]:
+        """Search loans by station and user cedula prefix, one page at a time.
+
+        Returns the loans of the requested page (latest first) and the total
+        number of matches. When *after* holds the ``(time_out, id)`` of the
+        last loan of the previous page, keyset pagination is used instead of
+        ``OFFSET`` so deep pages cost the same as the first one.
+
+        El prefijo de cédula se resuelve como un rango (``>= prefijo`` y
+        ``< sucesor``) para aprovechar el índice único de ``users.cedula``.
+        """
+        query = db.query(Loan)
+
+        if station_code:
+            station_id = select(Station.id).where(Station.code == station_code).scalar_subquery()
+            query = query.filter(
+                or_(Loan.station_out_id == station_id, Loan.station_in_id == station_id)
+            )
 
+        cedula_prefix = (cedula_prefix or "").strip()
+        if cedula_prefix:
+            upper = cedula_prefix[:-1] + chr(ord(cedula_prefix[-1]) + 1)
+            query = query.join(User, Loan.user_id == User.id).filter(
+                User.cedula >= cedula_prefix, User.cedula < upper
+            )
+
+        total = query.count()
+
+        query = query.options(
+            joinedload(Loan.user),
+            joinedload(Loan.bike),
+            joinedload(Loan.station_out),
+            joinedload(Loan.station_in),
+        ).order_by(Loan.time_out.desc(), Loan.id.desc())
+
+        if after is not None:
+            last_time_out, last_id = after
+            query = query.filter(
+                or_(
+                    Loan.time_out < last_time_out,
+                    and_(Loan.time_out == last_time_out, Loan.id < last_id),
+                )
+            )
+        else:
+            query = query.offset((max(page, 1) - 1) * page_size)
+
+        return query.limit(page_size).all(), total
+
+
+@instrument_class
 class FavoriteBikeService:
     @staticmethod
     def get_user_favorite_bike(db: Session, user_id: uuid.UUID) -> Bicycle | None:
@@ -254,33 +652,31 @@ class FavoriteBikeService:
         user = UserService.get_user_by_cedula(db, cedula)
         return user.favorite_bike if user else None
 
+    @staticmethod
+    def _bikes_used_query(db: Session):
+        """Bicicletas distintas de los préstamos, la de uso más reciente primero.
+
+        Se resuelve en SQL (``GROUP BY`` + estación precargada) para no cargar
+        ``loan.bike`` préstamo por préstamo.
+        """
+        return (
+            db.query(Bicycle)
+            .join(Loan, Loan.bike_id == Bicycle.id)
+            .options(selectinload(Bicycle.current_station))
+            .group_by(Bicycle.id)
+            .order_by(func.max(Loan.time_out).desc())
+        )
+
     @staticmethod
     def get_bikes_used_by_user(db: Session, user_id: uuid.UUID) -> list[Bicycle]:
         """Get all bikes that a user has used in their loan history"""
-        loans = LoanService.get_loans_by_user(db, user_id)
-        used_bikes = []
-        seen_bikes = set()
-        
-        for loan in loans:
-            if loan.bike and loan.bike.id not in seen_bikes:
-                used_bikes.append(loan.bike)
-                seen_bikes.add(loan.bike.id)
-        
-        return used_bikes
+        return FavoriteBikeService._bikes_used_query(db).filter(Loan.user_id == user_id).all()
 
     @staticmethod
     def get_bikes_used_by_user_cedula(db: Session, cedula: str) -> list[Bicycle]:
         """Get all bikes that a user has used in their loan history by cedula"""
-        loans = LoanService.get_loan_history_by_cedula(db, cedula)
-        used_bikes = []
-        seen_bikes = set()
-        
-        for loan in loans:
-            if loan.bike and loan.bike.id not in seen_bikes:
-                used_bikes.append(loan.bike)
-                seen_bikes.add(loan.bike.id)
-        
-        return used_bikes
+        user_id = select(User.id).where(User.cedula == cedula).scalar_subquery()
+        return FavoriteBikeService._bikes_used_query(db).filter(Loan.user_id == user_id).all()
 
     @staticmethod
     def set_favorite_bike(db: Session, user_id: uuid.UUID, bike_id: uuid.UUID) -> bool:
@@ -301,6 +697,7 @@ class FavoriteBikeService:
         user = db.query(User).filter(User.id == user_id).first()
         if user:
             user.favorite_bike_id = bike_id
+            emit(db, FavoriteChanged(user_id, bike_id))
             db.commit()
             db.refresh(user)
             return True
@@ -322,6 +719,7 @@ class FavoriteBikeService:
         user = db.query(User).filter(User.id == user_id).first()
         if user:
             user.favorite_bike_id = None
+            emit(db, FavoriteChanged(user_id, None))
             db.commit()
             db.refresh(user)
             return True
@@ -346,7 +744,19 @@ class FavoriteBikeService:
         """Check if a bike is someone's favorite"""
         return db.query(User).filter(User.favorite_bike_id == bike_id).first() is not None
 
+    @staticmethod
+    def get_favorite_owners(db: Session, bike_ids: list[uuid.UUID]) -> dict[uuid.UUID, User]:
+        """Dueño de cada bicicleta favorita de *bike_ids* en una sola consulta.
+
+        Las bicicletas que no son favoritas de nadie no aparecen en el resultado.
+        """
+        if not bike_ids:
+            return {}
+        owners = db.query(User).filter(User.favorite_bike_id.in_(bike_ids)).all()
+        return {user.favorite_bike_id: user for user in owners}
 
+
+@instrument_class
 class IncidentService:
     """Servicio para manejar incidentes y reportes de devolución"""
     
@@ -395,6 +805,8 @@ class IncidentService:
             description=description,
         )
         db.add(incident)
+        db.flush()
+        emit(db, IncidentReported(incident.id, loan_id, bike_id))
         db.commit()
         db.refresh(incident)
         return incident
@@ -452,14 +864,15 @@ class IncidentService:
             created_by=created_by,
         )
         db.add(return_report)
-        db.commit()
-        db.refresh(return_report)
+        db.flush()
         
         # Asociar incidentes al reporte
         if incidents:
             for incident in incidents:
                 incident.return_report_id = return_report.id
-            db.commit()
+        emit(db, ReturnReportCreated(return_report.id, loan_id, total_days))
+        db.commit()
+        db.refresh(return_report)
         
         return return_report
     
@@ -468,7 +881,172 @@ class IncidentService:
         """Obtener todos los incidentes de un préstamo"""
         return db.query(Incident).filter(Incident.loan_id == loan_id).all()
     
+    @staticmethod
+    def summarize_loan_incidents(loan: Loan) -> dict:
+        """Resumir el estado de incidentes y sanciones de un préstamo.
+
+        Trabaja sobre ``loan.incidents`` y ``incident.sanctions`` ya cargados
+        (ver ``LoanService.get_loan_history_with_incidents``), sin consultar
+        la base de datos.
+        """
+        incidents = loan.incidents
+        all_sanctions_expired = True
+        any_appeal_rejected = False
+
+        for incident in incidents:
+            sanction = incident.sanctions[0] if incident.sanctions else None
+            if sanction is None:
+                all_sanctions_expired = False
+                continue
+
+            if sanction.status != SanctionStatusEnum.expirada:
+                all_sanctions_expired = False
+
+            # Apelación rechazada: la sanción sigue activa tras apelarse
+            if sanction.appeal_text and sanction.status == SanctionStatusEnum.activa:
+                any_appeal_rejected = True
+
+        return {
+            "has_incident": bool(incidents),
+            "all_sanctions_expired": all_sanctions_expired,
+            "any_appeal_rejected": any_appeal_rejected,
+        }
+
     @staticmethod
     def get_return_report_by_loan(db: Session, loan_id: uuid.UUID) -> ReturnReport:
         """Obtener el reporte de devolución de un préstamo"""
         return db.query(ReturnReport).filter(ReturnReport.loan_id == loan_id).first()
+
+
+@instrument_class
+class ReturnReportService:
+    """Consultas de reportes de devolución para la vista de administración"""
+
+    @staticmethod
+    def get_reports_page(
+        db: Session,
+        station_code: str | None = None,
+        page: int = 1,
+        page_size: int = 10,
+    ) -> tuple[list[ReturnReport], int]:
+        """Obtener una página de reportes (más recientes primero) y el total.
+
+        Si se indica ``station_code`` sólo se devuelven los reportes cuyo
+        préstamo salió o llegó a esa estación; el filtro se resuelve en SQL.
+        Préstamo, usuario, bicicleta, estaciones, incidentes y sanciones se
+        cargan en bloque para que la vista no dispare consultas por fila.
+        """
+        query = db.query(ReturnReport).join(Loan, ReturnReport.loan_id == Loan.id)
+
+        if station_code:
+            station_id = select(Station.id).where(Station.code == station_code).scalar_subquery()
+            query = query.filter(
+                or_(Loan.station_out_id == station_id, Loan.station_in_id == station_id)
+            )
+
+        total = query.count()
+
+        reports = (
+            query.options(
+                joinedload(ReturnReport.loan).joinedload(Loan.user),
+                joinedload(ReturnReport.loan).joinedload(Loan.bike),
+                joinedload(ReturnReport.loan).joinedload(Loan.station_out),
+                joinedload(ReturnReport.loan).joinedload(Loan.station_in),
+                joinedload(ReturnReport.creator),
+                selectinload(ReturnReport.incidents).selectinload(Incident.sanctions),
+            )
+            .order_by(ReturnReport.created_at.desc(), ReturnReport.id.desc())
+            .offset((max(page, 1) - 1) * page_size)
+            .limit(page_size)
+            .all()
+        )
+        return reports, total
+
+
+@instrument_class
+class SanctionService:
+    """Creación, apelación y resolución de sanciones"""
+
+    @staticmethod
+    def is_user_blocked(db: Session, user_id: uuid.UUID, at: datetime | None = None) -> bool:
+        """¿Tiene *user_id* una sanción activa en *at* (por defecto, ahora)?
+
+        Se responde desde ``sanction_cache``; la BD sólo se consulta si el
+        usuario no está en caché.
+        """
+        return SanctionService.blocked_until(db, user_id, at) is not None
+
+    @staticmethod
+    def blocked_until(db: Session, user_id: uuid.UUID, at: datetime | None = None) -> datetime | None:
+        """Fin (UTC) de la sanción activa de *user_id* en *at*, o ``None``"""
+        return sanction_cache.blocked_until(db, user_id, at or datetime.now(timezone.utc))
+
+    @staticmethod
+    def blocked_users(
+        db: Session, user_ids: set[uuid.UUID], at: datetime | None = None
+    ) -> set[uuid.UUID]:
+        """Usuarios de *user_ids* bloqueados en *at*, con a lo sumo una consulta"""
+        return sanction_cache.blocked_users(db, user_ids, at or datetime.now(timezone.utc))
+
+    @staticmethod
+    def create_sanction(
+        db: Session,
+        incident_id: uuid.UUID,
+        operator_id: uuid.UUID | None,
+        days: int,
+    ) -> Sanction:
+        """Sancionar al usuario del préstamo del incidente durante *days* días"""
+        incident = db.get(Incident, incident_id)
+        if incident is None:
+            raise ValueError("Incidente no encontrado")
+
+        now_utc = datetime.now(timezone.utc)
+        sanction = Sanction(
+            user_id=incident.loan.user_id,
+            incident_id=incident_id,
+            operator_id=operator_id,
+            start_at=now_utc,
+            end_at=now_utc + timedelta(days=days),
+        )
+        db.add(sanction)
+        db.flush()
+        emit(db, SanctionCreated(sanction.id, sanction.user_id, incident_id))
+        db.commit()
+        db.refresh(sanction)
+        return sanction
+
+    @staticmethod
+    def appeal_sanction(db: Session, sanction_id: uuid.UUID, text: str) -> Sanction:
+        """Registrar la apelación del usuario; la sanción queda ``apelada``"""
+        sanction = db.get(Sanction, sanction_id)
+        if sanction is None:
+            raise ValueError("Sanción no encontrada")
+
+        sanction.appeal_text = text
+        sanction.status = SanctionStatusEnum.apelada
+        emit(db, SanctionAppealed(sanction.id, sanction.user_id))
+        db.commit()
+        return sanction
+
+    @staticmethod
+    def resolve_appeal(
+        db: Session, sanction_id: uuid.UUID, approve: bool, response: str
+    ) -> Sanction:
+        """Resolver una apelación.
+
+        Si se acepta, la sanción expira en este momento; si se rechaza,
+        vuelve a quedar activa hasta su fecha de fin.
+        """
+        sanction = db.get(Sanction, sanction_id)
+        if sanction is None:
+            raise ValueError("Sanción no encontrada")
+
+        sanction.appeal_response = response
+        if approve:
+            sanction.status = SanctionStatusEnum.expirada
+            sanction.end_at = datetime.now(timezone.utc)
+        else:
+            sanction.status = SanctionStatusEnum.activa
+        emit(db, SanctionResolved(sanction.id, sanction.user_id, approve))
+        db.commit()
+        return sanction
@@ -0,0 +1,126 @@
+"""Datos y opciones compartidos por los benchmarks de la capa de servicios.
+
+Los benchmarks sólo corren con ``--benchmark-only`` (requiere
+``pytest-benchmark``); en una ejecución normal de la suite se omiten. Los
+tamaños de datos se eligen con ``VECIRUN_BENCH_SIZES`` (por defecto
+``small``; ver ``synthetic_data.PRESETS``). Con ``--benchmark-autosave`` los
+resultados se guardan como JSON en ``.benchmarks/`` para comparar versiones::
+
+    pytest tests/benchmarks --benchmark-only --benchmark-autosave
+    VECIRUN_BENCH_SIZES=small,medium,large pytest tests/benchmarks --benchmark-only
+    pytest tests/benchmarks --benchmark-only --benchmark-compare
+"""
+
+import importlib.util
+import os
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from database import apply_sqlite_pragmas, engine_options
+from models import (
+    Bicycle,
+    BikeStatusEnum,
+    Loan,
+    LoanStatusEnum,
+    Sanction,
+    SanctionStatusEnum,
+    Station,
+    User,
+    UserRoleEnum,
+)
+from synthetic_data import PRESETS, generate
+
+HAS_BENCHMARK = importlib.util.find_spec("pytest_benchmark") is not None
+
+if not HAS_BENCHMARK:
+    collect_ignore_glob = ["test_*.py"]
+
+
+def _sizes() -> list[str]:
+    sizes = os.getenv("VECIRUN_BENCH_SIZES", "small")
+    return [size.strip() for size in sizes.split(",") if size.strip() in PRESETS]
+
+
+def pytest_collection_modifyitems(config, items):
+    if HAS_BENCHMARK and config.getoption("benchmark_only", False):
+        return
+    skip = pytest.mark.skip(reason="benchmark: ejecutar con --benchmark-only")
+    here = os.path.dirname(__file__)
+    for item in items:
+        if str(item.fspath).startswith(here):
+            item.add_marker(skip)
+
+
+class Dataset:
+    """BD sintética de un tamaño dado y los datos de referencia para medir."""
+
+    def __init__(self, size: str, url: str) -> None:
+        self.size = size
+        self.engine = create_engine(url, **engine_options(url))
+        apply_sqlite_pragmas(self.engine)
+        generate(self.engine, **PRESETS[size], seed=1234)
+        self.Session = sessionmaker(bind=self.engine, expire_on_commit=False)
+
+        with self.Session() as db:
+            now = func.now()
+            self.admin_id = db.scalar(select(User.id).where(User.role == UserRoleEnum.admin))
+            # Usuario con más préstamos y estación con más salidas: el peor caso
+            self.heavy_user_id, self.heavy_cedula = db.execute(
+                select(User.id, User.cedula)
+                .join(Loan, Loan.user_id == User.id)
+                .group_by(User.id, User.cedula)
+                .order_by(func.count(Loan.id).desc())
+                .limit(1)
+            ).one()
+            self.busy_station_code = db.scalar(
+                select(Station.code)
+                .join(Loan, Loan.station_out_id == Station.id)
+                .group_by(Station.code)
+                .order_by(func.count(Loan.id).desc())
+                .limit(1)
+            )
+            self.free_bikes = list(
+                db.execute(
+                    select(Bicycle.id, Bicycle.current_station_id).where(
+                        Bicycle.status == BikeStatusEnum.disponible
+                    )
+                )
+            )
+            busy_users = select(Loan.user_id).where(Loan.status == LoanStatusEnum.abierto)
+            sanctioned = select(Sanction.user_id).where(
+                Sanction.status == SanctionStatusEnum.activa, Sanction.end_at >= now
+            )
+            self.free_users = list(
+                db.scalars(
+                    select(User.id).where(
+                        User.role == UserRoleEnum.usuario,
+                        User.id.not_in(busy_users),
+                        User.id.not_in(sanctioned),
+                    )
+                )
+            )
+
+    def take_checkout(self) -> tuple:
+        """Un par (usuario, bicicleta, estación) aún sin usar por otro benchmark."""
+        bike_id, station_id = self.free_bikes.pop()
+        return self.free_users.pop(), bike_id, station_id
+
+
+@pytest.fixture(scope="session", params=_sizes())
+def dataset(request, tmp_path_factory):
+    size = request.param
+    path = tmp_path_factory.mktemp(f"bench_{size}") / "vecirun.db"
+    data = Dataset(size, f"sqlite:///{path}")
+    yield data
+    data.engine.dispose()
+
+
+@pytest.fixture()
+def db(dataset):
+    session = dataset.Session()
+    try:
+        yield session
+    finally:
+        session.close()
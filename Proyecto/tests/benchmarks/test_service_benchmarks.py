@@ -0,0 +1,108 @@
+"""Tiempos de las rutas críticas de la capa de servicios.
+
+Cada benchmark corre una vez por tamaño de ``VECIRUN_BENCH_SIZES`` (ver
+``conftest.py``). Las operaciones que modifican datos usan
+``benchmark.pedantic`` con un ``setup`` que prepara una bicicleta y un
+usuario libres en cada ronda, de modo que sólo se mide el servicio.
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from sqlalchemy import select  # noqa: E402
+
+from models import Loan, LoanStatusEnum  # noqa: E402
+from services import (  # noqa: E402
+    FavoriteBikeService,
+    IncidentService,
+    LoanService,
+    StationService,
+)
+
+# Rondas para las operaciones de escritura: cada una consume una bicicleta libre
+ROUNDS = 30
+
+
+def _group(benchmark, dataset):
+    benchmark.group = f"{dataset.size}"
+    benchmark.extra_info["size"] = dataset.size
+
+
+# ---------------------------------------------------------------------------
+# Escritura
+# ---------------------------------------------------------------------------
+
+
+def test_create_loan(benchmark, dataset, db):
+    _group(benchmark, dataset)
+
+    benchmark.pedantic(
+        lambda user_id, bike_id, station_id: LoanService.create_loan(
+            db, user_id, bike_id, station_id
+        ),
+        setup=lambda: (dataset.take_checkout(), {}),
+        rounds=ROUNDS,
+    )
+
+
+def test_return_loan(benchmark, dataset, db):
+    _group(benchmark, dataset)
+
+    def setup():
+        user_id, bike_id, station_id = dataset.take_checkout()
+        loan = LoanService.create_loan(db, user_id, bike_id, station_id)
+        return (loan.id, station_id), {}
+
+    benchmark.pedantic(
+        lambda loan_id, station_id: LoanService.return_loan(db, loan_id, station_id),
+        setup=setup,
+        rounds=ROUNDS,
+    )
+
+
+def test_set_favorite_bike(benchmark, dataset, db):
+    _group(benchmark, dataset)
+    bike_id = db.scalar(select(Loan.bike_id).where(Loan.user_id == dataset.heavy_user_id).limit(1))
+
+    assert benchmark(FavoriteBikeService.set_favorite_bike, db, dataset.heavy_user_id, bike_id)
+
+
+def test_create_return_report(benchmark, dataset, db):
+    _group(benchmark, dataset)
+    closed = list(
+        db.scalars(
+            select(Loan.id)
+            .where(Loan.status == LoanStatusEnum.cerrado, Loan.user_id == dataset.heavy_user_id)
+            .limit(ROUNDS)
+        )
+    )
+
+    benchmark.pedantic(
+        lambda loan_id: IncidentService.create_return_report(db, loan_id, dataset.admin_id),
+        setup=lambda: ((closed.pop(),), {}),
+        rounds=min(ROUNDS, len(closed)),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Lectura
+# ---------------------------------------------------------------------------
+
+
+def test_loan_history_by_cedula(benchmark, dataset, db):
+    _group(benchmark, dataset)
+    loans = benchmark(LoanService.get_loan_history_by_cedula, db, dataset.heavy_cedula)
+    assert loans
+
+
+def test_loans_by_station_code(benchmark, dataset, db):
+    _group(benchmark, dataset)
+    loans = benchmark(LoanService.get_loans_by_station_code, db, dataset.busy_station_code)
+    assert loans
+
+
+def test_availability_counts(benchmark, dataset, db):
+    _group(benchmark, dataset)
+    counts = benchmark(StationService.get_availability_counts, db)
+    assert counts
@@ -0,0 +1,125 @@
+"""Latencia de arranque en frío de la aplicación.
+
+Cada ronda lanza un proceso nuevo que importa ``main`` y ejecuta
+``VeciRunApp.main`` con una página mínima, así que el tiempo incluye el
+intérprete, las importaciones y la preparación de la BD. Se compara el modo
+desarrollo (``create_all`` + datos de ejemplo) con el de producción
+(revisión de Alembic y sin datos de ejemplo) sobre la misma BD, y se
+desglosa ``import main`` con ``python -X importtime``.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from sqlalchemy import create_engine, text  # noqa: E402
+
+from database import SCHEMA_REVISION  # noqa: E402
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+ROUNDS = 5
+
+# Proceso hijo: mide hasta el primer ``page.update()`` y hasta el final de ``main``
+CHILD = """
+import json, time
+start = time.perf_counter()
+import main
+
+from flet_core.pubsub import PubSubClient, PubSubHub
+
+class Page:
+    def __init__(self):
+        self.first_frame = None
+        self.pubsub = PubSubClient(PubSubHub(), "bench")
+    def add(self, *controls):
+        pass
+    def update(self):
+        if self.first_frame is None:
+            self.first_frame = time.perf_counter()
+
+page = Page()
+main.VeciRunApp().main(page)
+done = time.perf_counter()
+print(json.dumps({"first_frame_ms": (page.first_frame - start) * 1000, "main_ms": (done - start) * 1000}))
+"""
+
+
+@pytest.fixture(scope="module")
+def database_url(tmp_path_factory):
+    path = tmp_path_factory.mktemp("startup") / "vecirun.db"
+    url = f"sqlite:///{path}"
+    # Primer arranque en desarrollo: crea las tablas y los datos de ejemplo
+    _launch(url, "development")
+    # Marcar la BD como migrada, como haría ``alembic upgrade head``
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) PRIMARY KEY)"))
+        conn.execute(text("INSERT INTO alembic_version VALUES (:rev)"), {"rev": SCHEMA_REVISION})
+    engine.dispose()
+    return url
+
+
+def _launch(url: str, mode: str) -> dict:
+    env = dict(os.environ, DATABASE_URL=url, VECIRUN_ENV=mode)
+    env.pop("VECIRUN_SEED_SAMPLE_DATA", None)
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        cwd=ROOT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("mode", ["development", "production"])
+def test_cold_start(benchmark, database_url, mode):
+    benchmark.group = "startup"
+    timings = benchmark.pedantic(_launch, args=(database_url, mode), rounds=ROUNDS)
+    benchmark.extra_info.update(mode=mode, **timings)
+    assert timings["first_frame_ms"] <= timings["main_ms"]
+
+
+def _import_main() -> dict:
+    """``import main`` en un proceso limpio con ``-X importtime``.
+
+    Devuelve el tiempo acumulado de ``main`` y los módulos de mayor costo
+    propio (µs), que es lo que conviene mirar al comparar versiones.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT_DIR,
+        env=dict(os.environ, DATABASE_URL="sqlite:///:memory:"),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        if own.strip().isdigit():
+            modules[name.strip()] = (int(own), int(cumulative))
+    slowest = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)[:10]
+    return {
+        "main_cumulative_us": modules["main"][1],
+        "modules": len(modules),
+        "views": sorted(name for name in modules if name.startswith("views.")),
+        "slowest_self_us": {name: own for name, (own, _) in slowest},
+    }
+
+
+def test_import_main(benchmark):
+    benchmark.group = "startup"
+    timings = benchmark.pedantic(_import_main, rounds=ROUNDS)
+    benchmark.extra_info.update(timings)
+    # Las vistas de administración se importan al navegar, no al arrancar
+    assert timings["views"] == ["views.assets", "views.base", "views.home"]
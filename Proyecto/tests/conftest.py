@@ -1,9 +1,37 @@
 import sys
+from contextlib import contextmanager
 from pathlib import Path
 
+import pytest
+from sqlalchemy import event
+
 # Ensure the project root directory is on sys.path so that `import models` and other
 # top-level modules can be imported inside the test suite, even when tests are
 # executed from within the `tests/` directory.
 ROOT_DIR = Path(__file__).resolve().parent.parent
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
+
+
+@pytest.fixture()
+def count_statements():
+    """Cuenta sentencias SQL: ``with count_statements(engine) as statements: ...``.
+
+    ``statements`` es la lista de textos SQL emitidos por *engine* dentro del
+    bloque; las pruebas de presupuesto de consultas comparan su longitud.
+    """
+
+    @contextmanager
+    def _count(engine):
+        statements: list[str] = []
+
+        def _listener(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _listener)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", _listener)
+
+    return _count
@@ -0,0 +1,53 @@
+import base64
+import os
+
+import pytest
+
+from views import assets
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    assets.clear_cache()
+    yield
+    assets.clear_cache()
+
+
+def test_asset_is_encoded_once(monkeypatch, tmp_path):
+    png = tmp_path / "mapa.png"
+    png.write_bytes(b"v1")
+    monkeypatch.setitem(assets.ASSETS, "mapa.png", png)
+
+    reads = []
+    real_open = open
+
+    def counting_open(path, *args, **kwargs):
+        reads.append(path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", counting_open)
+
+    first = assets.image("mapa.png", width=10)
+    second = assets.image("mapa.png", width=10)
+
+    assert first is not second
+    assert first.src_base64 == second.src_base64 == base64.b64encode(b"v1").decode()
+    assert reads == [png]
+
+
+def test_asset_reloads_when_mtime_changes(monkeypatch, tmp_path):
+    png = tmp_path / "mapa.png"
+    png.write_bytes(b"v1")
+    monkeypatch.setitem(assets.ASSETS, "mapa.png", png)
+    assert assets.get_base64("mapa.png") == base64.b64encode(b"v1").decode()
+
+    png.write_bytes(b"v2")
+    stat = os.stat(png)
+    os.utime(png, (stat.st_atime, stat.st_mtime + 10))
+
+    assert assets.get_base64("mapa.png") == base64.b64encode(b"v2").decode()
+
+
+def test_unknown_asset_raises():
+    with pytest.raises(KeyError):
+        assets.get_base64("no-existe.png")
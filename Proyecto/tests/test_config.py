@@ -0,0 +1,65 @@
+import importlib
+
+import pytest
+
+import config
+import database
+
+
+@pytest.fixture()
+def reload_config(monkeypatch):
+    def _reload(**env):
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        return importlib.reload(config)
+
+    yield _reload
+    monkeypatch.undo()
+    importlib.reload(config)
+
+
+def test_database_url_and_pool_come_from_environment(reload_config):
+    cfg = reload_config(
+        DATABASE_URL="postgresql://vecirun:secret@db:5432/vecirun",
+        DB_POOL_SIZE="25",
+        DB_MAX_OVERFLOW="5",
+        DB_POOL_PRE_PING="false",
+        DB_POOL_RECYCLE="600",
+        DB_STATEMENT_TIMEOUT_MS="2000",
+    )
+
+    assert cfg.DATABASE_URL == "postgresql://vecirun:secret@db:5432/vecirun"
+    assert cfg.DB_POOL_SIZE == 25
+    assert cfg.DB_MAX_OVERFLOW == 5
+    assert cfg.DB_POOL_PRE_PING is False
+    assert cfg.DB_POOL_RECYCLE == 600
+    assert cfg.DB_STATEMENT_TIMEOUT_MS == 2000
+
+
+def test_defaults_to_local_sqlite(reload_config, monkeypatch):
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.delenv("DB_POOL_SIZE", raising=False)
+    cfg = reload_config()
+
+    assert cfg.DATABASE_URL == f"sqlite:///{cfg.DB_FILENAME}"
+    assert cfg.DB_POOL_SIZE == 10
+
+
+def test_sqlite_profile_comes_from_environment(reload_config):
+    cfg = reload_config(SQLITE_BUSY_TIMEOUT_MS="250")
+    assert cfg.SQLITE_PRAGMAS["journal_mode"] == "WAL"
+    assert cfg.SQLITE_PRAGMAS["busy_timeout"] == 250
+
+    cfg = reload_config(SQLITE_PROFILE="false")
+    assert cfg.SQLITE_PRAGMAS == {}
+
+
+def test_engine_options_per_backend():
+    pg = database.engine_options("postgresql://u:p@localhost/db")
+    assert "statement_timeout" in pg["connect_args"]["options"]
+    assert pg["pool_size"] == database.POOL_OPTIONS["pool_size"]
+
+    sqlite_file = database.engine_options("sqlite:////tmp/vecirun.db")
+    assert sqlite_file["connect_args"] == {"check_same_thread": False}
+
+    assert database.engine_options("sqlite:///:memory:") == {}
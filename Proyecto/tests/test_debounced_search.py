@@ -0,0 +1,122 @@
+import uuid
+
+import pytest
+
+from events import LoanOpened, bus
+import views.debounced_search as debounced_search
+from views.debounced_search import DebouncedSearch
+
+
+class _ManualTimer:
+    """Timer de prueba: sólo se ejecuta cuando el test lo dispara."""
+
+    created: list["_ManualTimer"] = []
+
+    def __init__(self, delay, fn, args=()):
+        self.fn = fn
+        self.args = args
+        self.cancelled = False
+        _ManualTimer.created.append(self)
+
+    def start(self):
+        pass
+
+    def cancel(self):
+        self.cancelled = True
+
+    def fire(self):
+        if not self.cancelled:
+            self.fn(*self.args)
+
+
+@pytest.fixture(autouse=True)
+def manual_timer(monkeypatch):
+    _ManualTimer.created = []
+    monkeypatch.setattr(debounced_search, "Timer", _ManualTimer)
+    return _ManualTimer
+
+
+def test_keystrokes_are_coalesced():
+    calls, results = [], []
+    search = DebouncedSearch(lambda q: calls.append(q) or q.upper(), lambda q, r: results.append(r))
+
+    for query in ["1", "12", "123"]:
+        search.submit(query)
+
+    timers = _ManualTimer.created
+    assert [t.cancelled for t in timers] == [True, True, False]
+
+    for timer in timers:
+        timer.fire()
+
+    assert calls == ["123"]
+    assert results == ["123"]
+
+
+def test_stale_result_is_discarded():
+    results = []
+    pending = {}
+
+    def slow_search(query):
+        # Mientras se resuelve "1" llega una nueva pulsación
+        if query == "1":
+            search.submit("12")
+            pending["timer"] = _ManualTimer.created[-1]
+        return f"res-{query}"
+
+    search = DebouncedSearch(slow_search, lambda q, r: results.append(r))
+    search.submit("1")
+    _ManualTimer.created[0].fire()
+    assert results == []
+
+    pending["timer"].fire()
+    assert results == ["res-12"]
+
+
+def test_cached_prefix_skips_query():
+    calls, results = [], []
+    search = DebouncedSearch(lambda q: calls.append(q) or len(q), lambda q, r: results.append(r))
+
+    search.submit("100")
+    _ManualTimer.created[-1].fire()
+    search.submit("1002")
+    _ManualTimer.created[-1].fire()
+
+    # Borrar el último dígito vuelve al prefijo ya consultado
+    timers_before = len(_ManualTimer.created)
+    search.submit("100")
+
+    assert len(_ManualTimer.created) == timers_before
+    assert calls == ["100", "1002"]
+    assert results == [3, 4, 3]
+
+    search.clear_cache()
+    search.submit("100")
+    _ManualTimer.created[-1].fire()
+    assert calls == ["100", "1002", "100"]
+
+
+def test_loan_events_invalidate_cached_results():
+    calls, results = [], []
+    search = DebouncedSearch(lambda q: calls.append(q) or len(q), lambda q, r: results.append(r))
+
+    search.submit("100")
+    _ManualTimer.created[-1].fire()
+    search.submit("100")
+    assert calls == ["100"]
+
+    # Un préstamo confirmado en cualquier página deja obsoleto lo guardado
+    bus.publish(
+        LoanOpened(
+            loan_id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+            bike_id=uuid.uuid4(),
+            station_out_id=uuid.uuid4(),
+        )
+    )
+    timers_before = len(_ManualTimer.created)
+    search.submit("100")
+    assert len(_ManualTimer.created) == timers_before + 1
+    _ManualTimer.created[-1].fire()
+    assert calls == ["100", "100"]
+    assert results == [3, 3, 3]
@@ -0,0 +1,238 @@
+import asyncio
+import threading
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import events
+from events import (
+    DomainEvent,
+    EventBus,
+    FavoriteChanged,
+    LoanClosed,
+    LoanOpened,
+    ReturnReportCreated,
+    SanctionAppealed,
+    SanctionCreated,
+    SanctionResolved,
+)
+from models import (
+    Base,
+    Bicycle,
+    BikeStatusEnum,
+    IncidentSeverityEnum,
+    IncidentTypeEnum,
+    SanctionStatusEnum,
+    Station,
+    UserAffiliationEnum,
+    UserRoleEnum,
+)
+from services import (
+    FavoriteBikeService,
+    IncidentService,
+    LoanService,
+    SanctionService,
+    UserService,
+)
+
+
+@pytest.fixture()
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture()
+def received():
+    """Eventos publicados en el bus global durante la prueba."""
+    seen = []
+    unsubscribe = events.subscribe(DomainEvent, seen.append)
+    yield seen
+    unsubscribe()
+
+
+def _seed(db, bikes=2):
+    station = Station(code="EST001", name="Calle 26")
+    db.add(station)
+    db.flush()
+    bicycles = [
+        Bicycle(
+            serial_number=f"SN{i}",
+            bike_code=f"BK{i}",
+            status=BikeStatusEnum.disponible,
+            current_station_id=station.id,
+        )
+        for i in range(bikes)
+    ]
+    db.add_all(bicycles)
+    db.commit()
+    user = UserService.create_user(
+        db,
+        cedula="123",
+        carnet="C123",
+        full_name="Ana",
+        email="ana@example.com",
+        affiliation=UserAffiliationEnum.estudiante,
+        role=UserRoleEnum.usuario,
+    )
+    return station, bicycles, user
+
+
+# ---------------------------------------------------------------------------
+# Bus
+# ---------------------------------------------------------------------------
+
+
+def test_events_are_published_after_commit_and_dropped_on_rollback(db, received):
+    event = FavoriteChanged(user_id=None, bike_id=None)
+
+    events.emit(db, event)
+    assert received == []
+    db.commit()
+    assert received == [event]
+
+    db.add(Station(code="EST001", name="Calle 26"))
+    db.flush()
+    events.emit(db, event)
+    db.rollback()
+    db.commit()
+    assert received == [event]
+
+
+def test_subscribers_filter_by_type_and_survive_failures(caplog):
+    bus = EventBus()
+    loans, everything = [], []
+
+    def broken(_event):
+        raise RuntimeError("boom")
+
+    bus.subscribe(DomainEvent, broken)
+    unsubscribe = bus.subscribe(LoanOpened, loans.append)
+    bus.subscribe(DomainEvent, everything.append)
+
+    opened = LoanOpened(loan_id=1, user_id=2, bike_id=3, station_out_id=4)
+    closed = LoanClosed(loan_id=1, user_id=2, bike_id=3, station_in_id=4)
+    bus.publish(opened)
+    bus.publish(closed)
+    assert loans == [opened]
+    assert everything == [opened, closed]
+    assert "boom" in caplog.text
+
+    unsubscribe()
+    bus.publish(opened)
+    assert loans == [opened]
+
+
+def test_update_stage_runs_before_notify_stage():
+    bus = EventBus()
+    calls = []
+
+    bus.subscribe(DomainEvent, lambda _e: calls.append("notify"), stage=events.STAGE_NOTIFY)
+    bus.subscribe(DomainEvent, lambda _e: calls.append("update-1"))
+    bus.subscribe(DomainEvent, lambda _e: calls.append("update-2"), stage=events.STAGE_UPDATE)
+
+    bus.publish(FavoriteChanged(user_id=1, bike_id=2))
+    assert calls == ["update-1", "update-2", "notify"]
+
+
+def test_async_subscribers_run_on_their_loop():
+    bus = EventBus()
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    done = threading.Event()
+    seen = []
+
+    async def handler(event):
+        seen.append((event, threading.current_thread()))
+        done.set()
+
+    with pytest.raises(ValueError):
+        bus.subscribe(DomainEvent, handler)
+    bus.subscribe(DomainEvent, handler, loop=loop)
+
+    event = FavoriteChanged(user_id=1, bike_id=2)
+    bus.publish(event)
+    assert done.wait(2)
+    assert seen == [(event, thread)]
+
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(2)
+    loop.close()
+
+
+# ---------------------------------------------------------------------------
+# Servicios
+# ---------------------------------------------------------------------------
+
+
+def test_loan_and_favorite_services_emit_events(db, received):
+    station, bikes, user = _seed(db)
+    received.clear()
+
+    loan = LoanService.create_loan(db, user.id, bikes[0].id, station.id)
+    LoanService.return_loan(db, loan.id, station.id)
+    FavoriteBikeService.set_favorite_bike(db, user.id, bikes[0].id)
+
+    assert received == [
+        LoanOpened(loan.id, user.id, bikes[0].id, station.id, previous_station_id=station.id),
+        LoanClosed(loan.id, user.id, bikes[0].id, station.id, station_out_id=station.id),
+        FavoriteChanged(user.id, bikes[0].id),
+    ]
+
+    # Las operaciones masivas emiten un evento por préstamo
+    received.clear()
+    result = LoanService.create_loans_bulk(db, [(user.id, bikes[1].id)], station.id)
+    (bulk_loan,) = result["loans"]
+    LoanService.return_loans_bulk(db, [bulk_loan.id], station.id)
+    assert [type(e) for e in received] == [LoanOpened, LoanClosed]
+    assert {e.loan_id for e in received} == {bulk_loan.id}
+
+
+def test_sanction_lifecycle_emits_events(db, received):
+    station, bikes, user = _seed(db)
+    loan = LoanService.create_loan(db, user.id, bikes[0].id, station.id)
+    incident = IncidentService.create_incident(
+        db,
+        loan.id,
+        bikes[0].id,
+        user.id,
+        IncidentTypeEnum.deterioro,
+        IncidentSeverityEnum.media,
+        "Rayón",
+    )
+    report = IncidentService.create_return_report(db, loan.id, user.id, [incident])
+    assert report.total_incident_days == 3
+    assert incident.return_report_id == report.id
+    received.clear()
+
+    sanction = SanctionService.create_sanction(db, incident.id, None, 3)
+    assert sanction.user_id == user.id and sanction.status == SanctionStatusEnum.activa
+
+    SanctionService.appeal_sanction(db, sanction.id, "No fui yo")
+    assert sanction.status == SanctionStatusEnum.apelada
+
+    resolved = SanctionService.resolve_appeal(db, sanction.id, True, "Aceptada")
+    assert resolved.status == SanctionStatusEnum.expirada
+    assert resolved.end_at.replace(tzinfo=timezone.utc) <= datetime.now(timezone.utc)
+
+    assert received == [
+        SanctionCreated(sanction.id, user.id, incident.id),
+        SanctionAppealed(sanction.id, user.id),
+        SanctionResolved(sanction.id, user.id, True),
+    ]
+
+
+def test_return_report_event(db, received):
+    station, bikes, user = _seed(db, bikes=1)
+    loan = LoanService.create_loan(db, user.id, bikes[0].id, station.id)
+    received.clear()
+
+    report = IncidentService.create_return_report(db, loan.id, user.id)
+    assert received == [ReturnReportCreated(report.id, loan.id, 0)]
@@ -312,6 +312,45 @@ def test_get_return_report_by_loan(session, sample_data):
     assert non_existent_report is None
 
 
+def test_loan_history_with_incidents_summary(session, sample_data):
+    """Test eager-loaded loan history and incident/sanction summary."""
+    from models import Sanction, SanctionStatusEnum
+
+    data = sample_data
+
+    incident = IncidentService.create_incident(
+        db=session,
+        loan_id=data["loan"].id,
+        bike_id=data["bike"].id,
+        reporter_id=data["admin"].id,
+        incident_type=IncidentTypeEnum.accidente,
+        severity=IncidentSeverityEnum.leve,
+        description="Caída leve",
+    )
+    now = datetime.now(timezone.utc)
+    session.add(
+        Sanction(
+            user_id=data["user"].id,
+            incident_id=incident.id,
+            start_at=now,
+            end_at=now + timedelta(days=1),
+            status=SanctionStatusEnum.activa,
+            appeal_text="No fue mi culpa",
+        )
+    )
+    session.commit()
+
+    loans = LoanService.get_loan_history_with_incidents(session, data["user"].id)
+    assert len(loans) == 1
+
+    summary = IncidentService.summarize_loan_incidents(loans[0])
+    assert summary == {
+        "has_incident": True,
+        "all_sanctions_expired": False,
+        "any_appeal_rejected": True,
+    }
+
+
 def test_severity_days_mapping():
     """Test that severity to days mapping is correct."""
     assert IncidentService.SEVERITY_DAYS[1] == 1   # leve
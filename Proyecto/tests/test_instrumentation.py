@@ -0,0 +1,105 @@
+import json
+import logging
+
+import flet as ft
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+import instrumentation
+from models import Base, Station
+from services import StationService
+from views.base import View
+from views.instrumentation_view import InstrumentationView
+
+
+class DummyPage:
+    def update(self):
+        pass
+
+
+class DummyApp:
+    def __init__(self, db):
+        self.db = db
+        self.page = DummyPage()
+
+
+class _StationsView(View):
+    def __init__(self, app):
+        self.app = app
+
+    def build(self):
+        with self.session() as db:
+            stations = StationService.get_all_stations(db)
+            db.query(Station).count()
+        return ft.Text(str(len(stations)))
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    instrumentation.stats.reset()
+    instrumentation.enable(engine)
+    try:
+        yield engine
+    finally:
+        instrumentation.disable(engine)
+        instrumentation.stats.reset()
+
+
+def test_statements_are_attributed_to_service_and_view(engine, caplog):
+    db = sessionmaker(bind=engine)()
+    db.add_all([Station(code="EST001", name="A"), Station(code="EST002", name="B")])
+    db.commit()
+    instrumentation.stats.reset()
+
+    with caplog.at_level(logging.INFO, logger="vecirun.instrumentation"):
+        _StationsView(DummyApp(db)).build()
+
+    snapshot = instrumentation.stats.snapshot()
+    service = snapshot["StationService.get_all_stations"]
+    view = snapshot["_StationsView.build"]
+    assert service["calls"] == 1 and service["statements"] == 1
+    # La vista incluye la consulta del servicio más la propia
+    assert view["calls"] == 1 and view["statements"] == 2
+
+    records = [json.loads(r.getMessage()) for r in caplog.records]
+    assert {r["scope"] for r in records} == {
+        "StationService.get_all_stations",
+        "_StationsView.build",
+    }
+    assert all(set(r) == {"scope", "statements", "sql_ms", "wall_ms"} for r in records)
+    db.close()
+
+
+def test_failed_statement_does_not_leak_its_start_time(engine):
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM no_existe"))
+        conn.execute(text("SELECT 1"))
+        assert conn.info[instrumentation._START_KEY] == {}
+    assert instrumentation.stats.snapshot()[instrumentation.UNATTRIBUTED]["statements"] == 1
+
+
+def test_disabled_instrumentation_records_nothing(engine):
+    instrumentation.disable(engine)
+    db = sessionmaker(bind=engine)()
+    StationService.get_all_stations(db)
+    assert instrumentation.stats.snapshot() == {}
+    db.close()
+
+
+def test_admin_panel_lists_scopes(engine):
+    db = sessionmaker(bind=engine)()
+    StationService.get_all_stations(db)
+
+    view = InstrumentationView(DummyApp(db))
+    view.build()
+    labels = [row.cells[0].content.value for row in view.table.rows]
+    assert "StationService.get_all_stations" in labels
+
+    view._reset()
+    assert view.table.rows == []
+    db.close()
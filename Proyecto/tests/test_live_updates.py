@@ -0,0 +1,211 @@
+import asyncio
+
+import flet as ft
+import pytest
+from flet_core.pubsub import PubSubClient, PubSubHub
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import main
+from live_updates import LiveUpdates
+from models import (
+    Base,
+    Bicycle,
+    BikeStatusEnum,
+    IncidentSeverityEnum,
+    IncidentTypeEnum,
+    Station,
+    UserAffiliationEnum,
+    UserRoleEnum,
+)
+from occupancy import StationOccupancy
+from services import IncidentService, LoanService, SanctionService, UserService
+from views.availability import AvailabilityView
+from views.dashboard import DashboardView
+from views.loan import LoanView
+from views.return_report_view import ReturnReportView
+from views.return_view import ReturnView
+
+
+class DummyPage:
+    dialog = None
+    overlay: list = []
+
+    def __init__(self, hub, session_id):
+        # Sin *executor* el hub entrega los mensajes en el hilo que publica
+        self.pubsub = PubSubClient(hub, session_id)
+        self.updates = 0
+
+    def update(self):
+        self.updates += 1
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def db(engine):
+    """Sesión de la página que escribe."""
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield session
+    session.close()
+
+
+@pytest.fixture()
+def seeded(db):
+    stations = [Station(code="EST001", name="Calle 26"), Station(code="EST002", name="Uriel")]
+    db.add_all(stations)
+    db.flush()
+    bikes = [
+        Bicycle(
+            serial_number=f"SN{i}",
+            bike_code=f"BK{i}",
+            status=BikeStatusEnum.disponible,
+            current_station_id=stations[0].id,
+        )
+        for i in range(2)
+    ]
+    db.add_all(bikes)
+    db.commit()
+    user = UserService.create_user(
+        db,
+        cedula="123",
+        carnet="C123",
+        full_name="Ana",
+        email="ana@example.com",
+        affiliation=UserAffiliationEnum.estudiante,
+        role=UserRoleEnum.usuario,
+    )
+    return stations, bikes, user
+
+
+@pytest.fixture()
+def open_page(engine, db):
+    """Crea páginas conectadas al mismo hub, como en modo web."""
+    hub = PubSubHub(loop=asyncio.new_event_loop())
+    occupancy = StationOccupancy.load(db)
+    # Las vistas leen con su propia sesión, no con la que publicó el evento
+    view_db = sessionmaker(bind=engine, expire_on_commit=False)()
+    apps = []
+
+    def _open(user=None, role="regular", station=None):
+        app = main.VeciRunApp()
+        app.db = view_db
+        app.page = DummyPage(hub, f"session-{len(apps)}")
+        app.content_area = ft.Container()
+        app.occupancy = occupancy
+        app.current_user = user
+        app.current_user_role = role
+        if station:
+            app.current_user_station = station
+        app.live = LiveUpdates(app)
+        apps.append(app)
+        return app
+
+    yield _open
+    for app in apps:
+        app.live.close()
+    view_db.close()
+
+
+def _texts(control):
+    yield from (c.value for c in _walk(control) if isinstance(c, ft.Text))
+
+
+def _walk(control):
+    yield control
+    for attr in ("controls", "content"):
+        child = getattr(control, attr, None)
+        if isinstance(child, list):
+            for c in child:
+                yield from _walk(c)
+        elif child is not None:
+            yield from _walk(child)
+
+
+def test_loans_and_returns_patch_the_mounted_views(db, seeded, open_page):
+    (est1, est2), bikes, user = seeded
+    availability = open_page()
+    availability_view = AvailabilityView(availability)
+    availability.mount(availability_view)
+    pin = availability_view._pins[est1.id]
+    lending = open_page(role="admin", station="EST001")
+    loan_view = LoanView(lending)
+    lending.mount(loan_view)
+    returning = open_page(role="admin", station="EST002")
+    returning.mount(ReturnView(returning))
+    assert "BK0" in _texts(lending.content_area.content)
+
+    loan = LoanService.create_loan(db, user.id, bikes[0].id, est1.id, est2.id)
+
+    assert pin.tooltip == "1 bicicletas disponibles"
+    assert "BK0" not in _texts(lending.content_area.content)
+    assert "Bicicleta: BK0" in _texts(returning.content_area.content)
+    assert [p.page.updates for p in (availability, lending, returning)] == [1, 1, 1]
+
+    LoanService.return_loan(db, loan.id, est1.id)
+
+    assert pin.tooltip == "2 bicicletas disponibles"
+    assert "BK0" in _texts(lending.content_area.content)
+    assert "Bicicleta: BK0" not in _texts(returning.content_area.content)
+    assert any(
+        "No hay devoluciones pendientes" in t for t in _texts(returning.content_area.content)
+    )
+
+
+def test_views_that_are_no_longer_mounted_are_left_alone(db, seeded, open_page):
+    (est1, _), bikes, user = seeded
+    app = open_page()
+    view = AvailabilityView(app)
+    app.mount(view)
+    app.content_area.content = ft.Text("otra pantalla")
+
+    LoanService.create_loan(db, user.id, bikes[0].id, est1.id)
+
+    assert app.mounted_view is None
+    assert app.page.updates == 0
+    assert view._pins[est1.id].tooltip == "2 bicicletas disponibles"
+
+
+def test_sanction_banner_follows_sanction_events(db, seeded, open_page):
+    (est1, _), bikes, user = seeded
+    loan = LoanService.create_loan(db, user.id, bikes[0].id, est1.id)
+    incident = IncidentService.create_incident(
+        db,
+        loan.id,
+        bikes[0].id,
+        user.id,
+        IncidentTypeEnum.deterioro,
+        IncidentSeverityEnum.media,
+        "Rayón",
+    )
+    app = open_page(user=user)
+    dashboard = DashboardView(app)
+    app.mount(dashboard)
+    assert not dashboard._sanction_banner.visible
+
+    sanction = SanctionService.create_sanction(db, incident.id, None, 3)
+    assert dashboard._sanction_banner.visible
+    assert any("sanción activa" in t for t in _texts(app.content_area.content))
+
+    SanctionService.resolve_appeal(db, sanction.id, True, "Aceptada")
+    assert not dashboard._sanction_banner.visible
+
+
+def test_screens_shown_outside_navigation_stay_mounted(db, seeded, open_page):
+    app = open_page(role="admin", station="EST001")
+    view = ReturnReportView(app)
+
+    # ``show`` es lo que usan la paginación y la creación de sanciones
+    view.show()
+
+    assert app.mounted_view is view
+    assert app.page.updates == 1
@@ -0,0 +1,106 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import apply_sqlite_pragmas, engine_options
+from models import (
+    Base,
+    Bicycle,
+    BikeStatusEnum,
+    Loan,
+    LoanStatusEnum,
+    Station,
+    User,
+    UserAffiliationEnum,
+    UserRoleEnum,
+)
+from services import LoanConflictError, LoanService
+
+
+def _seed(db, users: int):
+    station = Station(code="EST001", name="Calle 26")
+    db.add(station)
+    db.flush()
+    bike = Bicycle(
+        serial_number="SN01",
+        bike_code="BK01",
+        status=BikeStatusEnum.disponible,
+        current_station_id=station.id,
+    )
+    people = [
+        User(
+            cedula=f"C{i:04d}",
+            carnet=f"CARNET{i:04d}",
+            full_name=f"Usuario {i}",
+            email=f"u{i}@example.com",
+            affiliation=UserAffiliationEnum.estudiante,
+            role=UserRoleEnum.usuario,
+        )
+        for i in range(users)
+    ]
+    db.add_all([bike, *people])
+    db.commit()
+    return station.id, bike.id, [u.id for u in people]
+
+
+def test_second_checkout_of_same_bike_is_rejected():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    station_id, bike_id, (first, second) = _seed(db, 2)
+
+    LoanService.create_loan(db, first, bike_id, station_id)
+    with pytest.raises(LoanConflictError):
+        LoanService.create_loan(db, second, bike_id, station_id)
+
+    # El préstamo fallido no dejó rastro y la sesión sigue usable
+    assert db.query(Loan).count() == 1
+    assert db.get(Bicycle, bike_id).status == BikeStatusEnum.prestada
+    db.close()
+
+
+def test_concurrent_checkouts_lend_the_bike_only_once(tmp_path):
+    """Many operators race for the same bike: exactly one loan must win."""
+
+    url = f"sqlite:///{tmp_path / 'carrera.db'}"
+    engine = create_engine(url, **engine_options(url))
+    apply_sqlite_pragmas(engine)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+
+    operators = 16
+    with factory() as db:
+        station_id, bike_id, user_ids = _seed(db, operators)
+
+    barrier = threading.Barrier(operators)
+    outcomes: list[object] = []
+    lock = threading.Lock()
+
+    def _checkout(user_id):
+        with factory() as db:
+            barrier.wait()
+            try:
+                LoanService.create_loan(db, user_id, bike_id, station_id)
+                result: object = "ok"
+            except Exception as exc:  # noqa: BLE001
+                result = exc
+        with lock:
+            outcomes.append(result)
+
+    threads = [threading.Thread(target=_checkout, args=(uid,)) for uid in user_ids]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    winners = [o for o in outcomes if o == "ok"]
+    losers = [o for o in outcomes if o != "ok"]
+    assert len(winners) == 1
+    assert all(isinstance(o, LoanConflictError) for o in losers), losers
+
+    with factory() as db:
+        assert db.query(Loan).filter(Loan.status == LoanStatusEnum.abierto).count() == 1
+        assert db.get(Bicycle, bike_id).status == BikeStatusEnum.prestada
+    engine.dispose()
@@ -0,0 +1,70 @@
+import threading
+import types
+
+import main
+
+
+def test_each_page_gets_its_own_app(monkeypatch):
+    """``run_page`` must build an independent ``VeciRunApp`` per connected page."""
+
+    seen = []
+    monkeypatch.setattr(main.VeciRunApp, "main", lambda self, page: seen.append((self, page)))
+
+    page_a, page_b = object(), object()
+    main.run_page(page_a)
+    main.run_page(page_b)
+
+    (app_a, got_a), (app_b, got_b) = seen
+    assert app_a is not app_b
+    assert (got_a, got_b) == (page_a, page_b)
+
+    # El estado de sesión de un operador no se filtra a otro
+    app_a.current_user = types.SimpleNamespace(full_name="Operador A")
+    app_a.current_user_station = "EST001"
+    assert app_b.current_user is None
+    assert not hasattr(app_b, "current_user_station")
+
+
+def test_bootstrap_runs_once_for_concurrent_pages(monkeypatch):
+    """Tables, sample data and occupancy are prepared once per process."""
+
+    calls = {"tables": 0, "sample": 0, "occupancy": 0}
+    shared = object()
+
+    def _count(key, result=None):
+        def _inner(*_args, **_kwargs):
+            calls[key] += 1
+            return result
+
+        return _inner
+
+    monkeypatch.setattr(main, "_database_ready", False)
+    monkeypatch.setattr(main, "_shared_occupancy", None)
+    monkeypatch.setattr(main, "create_tables", _count("tables"))
+    monkeypatch.setattr(main, "populate_sample_data", _count("sample"))
+    monkeypatch.setattr(main.StationOccupancy, "load", _count("occupancy", shared))
+    monkeypatch.setattr(main, "session_scope", _NullScope)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(main.VeciRunApp().bootstrap()))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == {"tables": 1, "sample": 1, "occupancy": 1}
+    assert results == [shared] * 8
+
+
+class _NullScope:  # noqa: D101 – replaces session_scope without touching a DB
+    def __init__(self, session=None):
+        self.session = session
+
+    def __enter__(self):
+        return self.session
+
+    def __exit__(self, *exc):
+        return False
@@ -0,0 +1,102 @@
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from events import LoanOpened, emit
+from models import (
+    Base,
+    Bicycle,
+    BikeStatusEnum,
+    Station,
+    UserAffiliationEnum,
+    UserRoleEnum,
+)
+from occupancy import StationOccupancy
+from services import BicycleService, LoanService, UserService
+
+
+@pytest.fixture(scope="function")
+def session():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture()
+def data(session):
+    st_a = Station(code="EST001", name="A")
+    st_b = Station(code="EST002", name="B")
+    session.add_all([st_a, st_b])
+    session.flush()
+    bikes = [
+        Bicycle(serial_number=f"S{i}", bike_code=f"B{i}", current_station_id=st_a.id)
+        for i in range(3)
+    ]
+    session.add_all(bikes)
+    session.commit()
+    user = UserService.create_user(
+        session,
+        cedula="123",
+        carnet="",
+        full_name="Occ User",
+        email="occ@example.com",
+        affiliation=UserAffiliationEnum.estudiante,
+        role=UserRoleEnum.usuario,
+    )
+    return st_a, st_b, bikes, user
+
+
+def test_loan_and_return_update_counts_on_commit(session, data):
+    st_a, st_b, bikes, user = data
+    occupancy = StationOccupancy.load(session)
+    assert occupancy.available(st_a.id) == 3
+    assert occupancy.station_id("EST002") == st_b.id
+
+    loan = LoanService.create_loan(session, user.id, bikes[0].id, st_a.id, st_b.id)
+    assert occupancy.available(st_a.id) == 2
+    assert occupancy.borrowed(st_a.id) == 1
+
+    LoanService.return_loan(session, loan.id, st_b.id)
+    assert occupancy.available(st_a.id) == 2
+    assert occupancy.available(st_b.id) == 1
+    assert occupancy.borrowed(st_a.id) == 0
+
+    BicycleService.update_bicycle_status(session, bikes[1], BikeStatusEnum.mantenimiento)
+    assert occupancy.available(st_a.id) == 1
+
+    assert occupancy.verify(session) == {}
+
+
+def test_rolled_back_changes_are_discarded(session, data):
+    st_a, _, bikes, user = data
+    occupancy = StationOccupancy.load(session)
+
+    # Evento encolado en una transacción que se revierte
+    emit(
+        session,
+        LoanOpened(uuid.uuid4(), user.id, bikes[0].id, st_a.id, previous_station_id=st_a.id),
+    )
+    session.rollback()
+    session.commit()
+
+    assert occupancy.available(st_a.id) == 3
+    assert occupancy.borrowed(st_a.id) == 0
+
+
+def test_verify_reports_drift_and_resync_fixes_it(session, data):
+    st_a, _, bikes, _ = data
+    occupancy = StationOccupancy.load(session)
+
+    # Cambio hecho sin pasar por los servicios (no emite eventos)
+    bikes[2].status = BikeStatusEnum.mantenimiento
+    session.commit()
+
+    assert occupancy.verify(session) == {st_a.id: {"available": (3, 2)}}
+    occupancy.resync(session)
+    assert occupancy.verify(session) == {}
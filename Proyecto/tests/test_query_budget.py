@@ -0,0 +1,243 @@
+"""Presupuesto de consultas: construir una vista no debe disparar consultas por fila.
+
+Cada vista se construye sobre dos conjuntos de datos de distinto tamaño y se
+cuentan las sentencias SQL emitidas. Si el número crece con los datos hay un
+N+1 (una consulta por préstamo, bicicleta, incidente...).
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import flet as ft
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models import (
+    Base,
+    Bicycle,
+    BikeStatusEnum,
+    Incident,
+    IncidentTypeEnum,
+    Loan,
+    LoanStatusEnum,
+    ReturnReport,
+    Sanction,
+    SanctionStatusEnum,
+    Station,
+    User,
+    UserAffiliationEnum,
+    UserRoleEnum,
+)
+from views.availability import AvailabilityView
+from views.current_loan import CurrentLoanView
+from views.dashboard import DashboardView
+from views.favorite_bike import FavoriteBikeView
+from views.loan import LoanView
+from views.loan_history import LoanHistoryView
+from views.return_report_view import ReturnReportView
+from views.return_view import ReturnView
+
+SMALL, LARGE = 3, 15
+
+
+class DummyPage:
+    dialog = None
+    overlay: list = []
+
+    def update(self):
+        pass
+
+    def window_to_front(self):
+        pass
+
+
+class DummyApp:
+    def __init__(self, db, user, role, station=None):
+        self.db = db
+        self.page = DummyPage()
+        self.nav_rail = ft.NavigationRail()
+        self.content_area = ft.Container()
+        self.current_user = user
+        self.current_user_role = role
+        self.current_user_station = station
+
+    def show_dashboard_view(self):
+        pass
+
+    def clear_user_state(self):
+        pass
+
+    def update_navigation_for_role(self, _role):
+        pass
+
+
+# ---------------------------------------------------------------------------
+# Datos de prueba
+# ---------------------------------------------------------------------------
+
+
+def _user(i, role=UserRoleEnum.usuario):
+    return User(
+        cedula=f"{i:06d}",
+        carnet=f"CARNET{i:06d}",
+        full_name=f"Usuario {i}",
+        email=f"u{i}@example.com",
+        affiliation=UserAffiliationEnum.estudiante,
+        role=role,
+    )
+
+
+def _seed(db, n):
+    """*n* préstamos cerrados con incidentes/sanciones, *n* abiertos y *n* favoritas."""
+    st_out = Station(code="EST001", name="Calle 26")
+    st_in = Station(code="EST002", name="Calle 53")
+    admin = _user(0, UserRoleEnum.admin)
+    main = _user(1)
+    db.add_all([st_out, st_in, admin, main])
+    db.flush()
+
+    bikes = [
+        Bicycle(
+            serial_number=f"SN{i:04d}",
+            bike_code=f"BK{i:04d}",
+            status=BikeStatusEnum.disponible,
+            current_station_id=st_out.id,
+        )
+        for i in range(3 * n + 1)
+    ]
+    others = [_user(100 + i) for i in range(n)]
+    db.add_all(bikes + others)
+    db.flush()
+
+    now = datetime.now(timezone.utc)
+    # Historial del usuario principal: préstamos cerrados con incidentes y reportes
+    for i in range(n):
+        loan = Loan(
+            user_id=main.id,
+            bike_id=bikes[i].id,
+            station_out_id=st_out.id,
+            station_in_id=st_in.id,
+            status=LoanStatusEnum.cerrado,
+            time_out=now - timedelta(days=i + 2, hours=3),
+            time_in=now - timedelta(days=i + 2),
+        )
+        db.add(loan)
+        db.flush()
+        report = ReturnReport(loan_id=loan.id, total_incident_days=1, created_by=admin.id)
+        db.add(report)
+        db.flush()
+        incident = Incident(
+            loan_id=loan.id,
+            bike_id=bikes[i].id,
+            reporter_id=admin.id,
+            return_report_id=report.id,
+            type=IncidentTypeEnum.deterioro,
+            severity=1,
+            description="Rayón",
+        )
+        db.add(incident)
+        db.flush()
+        db.add(
+            Sanction(
+                user_id=main.id,
+                incident_id=incident.id,
+                operator_id=admin.id,
+                status=SanctionStatusEnum.expirada,
+                start_at=now - timedelta(days=i + 2),
+                end_at=now - timedelta(days=i + 1),
+            )
+        )
+
+    # Préstamos abiertos de otros usuarios que deben volver a EST001
+    for i, user in enumerate(others):
+        bike = bikes[n + i]
+        bike.status = BikeStatusEnum.prestada
+        bike.current_station_id = None
+        db.add(
+            Loan(
+                user_id=user.id,
+                bike_id=bike.id,
+                station_out_id=st_in.id,
+                station_in_id=st_out.id,
+                status=LoanStatusEnum.abierto,
+                time_out=now - timedelta(hours=1),
+            )
+        )
+        # Cada uno marca como favorita una bicicleta disponible
+        user.favorite_bike_id = bikes[2 * n + i].id
+
+    # Préstamo abierto del usuario principal
+    bikes[-1].status = BikeStatusEnum.prestada
+    bikes[-1].current_station_id = None
+    db.add(
+        Loan(
+            user_id=main.id,
+            bike_id=bikes[-1].id,
+            station_out_id=st_out.id,
+            station_in_id=st_in.id,
+            status=LoanStatusEnum.abierto,
+            time_out=now - timedelta(minutes=30),
+        )
+    )
+    db.commit()
+    return admin, main
+
+
+# ---------------------------------------------------------------------------
+# Conteo de sentencias
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def count_queries(count_statements):
+    """Devuelve ``count(view_cls, n, as_admin)`` → sentencias al construir la vista."""
+    engines = []
+
+    def _count(view_cls, n, as_admin):
+        engine = create_engine("sqlite:///:memory:")
+        engines.append(engine)
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine, expire_on_commit=False)()
+        admin, main = _seed(db, n)
+        if as_admin:
+            app = DummyApp(db, admin, "admin", station="EST001")
+        else:
+            app = DummyApp(db, main, "regular")
+        db.expunge_all()
+
+        with count_statements(engine) as statements:
+            view_cls(app).build()
+        db.close()
+        return len(statements)
+
+    yield _count
+    for engine in engines:
+        engine.dispose()
+
+
+VIEWS = [
+    (DashboardView, False),
+    (DashboardView, True),
+    (CurrentLoanView, False),
+    (LoanHistoryView, True),
+    (ReturnReportView, True),
+    (ReturnReportView, False),
+    (FavoriteBikeView, False),
+    (AvailabilityView, False),
+    (ReturnView, True),
+    (LoanView, True),
+]
+
+
+@pytest.mark.parametrize(
+    "view_cls, as_admin",
+    VIEWS,
+    ids=[f"{cls.__name__}-{'admin' if admin else 'usuario'}" for cls, admin in VIEWS],
+)
+def test_build_query_count_does_not_grow_with_data(count_queries, view_cls, as_admin):
+    small = count_queries(view_cls, SMALL, as_admin)
+    large = count_queries(view_cls, LARGE, as_admin)
+    assert small > 0
+    assert (
+        large == small
+    ), f"{view_cls.__name__}.build: {small} consultas con {SMALL} filas, {large} con {LARGE}"
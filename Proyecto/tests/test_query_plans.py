@@ -0,0 +1,180 @@
+import re
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from models import (
+    Base,
+    Bicycle,
+    BikeStatusEnum,
+    Incident,
+    IncidentTypeEnum,
+    Loan,
+    LoanStatusEnum,
+    Sanction,
+    SanctionStatusEnum,
+    Station,
+    User,
+    UserAffiliationEnum,
+)
+from services import IncidentService, LoanService, ReturnReportService
+
+# Tablas grandes: ninguna consulta de servicio debería recorrerlas completas
+HOT_TABLES = ("loans", "sanctions", "incidents")
+FULL_SCAN = re.compile(r"^SCAN (%s)\b" % "|".join(HOT_TABLES))
+
+
+@pytest.fixture()
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture()
+def data(db):
+    st_a = Station(code="EST001", name="A")
+    st_b = Station(code="EST002", name="B")
+    user = User(
+        cedula="1001",
+        carnet="C1001",
+        full_name="Plan User",
+        email="plan@example.com",
+        affiliation=UserAffiliationEnum.estudiante,
+    )
+    db.add_all([st_a, st_b, user])
+    db.flush()
+    bike = Bicycle(serial_number="S1", bike_code="B1", status=BikeStatusEnum.disponible)
+    db.add(bike)
+    db.flush()
+    loan = Loan(
+        user_id=user.id,
+        bike_id=bike.id,
+        station_out_id=st_a.id,
+        station_in_id=st_b.id,
+        status=LoanStatusEnum.abierto,
+    )
+    db.add(loan)
+    db.flush()
+    incident = Incident(loan_id=loan.id, bike_id=bike.id, type=IncidentTypeEnum.otro)
+    db.add(incident)
+    db.flush()
+    now = datetime.now(timezone.utc)
+    db.add(
+        Sanction(
+            user_id=user.id,
+            incident_id=incident.id,
+            status=SanctionStatusEnum.expirada,
+            start_at=now - timedelta(days=2),
+            end_at=now - timedelta(days=1),
+        )
+    )
+    db.commit()
+    return user, bike, loan, st_b
+
+
+def _query_plans(db, action):
+    """Run *action* and return ``[(sql, [plan detail, ...]), ...]`` for every SELECT it issued."""
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        action()
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+
+    plans = []
+    for statement, parameters in statements:
+        rows = db.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+        plans.append((statement, [row[-1] for row in rows]))
+    return plans
+
+
+def _assert_no_full_scans(plans):
+    assert plans, "no se capturó ninguna consulta"
+    for statement, details in plans:
+        scans = [d for d in details if FULL_SCAN.match(d)]
+        assert not scans, f"{scans} en:\n{statement}"
+
+
+def _uses(plans, index):
+    return any(index in d for _, details in plans for d in details)
+
+
+def test_loans_by_user_use_composite_indexes(db, data):
+    user, *_ = data
+
+    plans = _query_plans(db, lambda: LoanService.get_open_loans_by_user(db, user.id))
+    _assert_no_full_scans(plans)
+    assert _uses(plans, "ix_loans_user_id_status")
+
+    plans = _query_plans(db, lambda: LoanService.get_loans_by_user(db, user.id))
+    _assert_no_full_scans(plans)
+    assert _uses(plans, "ix_loans_user_id_time_out")
+    # El índice ya entrega las filas en orden de time_out
+    assert not _uses(plans, "TEMP B-TREE")
+
+
+def test_pending_returns_by_station_use_index(db, data):
+    *_, station_in = data
+
+    def _return_view_query():
+        (
+            db.query(Loan)
+            .options(joinedload(Loan.user), joinedload(Loan.bike))
+            .filter(Loan.status == LoanStatusEnum.abierto, Loan.station_in_id == station_in.id)
+            .all()
+        )
+
+    plans = _query_plans(db, _return_view_query)
+    _assert_no_full_scans(plans)
+    assert _uses(plans, "ix_loans_station_in_id_status")
+
+
+def test_active_sanction_check_uses_index(db, data):
+    user, bike, _loan, station = data
+    db.query(Bicycle).filter(Bicycle.id == bike.id).update({"status": BikeStatusEnum.prestada})
+    db.commit()
+
+    def _checkout():
+        with pytest.raises(ValueError):
+            LoanService.create_loan(db, user.id, bike.id, station.id)
+
+    plans = _query_plans(db, _checkout)
+    _assert_no_full_scans(plans)
+    assert _uses(plans, "ix_sanctions_user_id_status_window")
+
+
+def test_history_and_incident_lookups_use_indexes(db, data):
+    user, _bike, loan, _station = data
+
+    plans = _query_plans(db, lambda: LoanService.get_loan_history_with_incidents(db, user.id))
+    _assert_no_full_scans(plans)
+    assert _uses(plans, "ix_incidents_loan_id")
+    assert _uses(plans, "ix_sanctions_incident_id")
+
+    plans = _query_plans(db, lambda: IncidentService.get_incidents_by_loan(db, loan.id))
+    _assert_no_full_scans(plans)
+
+
+def test_station_search_uses_indexes(db, data):
+    plans = _query_plans(
+        db, lambda: LoanService.search_loans(db, station_code="EST002", page_size=5)
+    )
+    _assert_no_full_scans(plans)
+
+    plans = _query_plans(
+        db, lambda: ReturnReportService.get_reports_page(db, station_code="EST002")
+    )
+    _assert_no_full_scans(plans)
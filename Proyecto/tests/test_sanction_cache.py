@@ -0,0 +1,186 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models import (
+    Base,
+    Bicycle,
+    BikeStatusEnum,
+    IncidentSeverityEnum,
+    IncidentTypeEnum,
+    Sanction,
+    SanctionStatusEnum,
+    Station,
+    UserAffiliationEnum,
+    UserRoleEnum,
+)
+from sanction_cache import SanctionBlockCache
+from services import IncidentService, LoanService, SanctionService, UserService
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def db(engine):
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield session
+    session.close()
+
+
+class _SanctionQueries:
+    """Vista de ``count_statements`` limitada a las consultas sobre ``sanctions``."""
+
+    def __init__(self, statements):
+        self._statements = statements
+
+    def __len__(self):
+        return sum("FROM sanctions" in statement for statement in self._statements)
+
+
+@pytest.fixture()
+def sanction_queries(engine, count_statements):
+    """Sentencias sobre ``sanctions`` emitidas durante la prueba."""
+    with count_statements(engine) as statements:
+        yield _SanctionQueries(statements)
+
+
+def _seed(db, bikes=3):
+    station = Station(code="EST001", name="Calle 26")
+    db.add(station)
+    db.flush()
+    bicycles = [
+        Bicycle(
+            serial_number=f"SN{i}",
+            bike_code=f"BK{i}",
+            status=BikeStatusEnum.disponible,
+            current_station_id=station.id,
+        )
+        for i in range(bikes)
+    ]
+    db.add_all(bicycles)
+    db.commit()
+    user = UserService.create_user(
+        db,
+        cedula="123",
+        carnet="C123",
+        full_name="Ana",
+        email="ana@example.com",
+        affiliation=UserAffiliationEnum.estudiante,
+        role=UserRoleEnum.usuario,
+    )
+    return station, bicycles, user
+
+
+def test_checkout_skips_the_sanctions_scan_for_known_users(db, sanction_queries):
+    station, bikes, user = _seed(db)
+
+    loan = LoanService.create_loan(db, user.id, bikes[0].id, station.id)
+    assert len(sanction_queries) == 1
+    LoanService.return_loan(db, loan.id, station.id)
+
+    LoanService.create_loan(db, user.id, bikes[1].id, station.id)
+    assert len(sanction_queries) == 1
+
+
+def test_sanction_events_invalidate_the_user(db, sanction_queries):
+    station, bikes, user = _seed(db)
+    loan = LoanService.create_loan(db, user.id, bikes[0].id, station.id)
+    incident = IncidentService.create_incident(
+        db,
+        loan.id,
+        bikes[0].id,
+        user.id,
+        IncidentTypeEnum.deterioro,
+        IncidentSeverityEnum.media,
+        "Rayón",
+    )
+    LoanService.return_loan(db, loan.id, station.id)
+    assert not SanctionService.is_user_blocked(db, user.id)
+
+    sanction = SanctionService.create_sanction(db, incident.id, None, 3)
+    assert SanctionService.is_user_blocked(db, user.id)
+    with pytest.raises(ValueError):
+        LoanService.create_loan(db, user.id, bikes[1].id, station.id)
+
+    # El fin del bloqueo se conoce sin volver a consultar
+    queries = len(sanction_queries)
+    end_at = SanctionService.blocked_until(db, user.id)
+    assert end_at == sanction.end_at.replace(tzinfo=end_at.tzinfo)
+    assert not SanctionService.is_user_blocked(db, user.id, end_at + timedelta(seconds=1))
+    assert len(sanction_queries) == queries
+
+    SanctionService.appeal_sanction(db, sanction.id, "No fui yo")
+    assert not SanctionService.is_user_blocked(db, user.id)
+    SanctionService.resolve_appeal(db, sanction.id, False, "Rechazada")
+    assert SanctionService.is_user_blocked(db, user.id)
+    SanctionService.resolve_appeal(db, sanction.id, True, "Aceptada")
+    assert not SanctionService.is_user_blocked(db, user.id)
+
+
+def test_bulk_checkout_loads_missing_users_in_one_query(db, sanction_queries):
+    station, bikes, user = _seed(db)
+    other = UserService.create_user(
+        db,
+        cedula="456",
+        carnet="C456",
+        full_name="Luis",
+        email="luis@example.com",
+        affiliation=UserAffiliationEnum.estudiante,
+        role=UserRoleEnum.usuario,
+    )
+    now = datetime.now(timezone.utc)
+    db.add(
+        Sanction(
+            user_id=other.id,
+            start_at=now - timedelta(hours=1),
+            end_at=now + timedelta(days=1),
+            status=SanctionStatusEnum.activa,
+        )
+    )
+    db.commit()
+
+    result = LoanService.create_loans_bulk(
+        db, [(user.id, bikes[0].id), (other.id, bikes[1].id)], station.id
+    )
+    assert len(result["loans"]) == 1
+    assert [reason for _, reason in result["failed"]] == ["El usuario posee una sanción activa."]
+    assert len(sanction_queries) == 1
+
+
+def test_ttl_and_lru_bound_the_entries(db, sanction_queries):
+    _, _, user = _seed(db, bikes=0)
+    clock = [0.0]
+    cache = SanctionBlockCache(ttl=60, max_users=2, clock=lambda: clock[0])
+    now = datetime.now(timezone.utc)
+
+    assert cache.blocked_until(db, user.id, now) is None
+
+    # Escritura fuera de SanctionService: visible cuando vence el TTL
+    db.add(
+        Sanction(
+            user_id=user.id,
+            start_at=now - timedelta(hours=1),
+            end_at=now + timedelta(hours=1),
+            status=SanctionStatusEnum.activa,
+        )
+    )
+    db.commit()
+    assert cache.blocked_until(db, user.id, now) is None
+    clock[0] = 61
+    assert cache.blocked_until(db, user.id, now) is not None
+    assert len(sanction_queries) == 2
+
+    # Sólo se guardan los *max_users* usados más recientemente
+    cache.blocked_users(db, {uuid.uuid4(), uuid.uuid4()}, now)
+    assert len(cache) == 2
+    assert cache.blocked_until(db, user.id, now) is not None
+    assert len(sanction_queries) == 4
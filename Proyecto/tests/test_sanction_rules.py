@@ -253,4 +253,47 @@ def test_return_report_view_filters_by_admin_station(db_session):  # noqa: D401
 
     cards = _count_cards(control)
 
-    assert len(cards) == 1, "El administrador debe ver sólo los reportes de su estación" 
\ No newline at end of file
+    assert len(cards) == 1, "El administrador debe ver sólo los reportes de su estación" 
+
+def test_return_report_service_paginates_by_station(db_session):  # noqa: D401
+    """ReturnReportService debe filtrar por estación en SQL y paginar los reportes."""
+    from services import ReturnReportService
+
+    station1 = _create_station(db_session, "EST001")
+    station2 = _create_station(db_session, "EST002")
+    user = UserService.create_user(
+        db_session,
+        cedula="4444",
+        carnet="",
+        full_name="User Paginado",
+        email="p@example.com",
+        affiliation=UserAffiliationEnum.estudiante,
+        role=UserRoleEnum.usuario,
+    )
+
+    # 3 reportes en EST001 y 1 en EST002
+    for idx, station in enumerate([station1, station1, station1, station2]):
+        bike = _create_bike(db_session, f"SERP{idx}", f"BP{idx}")
+        loan = LoanService.create_loan(
+            db_session,
+            user_id=user.id,
+            bike_id=bike.id,
+            station_out_id=station.id,
+            station_in_id=station.id,
+        )
+        db_session.add(ReturnReport(loan_id=loan.id, total_incident_days=0, created_by=user.id))
+    db_session.commit()
+
+    page1, total = ReturnReportService.get_reports_page(
+        db_session, station_code="EST001", page=1, page_size=2
+    )
+    page2, _ = ReturnReportService.get_reports_page(
+        db_session, station_code="EST001", page=2, page_size=2
+    )
+
+    assert total == 3
+    assert len(page1) == 2 and len(page2) == 1
+    assert {r.id for r in page1}.isdisjoint({r.id for r in page2})
+
+    _, total_all = ReturnReportService.get_reports_page(db_session)
+    assert total_all == 4
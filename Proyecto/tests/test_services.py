@@ -1,3 +1,5 @@
+from datetime import datetime, timedelta, timezone
+
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -11,7 +13,10 @@ from models import (
     User,
     Bicycle,
     Station,
+    Sanction,
+    SanctionStatusEnum,
 )
+from occupancy import StationOccupancy
 from services import UserService, BicycleService, StationService, LoanService
 
 # -----------------------
@@ -123,6 +128,29 @@ def test_get_station_by_code(session):
     assert fetched.id == station.id
 
 
+def test_get_availability_counts_groups_by_station_and_status(session):
+    st1 = _create_station(session, "EST001", "Calle 26")
+    st2 = _create_station(session, "EST002", "Calle 45")
+    _create_station(session, "EST003", "Vacía")
+
+    for serial, status, station in [
+        ("S001", BikeStatusEnum.disponible, st1),
+        ("S002", BikeStatusEnum.disponible, st1),
+        ("S003", BikeStatusEnum.mantenimiento, st1),
+        ("S004", BikeStatusEnum.disponible, st2),
+    ]:
+        bike = _create_bicycle(session, serial, f"B{serial}", status)
+        bike.current_station_id = station.id
+    _create_bicycle(session, "S005", "BS005")  # sin estación
+    session.commit()
+
+    counts = StationService.get_availability_counts(session)
+    assert counts == {
+        st1.id: {BikeStatusEnum.disponible: 2, BikeStatusEnum.mantenimiento: 1},
+        st2.id: {BikeStatusEnum.disponible: 1},
+    }
+
+
 # -----------------------
 # LoanService tests
 # -----------------------
@@ -232,3 +260,159 @@ def test_bicycle_station_updates_on_loan_return(session):
     assert (
         bike.current_station_id == station_in.id
     ), "La bicicleta no se asignó correctamente a la estación de llegada"
+
+
+def test_search_loans_prefix_and_keyset_pagination(session):
+    """search_loans filtra por estación y prefijo de cédula y pagina por keyset."""
+    station = _create_station(session, "EST500", "Busqueda")
+    other_station = _create_station(session, "EST600", "Otra")
+    users = [
+        UserService.create_user(
+            session,
+            cedula=cedula,
+            carnet="",
+            full_name=f"Usuario {cedula}",
+            email=f"{cedula}@example.com",
+            affiliation=UserAffiliationEnum.estudiante,
+            role=UserRoleEnum.usuario,
+        )
+        for cedula in ("1010", "1020", "2010")
+    ]
+
+    idx = 0
+    for user in users:
+        for _ in range(3):
+            bike = _create_bicycle(session, f"SK{idx}", f"K{idx}")
+            LoanService.create_loan(session, user.id, bike.id, station.id)
+            idx += 1
+    # Un préstamo en otra estación que no debe aparecer
+    bike = _create_bicycle(session, "SK-OTHER", "K-OTHER")
+    LoanService.create_loan(session, users[0].id, bike.id, other_station.id)
+
+    page1, total = LoanService.search_loans(session, station_code="EST500", page_size=4)
+    assert total == 9
+    assert len(page1) == 4
+
+    # La segunda página por keyset coincide con la de OFFSET
+    cursor = (page1[-1].time_out, page1[-1].id)
+    keyset_page2, _ = LoanService.search_loans(
+        session, station_code="EST500", page=2, page_size=4, after=cursor
+    )
+    offset_page2, _ = LoanService.search_loans(session, station_code="EST500", page=2, page_size=4)
+    assert [ln.id for ln in keyset_page2] == [ln.id for ln in offset_page2]
+
+    # Prefijo de cédula: "10" coincide con 1010 y 1020, no con 2010
+    matches, total_prefix = LoanService.search_loans(
+        session, station_code="EST500", cedula_prefix="10", page_size=10
+    )
+    assert total_prefix == 6
+    assert {ln.user.cedula for ln in matches} == {"1010", "1020"}
+
+
+def test_bulk_checkout_and_return_report_per_item_failures(session):
+    """Group rental + end-of-day closing in one transaction each."""
+    station = _create_station(session, "EST600", "Grupo")
+    closing = _create_station(session, "EST700", "Cierre")
+    bikes = [_create_bicycle(session, f"S6{i}", f"B6{i}") for i in range(4)]
+    for bike in bikes:
+        bike.current_station_id = station.id
+    bikes[3].status = BikeStatusEnum.mantenimiento
+    users = [
+        UserService.create_user(
+            session,
+            cedula=f"60{i}",
+            carnet="",
+            full_name=f"Grupo {i}",
+            email=f"g{i}@example.com",
+            affiliation=UserAffiliationEnum.estudiante,
+        )
+        for i in range(5)
+    ]
+    now = datetime.now(timezone.utc)
+    session.add(
+        Sanction(
+            user_id=users[4].id,
+            status=SanctionStatusEnum.activa,
+            start_at=now - timedelta(days=1),
+            end_at=now + timedelta(days=1),
+        )
+    )
+    session.commit()
+
+    occupancy = StationOccupancy.load(session)
+
+    items = [
+        (users[0].id, bikes[0].id),
+        (users[1].id, bikes[1].id),
+        (users[2].id, bikes[1].id),  # bicicleta repetida
+        (users[3].id, bikes[3].id),  # en mantenimiento
+        (users[4].id, bikes[2].id),  # usuario sancionado
+    ]
+    result = LoanService.create_loans_bulk(session, items, station.id)
+
+    assert {ln.bike_id for ln in result["loans"]} == {bikes[0].id, bikes[1].id}
+    assert [item for item, _ in result["failed"]] == items[2:]
+    assert session.query(Bicycle).filter(Bicycle.status == BikeStatusEnum.prestada).count() == 2
+    assert occupancy.available(station.id) == 1
+    assert occupancy.borrowed(station.id) == 2
+
+    loan_ids = [ln.id for ln in result["loans"]]
+    missing = bikes[0].id  # no es un préstamo
+    returned = LoanService.return_loans_bulk(session, [*loan_ids, missing], closing.id)
+
+    assert {ln.id for ln in returned["loans"]} == set(loan_ids)
+    assert all(ln.status == LoanStatusEnum.cerrado for ln in returned["loans"])
+    assert returned["failed"] == [(missing, "Préstamo no encontrado.")]
+    session.refresh(bikes[0])
+    assert bikes[0].status == BikeStatusEnum.disponible
+    assert bikes[0].current_station_id == closing.id
+    assert occupancy.available(closing.id) == 2
+    assert occupancy.verify(session) == {}
+
+    # Cerrar de nuevo no cambia nada
+    again = LoanService.return_loans_bulk(session, loan_ids, closing.id)
+    assert again["loans"] == [] and len(again["failed"]) == 2
+
+
+@pytest.mark.parametrize("update_returning", [True, False])
+def test_bulk_checkout_skips_bike_moved_after_reading_its_station(
+    session, monkeypatch, update_returning
+):
+    station = _create_station(session, "EST800", "Origen")
+    other = _create_station(session, "EST801", "Otra")
+    bikes = [_create_bicycle(session, f"S8{i}", f"B8{i}") for i in range(2)]
+    for bike in bikes:
+        bike.current_station_id = station.id
+    users = [
+        UserService.create_user(
+            session,
+            cedula=f"80{i}",
+            carnet="",
+            full_name=f"Traslado {i}",
+            email=f"t{i}@example.com",
+            affiliation=UserAffiliationEnum.estudiante,
+        )
+        for i in range(2)
+    ]
+    session.commit()
+    monkeypatch.setattr(session.get_bind().dialect, "update_returning", update_returning)
+
+    # Otra transacción lleva la bicicleta a otra estación entre la lectura y la reserva
+    reserve = LoanService._reserve_bikes
+
+    def moved_then_reserve(db, stations):
+        db.query(Bicycle).filter(Bicycle.id == bikes[1].id).update(
+            {Bicycle.current_station_id: other.id}
+        )
+        return reserve(db, stations)
+
+    monkeypatch.setattr(LoanService, "_reserve_bikes", staticmethod(moved_then_reserve))
+
+    items = [(users[0].id, bikes[0].id), (users[1].id, bikes[1].id)]
+    result = LoanService.create_loans_bulk(session, items, station.id)
+
+    assert [ln.bike_id for ln in result["loans"]] == [bikes[0].id]
+    assert result["failed"] == [(items[1], "La bicicleta no está disponible.")]
+    session.refresh(bikes[1])
+    assert bikes[1].status == BikeStatusEnum.disponible
+    assert bikes[1].current_station_id == other.id
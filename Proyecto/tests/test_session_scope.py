@@ -0,0 +1,78 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import database
+from database import session_scope
+from models import Base, Station
+from views.base import View
+
+
+@pytest.fixture()
+def session_factory(monkeypatch):
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    monkeypatch.setattr(database, "SessionLocal", factory)
+    return factory
+
+
+class _DummyView(View):
+    def __init__(self, app):
+        self.app = app
+
+    def build(self):  # pragma: no cover - no se usa
+        return None
+
+
+class _DummyApp:
+    db = None
+
+
+def test_scope_opens_and_closes_a_new_session(session_factory):
+    with session_scope() as db:
+        db.add(Station(code="EST001", name="A"))
+        db.commit()
+        assert db.in_transaction() is False
+        db.query(Station).count()
+        assert db.in_transaction() is True
+
+    # Al salir la sesión se cerró y no queda transacción abierta
+    assert db.in_transaction() is False
+
+    # Los objetos siguen legibles tras cerrar la sesión
+    with session_scope() as db:
+        station = db.query(Station).one()
+    assert station.code == "EST001"
+
+
+def test_scope_rolls_back_on_error(session_factory):
+    with pytest.raises(RuntimeError):
+        with session_scope() as db:
+            db.add(Station(code="EST002", name="B"))
+            db.flush()
+            raise RuntimeError("boom")
+
+    with session_scope() as db:
+        assert db.query(Station).count() == 0
+
+
+def test_pinned_session_is_reused_and_left_open(session_factory):
+    pinned = session_factory()
+    pinned.query(Station).count()
+
+    with session_scope(pinned) as db:
+        assert db is pinned
+
+    assert pinned.in_transaction() is True
+    pinned.close()
+
+
+def test_view_session_uses_the_app_session(session_factory):
+    app = _DummyApp()
+    app.db = session_factory()
+    view = _DummyView(app)
+
+    with view.session() as db:
+        assert db is app.db
+    app.db.close()
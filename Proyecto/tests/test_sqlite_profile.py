@@ -0,0 +1,25 @@
+from sqlalchemy import create_engine, text
+
+from config import SQLITE_PRAGMAS
+from database import apply_sqlite_pragmas
+
+
+def test_pragmas_are_applied_on_connect(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'perfil.db'}")
+    apply_sqlite_pragmas(engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == SQLITE_PRAGMAS["busy_timeout"]
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+    engine.dispose()
+
+
+def test_empty_profile_keeps_sqlite_defaults(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'default.db'}")
+    apply_sqlite_pragmas(engine, {})
+
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+    engine.dispose()
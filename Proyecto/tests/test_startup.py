@@ -0,0 +1,118 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, text
+
+import database
+import main
+from database import SCHEMA_REVISION, SchemaVersionError, check_schema_revision
+from views.base import View
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+def test_schema_revision_matches_alembic_head():
+    config = Config(str(ROOT_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT_DIR / "alembic"))
+    assert ScriptDirectory.from_config(config).get_current_head() == SCHEMA_REVISION
+
+
+def test_check_schema_revision():
+    engine = create_engine("sqlite:///:memory:")
+    with pytest.raises(SchemaVersionError, match="ninguna"):
+        check_schema_revision(engine)
+
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) PRIMARY KEY)"))
+        conn.execute(text("INSERT INTO alembic_version VALUES ('f2aa549ef632')"))
+    with pytest.raises(SchemaVersionError, match="f2aa549ef632"):
+        check_schema_revision(engine)
+
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE alembic_version SET version_num = :rev"), {"rev": SCHEMA_REVISION}
+        )
+    check_schema_revision(engine)
+    engine.dispose()
+
+
+@pytest.mark.parametrize("seed", [False, True])
+def test_production_startup_trusts_migrations(monkeypatch, seed):
+    calls = []
+    monkeypatch.setattr(main, "_database_ready", False)
+    monkeypatch.setattr(main, "PRODUCTION", True)
+    monkeypatch.setattr(main, "SEED_SAMPLE_DATA", seed)
+    monkeypatch.setattr(main, "create_tables", lambda: calls.append("create_tables"))
+    monkeypatch.setattr(main, "check_schema_revision", lambda: calls.append("check"))
+    monkeypatch.setattr(main.VeciRunApp, "create_sample_data", lambda self: calls.append("seed"))
+
+    app = main.VeciRunApp()
+    app.prepare_database()
+    app.prepare_database()
+
+    assert calls == (["check", "seed"] if seed else ["check"])
+
+
+def test_production_startup_refuses_outdated_schema(monkeypatch):
+    engine = create_engine("sqlite:///:memory:")
+    monkeypatch.setattr(main, "_database_ready", False)
+    monkeypatch.setattr(main, "PRODUCTION", True)
+    monkeypatch.setattr(database, "engine", engine)
+
+    with pytest.raises(SchemaVersionError):
+        main.VeciRunApp().prepare_database()
+    assert main._database_ready is False
+    engine.dispose()
+
+
+# Navegación de un usuario regular en un proceso limpio: ingresar y abrir
+# "Disponibilidad" no debe importar los módulos de administración
+REGULAR_NAVIGATION = """
+import json, sys, types
+import main
+
+loaded = lambda: sorted(m for m in sys.modules if m.startswith("views."))
+at_import = loaded()
+app = main.VeciRunApp()
+app.page = types.SimpleNamespace(update=lambda: None)
+app.nav_rail = types.SimpleNamespace()
+app.update_navigation_for_role("regular")
+app.view_registry[1]()
+print(json.dumps({"import": at_import, "availability": loaded()}))
+"""
+
+
+def test_views_are_imported_on_first_navigation():
+    env = dict(os.environ, DATABASE_URL="sqlite:///:memory:")
+    result = subprocess.run(
+        [sys.executable, "-c", REGULAR_NAVIGATION],
+        cwd=ROOT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert modules["import"] == ["views.assets", "views.base", "views.home"]
+    assert "views.availability" in modules["availability"]
+    admin = {
+        "views.create_user",
+        "views.loan",
+        "views.return_view",
+        "views.loan_history",
+        "views.return_report_view",
+    }
+    assert not admin & set(modules["availability"])
+
+
+def test_every_registered_view_resolves():
+    for name in main._VIEW_MODULES:
+        cls = main.view_class(name)
+        assert cls.__name__ == name and issubclass(cls, View)
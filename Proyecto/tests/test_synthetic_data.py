@@ -0,0 +1,111 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Bicycle, BikeStatusEnum, Loan, LoanStatusEnum, Sanction, Station
+from occupancy import StationOccupancy
+from synthetic_data import generate
+
+SIZES = {"stations": 4, "bikes": 60, "users": 80, "loans": 600}
+
+
+def _engine():
+    return create_engine("sqlite:///:memory:")
+
+
+def test_generate_builds_a_consistent_dataset():
+    engine = _engine()
+    counts = generate(engine, **SIZES, seed=7, incident_rate=0.2)
+
+    assert counts["stations"] == 4
+    assert counts["users"] == 81  # + administrador
+    assert counts["bicycles"] == 60
+    assert counts["loans"] == 600
+    assert counts["incidents"] >= counts["return_reports"] > 0
+
+    db = sessionmaker(bind=engine)()
+    open_loans = db.query(Loan).filter(Loan.status == LoanStatusEnum.abierto).all()
+    assert len(open_loans) == 3  # 5 % de las bicicletas
+    # Cada préstamo abierto tiene su propia bicicleta, prestada y sin estación
+    assert len({ln.bike_id for ln in open_loans}) == len(open_loans)
+    for loan in open_loans:
+        bike = db.get(Bicycle, loan.bike_id)
+        assert bike.status == BikeStatusEnum.prestada and bike.current_station_id is None
+    assert (
+        db.query(func.count(Bicycle.id)).filter(Bicycle.status == BikeStatusEnum.prestada).scalar()
+        == 3
+    )
+
+    # El modelo de ocupación coincide con los datos generados
+    occupancy = StationOccupancy.load(db)
+    assert occupancy.verify(db) == {}
+
+    # Los índices diferidos se recrean al final
+    index_names = {ix["name"] for ix in inspect(engine).get_indexes("loans")}
+    assert {ix.name for ix in Loan.__table__.indexes} <= index_names
+    db.close()
+
+
+def test_same_seed_gives_same_data():
+    first, second = _engine(), _engine()
+    generate(first, **SIZES, seed=3)
+    generate(second, **SIZES, seed=3)
+
+    def _ids(engine):
+        db = sessionmaker(bind=engine)()
+        try:
+            return [row.id for row in db.query(Loan.id).order_by(Loan.id)]
+        finally:
+            db.close()
+
+    assert _ids(first) == _ids(second)
+
+
+def test_refuses_to_fill_a_populated_database():
+    engine = _engine()
+    generate(engine, stations=1, bikes=2, users=2, loans=2)
+    with pytest.raises(ValueError):
+        generate(engine, stations=1, bikes=2, users=2, loans=2)
+
+
+def test_each_bike_follows_its_own_timeline():
+    # Pocos días para forzar la concurrencia de préstamos
+    engine = _engine()
+    generate(engine, **SIZES, seed=11, days=2, incident_rate=0.2)
+    db = sessionmaker(bind=engine)()
+
+    lendable = {BikeStatusEnum.disponible, BikeStatusEnum.prestada}
+    loans_by_bike: dict = {}
+    for loan in db.query(Loan).order_by(Loan.time_out):
+        loans_by_bike.setdefault(loan.bike_id, []).append(loan)
+    for bike_id, bike_loans in loans_by_bike.items():
+        assert db.get(Bicycle, bike_id).status in lendable
+        for previous, following in zip(bike_loans, bike_loans[1:]):
+            assert previous.time_in is not None
+            assert previous.time_in <= following.time_out
+
+    # Sanciones en UTC: empiezan cuando se devolvió el préstamo (hora de Colombia)
+    sanctions = db.query(Sanction).all()
+    assert sanctions
+    for sanction in sanctions:
+        returned = sanction.incident.loan.time_in
+        assert sanction.start_at - returned == timedelta(hours=5)
+    db.close()
+
+
+def test_ids_that_look_like_numbers_are_stored_as_text():
+    # Sólo dígitos y una "e": con afinidad NUMERIC SQLite lo guardaría como float (inf)
+    station_id = uuid.UUID("2668434173e940739737507012345678")
+    engine = _engine()
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add(Station(id=station_id, code="EST001", name="Calle 26"))
+    db.commit()
+    db.expunge_all()
+
+    assert db.get(Station, station_id).code == "EST001"
+    assert db.execute(text("SELECT typeof(id) FROM stations")).scalar() == "text"
+    db.close()
@@ -170,13 +170,14 @@ def test_overlay_shows_station_info_on_pin_click(db_session, app):  # noqa: D401
     assert "2 bicicletas disponibles" in count_text, "El número de bicicletas disponibles es incorrecto"
 
 
-def test_refresh_button_reloads_view(db_session, app):  # noqa: D401
-    """The *Actualizar* button must rebuild the view and replace *content_area.content*."""
+def test_refresh_button_patches_counts_in_place(db_session, app):  # noqa: D401
+    """*Actualizar* must update the existing count texts instead of rebuilding the view."""
 
-    _create_station_with_bikes(db_session, "EST001")
+    station = _create_station_with_bikes(db_session, "EST001", bike_qty=1)
 
     view = AvailabilityView(app)
-    view.build()
+    root_control = view.build()
+    app.content_area.content = root_control
 
     # Dependemos de que otros tests puedan haber parcheado ``ft.ElevatedButton`` a otro
     # stub distinto. Para ser robustos recuperamos el callback desde la clase que esté
@@ -184,8 +185,59 @@ def test_refresh_button_reloads_view(db_session, app):  # noqa: D401
     refresh_callback = getattr(ft.ElevatedButton, "last_callback", None)  # type: ignore
     assert callable(refresh_callback), "No se capturó el callback del botón de refresco"
 
+    map_stack = root_control.controls[0].controls[5]
+    pin = map_stack.controls[1]
+    overlay = map_stack.controls[-1]
+    pin.on_click(types.SimpleNamespace(control=pin))
+    count_text = overlay.content.content.controls[1].content.controls[1]
+    assert count_text.value == "1 bicicletas disponibles"
+
+    db_session.add(
+        Bicycle(
+            serial_number="SN-EXTRA",
+            bike_code="BEXTRA",
+            status=BikeStatusEnum.disponible,
+            current_station_id=station.id,
+        )
+    )
+    db_session.commit()
+
     # Execute the callback (simulate button press)
     refresh_callback(None)
 
-    # The content area of the app should now contain a freshly built AvailabilityView (ft.Stack)
-    assert isinstance(app.content_area.content, ft.Stack), "La vista no se recargó correctamente tras presionar Actualizar" 
\ No newline at end of file
+    # The view is not rebuilt: same root, same controls, new values
+    assert app.content_area.content is root_control, "La vista no debe reconstruirse al actualizar"
+    assert count_text.value == "2 bicicletas disponibles"
+    assert pin.tooltip == "2 bicicletas disponibles"
+
+
+def test_auto_refresh_stops_when_view_is_replaced(db_session, app, monkeypatch):  # noqa: D401
+    """The periodic refresh re-schedules itself only while the view is mounted."""
+
+    scheduled = []
+
+    class _ManualTimer:  # noqa: D401 – records scheduled ticks
+        def __init__(self, _interval, function):
+            self.function = function
+            self.daemon = False
+            scheduled.append(self)
+
+        def start(self):
+            pass
+
+        def cancel(self):
+            pass
+
+    monkeypatch.setattr(av_module, "Timer", _ManualTimer)
+    _create_station_with_bikes(db_session, "EST001", bike_qty=1)
+
+    view = AvailabilityView(app, auto_refresh_interval=5)
+    app.content_area.content = view.build()
+    assert len(scheduled) == 1
+
+    scheduled[-1].function()
+    assert len(scheduled) == 2, "Mientras la vista está montada se re-programa el refresco"
+
+    app.content_area.content = ft.Container()
+    scheduled[-1].function()
+    assert len(scheduled) == 2, "Al cambiar de vista el refresco periódico se detiene"
@@ -14,8 +14,11 @@ from models import (
     UserRoleEnum,
     UserAffiliationEnum,
     LoanStatusEnum,
+    IncidentTypeEnum,
+    IncidentSeverityEnum,
+    Sanction,
 )
-from services import UserService, LoanService
+from services import UserService, LoanService, IncidentService
 from views.current_loan import CurrentLoanView
 
 
@@ -141,8 +144,11 @@ def test_open_and_past_loans(dummy_app):
     # Open loan
     LoanService.create_loan(session, user.id, bike.id, station.id)
 
-    # Past loan (create + return)
-    loan_closed = LoanService.create_loan(session, user.id, bike.id, station.id)
+    # Past loan (create + return) con otra bicicleta
+    bike2 = Bicycle(serial_number="SN02", bike_code="BK02", status=BikeStatusEnum.disponible)
+    session.add(bike2)
+    session.commit()
+    loan_closed = LoanService.create_loan(session, user.id, bike2.id, station.id)
     # Fast-forward: mark as returned 30 minutes later
     station2 = Station(code="ST02", name="Estacion 2")
     session.add(station2)
@@ -185,4 +191,55 @@ def test_open_and_past_loans(dummy_app):
 
     all_texts = collect_texts(root)
 
-    assert all(txt.value != "No hay préstamos pasados" for txt in all_texts) 
\ No newline at end of file
+    assert all(txt.value != "No hay préstamos pasados" for txt in all_texts)
+
+
+def test_build_query_count_does_not_grow_with_history(dummy_app, count_statements):
+    """Building the view must issue the same number of queries for 1 or many loans."""
+    session = dummy_app.db
+    station, _ = _create_common_entities(session)
+    user = _create_user(session)
+    dummy_app.current_user = user
+
+    def add_loan_with_sanctioned_incident(idx):
+        bike = Bicycle(
+            serial_number=f"SNX{idx}", bike_code=f"BX{idx}", status=BikeStatusEnum.disponible
+        )
+        session.add(bike)
+        session.commit()
+        loan = LoanService.create_loan(session, user.id, bike.id, station.id)
+        LoanService.return_loan(session, loan.id, station.id)
+        incident = IncidentService.create_incident(
+            session,
+            loan_id=loan.id,
+            bike_id=bike.id,
+            reporter_id=user.id,
+            incident_type=IncidentTypeEnum.deterioro,
+            severity=IncidentSeverityEnum.leve,
+            description="Incidente",
+        )
+        now = datetime.now()
+        session.add(
+            Sanction(
+                user_id=user.id,
+                incident_id=incident.id,
+                start_at=now - timedelta(days=2),
+                end_at=now - timedelta(days=1),
+            )
+        )
+        session.commit()
+
+    def count_build_queries():
+        session.expire_all()
+        with count_statements(session.get_bind()) as statements:
+            CurrentLoanView(dummy_app).build()
+        return len(statements)
+
+    add_loan_with_sanctioned_incident(0)
+    small = count_build_queries()
+
+    for idx in range(1, 8):
+        add_loan_with_sanctioned_incident(idx)
+    large = count_build_queries()
+
+    assert small == large
@@ -1,6 +1,6 @@
 import pytest
 import flet as ft
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from models import Base, Station, Bicycle, BikeStatusEnum, UserRoleEnum, UserAffiliationEnum
 from services import UserService, LoanService
@@ -51,11 +51,13 @@ def create_dummy_data(session, count):
     session.commit()
     session.refresh(station)
 
-    # Create a bicycle
-    bike = Bicycle(serial_number="SN01", bike_code="BC01", status=BikeStatusEnum.disponible)
-    session.add(bike)
+    # Create one bicycle per loan (a bike cannot be lent twice at once)
+    bikes = [
+        Bicycle(serial_number=f"SN{i:02d}", bike_code=f"BC{i:02d}", status=BikeStatusEnum.disponible)
+        for i in range(count)
+    ]
+    session.add_all(bikes)
     session.commit()
-    session.refresh(bike)
 
     # Create a user
     user = UserService.create_user(
@@ -70,7 +72,7 @@ def create_dummy_data(session, count):
 
     # Generate loans
     loans = []
-    for _ in range(count):
+    for bike in bikes:
         loan = LoanService.create_loan(
             session,
             user_id=user.id,
@@ -86,6 +88,7 @@ def test_initial_pagination(db_session, app):
     create_dummy_data(db_session, 12)
 
     view = LoanHistoryView(app)
+    view.build()
     assert view.current_page == 1
     assert view.max_pages == 3
 
@@ -111,6 +114,7 @@ def test_navigation(db_session, app):
     create_dummy_data(db_session, 7)
 
     view = LoanHistoryView(app)
+    view.build()
 
     # Initial state
     content = view.results_container.content
@@ -145,6 +149,7 @@ def test_search_no_matches(db_session, app):
     create_dummy_data(db_session, 3)
 
     view = LoanHistoryView(app)
+    view.build()
     # Search for a non-existent cedula substring
     view.cedula_input.value = "XYZ"
     view.search_history(None)
@@ -165,6 +170,7 @@ def test_range_header(db_session, app):
     create_dummy_data(db_session, 6)
 
     view = LoanHistoryView(app)
+    view.build()
     content = view.results_container.content
     slice_list, _ = content.controls
 
@@ -172,4 +178,18 @@ def test_range_header(db_session, app):
     text_total = slice_list.controls[0]
     text_range = slice_list.controls[1]
     assert text_total.value == "Total de préstamos: 6"
-    assert text_range.value == "Mostrando 1 - 5" 
\ No newline at end of file
+    assert text_range.value == "Mostrando 1 - 5" 
+
+def test_constructing_the_view_does_not_query(db_session, app):
+    create_dummy_data(db_session, 3)
+    statements = []
+    engine = db_session.get_bind()
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        view = LoanHistoryView(app)
+        assert statements == []
+        view.build()
+        assert statements
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
@@ -0,0 +1,175 @@
+import types
+from datetime import datetime, timedelta, timezone
+
+import flet as ft
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import main
+import view_cache
+from models import (
+    Base,
+    Bicycle,
+    BikeStatusEnum,
+    Sanction,
+    SanctionStatusEnum,
+    Station,
+    UserAffiliationEnum,
+    UserRoleEnum,
+)
+from services import FavoriteBikeService, LoanService, UserService
+from view_cache import ViewCache
+
+
+class DummyPage:
+    dialog = None
+    overlay: list = []
+
+    def update(self):
+        pass
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def db(engine):
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield session
+    session.close()
+
+
+@pytest.fixture()
+def invalidated(monkeypatch):
+    topics = []
+    monkeypatch.setattr(view_cache, "invalidate", lambda t: topics.append(set(t)))
+    return topics
+
+
+def _seed(db):
+    station = Station(code="EST001", name="Calle 26")
+    db.add(station)
+    db.flush()
+    bikes = [
+        Bicycle(
+            serial_number=f"SN{i}",
+            bike_code=f"BK{i}",
+            status=BikeStatusEnum.disponible,
+            current_station_id=station.id,
+        )
+        for i in range(2)
+    ]
+    db.add_all(bikes)
+    db.commit()
+    user = UserService.create_user(
+        db,
+        cedula="123",
+        carnet="C123",
+        full_name="Ana",
+        email="ana@example.com",
+        affiliation=UserAffiliationEnum.estudiante,
+        role=UserRoleEnum.usuario,
+    )
+    return station, bikes, user
+
+
+def test_topics_follow_committed_writes(db, invalidated):
+    station, bikes, user = _seed(db)
+    invalidated.clear()
+
+    loan = LoanService.create_loan(db, user.id, bikes[0].id, station.id)
+    assert invalidated == [{"loans", "bikes"}]
+
+    LoanService.return_loan(db, loan.id, station.id)
+    assert FavoriteBikeService.set_favorite_bike(db, user.id, bikes[0].id)
+    assert invalidated[-1] == {"favorites"}
+
+
+def test_invalidate_only_drops_dependent_entries():
+    cache = ViewCache()
+    cache.put(1, ft.Text("disponibilidad"), {"bikes", "loans"})
+    cache.put(2, ft.Text("favorita"), {"favorites"})
+    cache.put(3, ft.Text("formulario"), ())
+
+    assert 3 not in cache
+    view_cache.invalidate({"favorites"})
+    assert 1 in cache and 2 not in cache
+
+
+def _navigate(app, index):
+    app.nav_change(types.SimpleNamespace(control=types.SimpleNamespace(selected_index=index)))
+    return app.content_area.content
+
+
+def test_tab_switch_reuses_views_until_a_relevant_commit(engine, db, count_statements):
+    station, bikes, user = _seed(db)
+    app = main.VeciRunApp()
+    app.db = db
+    app.page = DummyPage()
+    app.nav_rail = ft.NavigationRail()
+    app.content_area = ft.Container()
+    app.current_user = user
+    app.current_user_role = "regular"
+    app.update_navigation_for_role("regular")
+
+    availability = _navigate(app, 1)
+    current_loan = _navigate(app, 2)
+
+    with count_statements(engine) as statements:
+        assert _navigate(app, 1) is availability
+        # La vista reutilizada sigue recibiendo los eventos en vivo
+        assert type(app.mounted_view).__name__ == "AvailabilityView"
+        assert _navigate(app, 2) is current_loan
+    assert statements == []
+
+    # Un préstamo invalida ambas vistas
+    LoanService.create_loan(db, user.id, bikes[1].id, station.id)
+    assert _navigate(app, 1) is not availability
+    assert _navigate(app, 2) is not current_loan
+
+    # Cambiar de usuario descarta la caché
+    cached = _navigate(app, 1)
+    app.clear_user_state()
+    app.current_user = user
+    app.update_navigation_for_role("regular")
+    assert _navigate(app, 1) is not cached
+
+
+def test_cached_dashboard_expires_when_the_sanction_ends(db):
+    _, _, user = _seed(db)
+    start = datetime.now(timezone.utc)
+    end_at = start + timedelta(hours=1)
+    db.add(
+        Sanction(
+            user_id=user.id,
+            start_at=start - timedelta(days=1),
+            end_at=end_at,
+            status=SanctionStatusEnum.activa,
+        )
+    )
+    db.commit()
+    clock = [start]
+    app = main.VeciRunApp()
+    app.db = db
+    app.page = DummyPage()
+    app.nav_rail = ft.NavigationRail()
+    app.content_area = ft.Container()
+    app.current_user = user
+    app.current_user_role = "regular"
+    app.update_navigation_for_role("regular")
+    app.view_cache = ViewCache(clock=lambda: clock[0])
+
+    dashboard = _navigate(app, 0)
+    assert app.mounted_view._sanction_banner.visible
+    assert _navigate(app, 0) is dashboard
+
+    # La sanción vence sola (sin eventos): el panel se vuelve a construir
+    clock[0] = end_at + timedelta(seconds=1)
+    assert 0 not in app.view_cache
+    assert _navigate(app, 0) is not dashboard
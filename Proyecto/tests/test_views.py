@@ -115,6 +115,11 @@ def mock_app():
             """Mock method for clearing user state"""
             pass
 
+        def mount(self, view, content=None):
+            """Mock of VeciRunApp.mount"""
+            self.content_area.content = view.build() if content is None else content
+            return self.content_area.content
+
     return MockApp()
 
 
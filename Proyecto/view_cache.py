@@ -0,0 +1,110 @@
+"""Caché de vistas construidas, invalidada por eventos de dominio.
+
+``VeciRunApp.nav_change`` reutiliza el árbol de controles de una vista
+mientras no cambien los datos de los que depende. Cada vista declara esos
+datos como *temas* (``View.cache_topics``: ``"loans"``, ``"sanctions"``,
+``"favorites"``...) y cada evento de ``events.py`` trae los temas que
+afecta (``DomainEvent.topics``); como los eventos se publican después del
+commit, una escritura revertida no invalida nada.
+
+Las cachés se registran a nivel de proceso, así que un préstamo registrado
+desde la página de un operador invalida también las vistas abiertas en las
+demás páginas.
+
+Lo que cambia con el paso del tiempo no emite eventos (una sanción que vence
+sola); para eso una entrada puede tener fecha de vencimiento
+(``View.cache_expires_at``).
+"""
+
+from __future__ import annotations
+
+import weakref
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Callable, Iterable
+
+import flet as ft
+
+from events import DomainEvent, subscribe
+
+_caches: "weakref.WeakSet[ViewCache]" = weakref.WeakSet()
+_caches_lock = Lock()
+
+
+class ViewCache:
+    """Controles ya construidos por índice del *rail*, con sus temas y su vista."""
+
+    def __init__(self, clock: Callable[[], datetime] | None = None) -> None:
+        self._entries: dict[int, tuple[ft.Control, frozenset[str], object, datetime | None]] = {}
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
+        self._lock = Lock()
+        with _caches_lock:
+            _caches.add(self)
+
+    def _entry(self, key: int):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[3] is not None and self._clock() >= entry[3]:
+                del self._entries[key]
+                return None
+        return entry
+
+    def get(self, key: int) -> ft.Control | None:
+        entry = self._entry(key)
+        return entry[0] if entry else None
+
+    def get_view(self, key: int):
+        """Vista que construyó el control de *key* (si se guardó con ``put``)."""
+        entry = self._entry(key)
+        return entry[2] if entry else None
+
+    def put(
+        self,
+        key: int,
+        control: ft.Control,
+        topics: Iterable[str],
+        view=None,
+        expires_at: datetime | None = None,
+    ) -> None:
+        """Guarda *control* (y la *view* que lo construyó); sin *topics* no se cachea.
+
+        Con *expires_at* (UTC) la entrada se descarta en ese momento aunque no
+        llegue ningún evento.
+        """
+        topics = frozenset(topics)
+        if not topics:
+            return
+        with self._lock:
+            self._entries[key] = (control, topics, view, expires_at)
+
+    def invalidate(self, topics: Iterable[str]) -> None:
+        """Descarta las entradas que dependen de alguno de *topics*."""
+        topics = set(topics)
+        with self._lock:
+            for key in [k for k, entry in self._entries.items() if entry[1] & topics]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key: int) -> bool:
+        return self._entry(key) is not None
+
+
+def invalidate(topics: Iterable[str]) -> None:
+    """Invalida *topics* en todas las cachés del proceso."""
+    topics = set(topics)
+    if not topics:
+        return
+    with _caches_lock:
+        caches = list(_caches)
+    for cache in caches:
+        cache.invalidate(topics)
+
+
+def _on_domain_event(domain_event: DomainEvent) -> None:
+    invalidate(domain_event.topics)
+
+
+subscribe(DomainEvent, _on_domain_event)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import base64
+import os
+from pathlib import Path
+from threading import Lock
+
+import flet as ft
+
+# ---------------------------------------------------------------------------
+# Caché de imágenes estáticas
+# ---------------------------------------------------------------------------
+# Las imágenes se codifican en base64 una sola vez por proceso; la entrada se
+# invalida sólo si cambia el *mtime* del archivo. Así reconstruir una vista
+# (p.ej. "Actualizar" en disponibilidad) no vuelve a leer ni codificar el PNG.
+
+_VIEWS_DIR = Path(__file__).resolve().parent
+_PROJECT_DIR = _VIEWS_DIR.parent
+
+ASSETS: dict[str, Path] = {
+    "campus_mapa.png": _VIEWS_DIR / "campus_mapa.png",
+    "vecirunlogo.png": _PROJECT_DIR / "vecirunlogo.png",
+    "vecirunbanner.png": _PROJECT_DIR / "vecirunbanner.png",
+}
+
+_cache: dict[Path, tuple[float, str]] = {}
+_lock = Lock()
+
+
+def _resolve(name: str) -> Path:
+    path = ASSETS.get(name)
+    if path is None:
+        raise KeyError(f"Recurso estático desconocido: {name}")
+    return path
+
+
+def get_base64(name: str) -> str:
+    """Devuelve el contenido de *name* codificado en base64 (cacheado por mtime)."""
+    path = _resolve(name)
+    mtime = os.path.getmtime(path)
+    with _lock:
+        entry = _cache.get(path)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+
+    with open(path, "rb") as f:
+        encoded = base64.b64encode(f.read()).decode()
+
+    with _lock:
+        _cache[path] = (mtime, encoded)
+    return encoded
+
+
+def image(name: str, **kwargs) -> ft.Image:
+    """Crea un ``ft.Image`` a partir del recurso cacheado *name*.
+
+    Cada llamada devuelve un control nuevo (un control Flet sólo puede estar
+    montado en un lugar), pero todos comparten la misma cadena codificada.
+    """
+    return ft.Image(src_base64=get_base64(name), **kwargs)
+
+
+def clear_cache() -> None:
+    """Vacía la caché (útil en pruebas)."""
+    with _lock:
+        _cache.clear()
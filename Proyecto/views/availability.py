@@ -1,9 +1,10 @@
 import flet as ft
-import os
-import base64
 from threading import Timer
 
-from services import StationService, BicycleService
+from events import LoanClosed, LoanOpened
+from models import BikeStatusEnum
+from services import StationService
+from . import assets
 from .base import View
 
 
@@ -11,20 +12,131 @@ class AvailabilityView(View):
     """Vista para consultar la disponibilidad de bicicletas por estación,
     con UI mejorada y animación de overlay sin viaje entre pines."""
 
+    cache_topics = frozenset({"bikes", "loans", "stations"})
+
     MAP_WIDTH = 659
     OVERLAY_WIDTH = 300
 
-    def __init__(self, app: "VeciRunApp") -> None:  # noqa: F821
+    def __init__(
+        self,
+        app: "VeciRunApp",  # noqa: F821
+        auto_refresh_interval: float | None = None,
+    ) -> None:
         self.app = app
+        self.auto_refresh_interval = auto_refresh_interval
+
+        # Estado para refrescos incrementales
+        self._counts: dict = {}
+        self._count_texts: dict = {}  # station_id -> [ft.Text]
+        self._pins: dict = {}  # station_id -> ft.IconButton
+        self._root: ft.Control | None = None
+        self._timer: Timer | None = None
+
+    # ------------------------------------------------------------------
+    # Conteos
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _count_label(count: int) -> str:
+        return f"{count} bicicletas disponibles"
+
+    def _available_count(self, station_id) -> int:
+        return self._counts.get(station_id, 0)
+
+    def _load_counts(self) -> dict:
+        # Si la app mantiene la ocupación en memoria, no se consulta la BD
+        occupancy = getattr(self.app, "occupancy", None)
+        if occupancy is not None:
+            return occupancy.available_counts()
+
+        with self.session() as db:
+            availability = StationService.get_availability_counts(db)
+        return {
+            station_id: by_status.get(BikeStatusEnum.disponible, 0)
+            for station_id, by_status in availability.items()
+        }
+
+    def _count_text(self, station_id) -> ft.Text:
+        """Crea un texto de conteo y lo registra para futuros refrescos."""
+        text = ft.Text(
+            self._count_label(self._available_count(station_id)),
+            size=14,
+            weight=ft.FontWeight.BOLD,
+            color=ft.colors.GREEN,
+        )
+        self._count_texts.setdefault(station_id, []).append(text)
+        return text
+
+    def refresh_counts(self, update_page: bool = True) -> bool:
+        """Vuelve a consultar los conteos y actualiza sólo los que cambiaron.
+
+        No reconstruye el mapa, los pines ni el overlay: modifica los ``ft.Text``
+        y *tooltips* existentes, de modo que Flet sólo envía esas diferencias.
+        Devuelve ``True`` si algún conteo cambió; con ``update_page=False`` la
+        página no se actualiza (lo hace quien llama).
+        """
+        new_counts = self._load_counts()
+        changed = {
+            station_id
+            for station_id in set(self._counts) | set(new_counts)
+            if self._counts.get(station_id, 0) != new_counts.get(station_id, 0)
+        }
+        self._counts = new_counts
+
+        for station_id in changed:
+            label = self._count_label(self._available_count(station_id))
+            for text in self._count_texts.get(station_id, []):
+                text.value = label
+            pin = self._pins.get(station_id)
+            if pin is not None:
+                pin.tooltip = label
+
+        if changed and update_page:
+            self.app.page.update()
+        return bool(changed)
+
+    def on_live_event(self, domain_event) -> bool:
+        # Préstamo o devolución en otra página: sólo cambian los conteos
+        if isinstance(domain_event, (LoanOpened, LoanClosed)):
+            return self.refresh_counts(update_page=False)
+        return False
+
+    # ------------------------------------------------------------------
+    # Auto-refresco periódico
+    # ------------------------------------------------------------------
+    def start_auto_refresh(self, interval: float | None = None) -> None:
+        """Refresca los conteos cada *interval* segundos mientras la vista esté visible."""
+        if interval is not None:
+            self.auto_refresh_interval = interval
+        self.stop_auto_refresh()
+        if self.auto_refresh_interval:
+            self._timer = Timer(self.auto_refresh_interval, self._auto_refresh_tick)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def stop_auto_refresh(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _auto_refresh_tick(self) -> None:
+        self._timer = None
+        # La vista ya no está montada: se detiene el ciclo
+        if self._root is None or self.app.content_area.content is not self._root:
+            return
+        self.refresh_counts()
+        self.start_auto_refresh()
 
     def build(self) -> ft.Control:
         page = self.app.page
-        db = self.app.db
 
-        # Cargar mapa
-        map_file = os.path.join(os.path.dirname(__file__), "campus_mapa.png")
-        with open(map_file, "rb") as f:
-            map_b64 = base64.b64encode(f.read()).decode()
+        # Obtener datos (una sola consulta agregada para los conteos)
+        with self.session() as db:
+            stations = StationService.get_all_stations(db)
+        self._counts = self._load_counts()
+        self._count_texts = {}
+        self._pins = {}
+
+        stations_by_code = {s.code: s for s in stations}
 
         # Overlay floater con estilo identico a availability_cards
         info_overlay = ft.Card(
@@ -43,13 +155,23 @@ class AvailabilityView(View):
             animate_scale=300,
         )
 
+        # El overlay reutiliza un único texto registrado a la vez
+        overlay_count: dict = {}
+
+        def _overlay_count_text(station_id) -> ft.Text:
+            previous = overlay_count.pop("text", None)
+            if previous is not None:
+                self._count_texts[overlay_count.pop("station_id")].remove(previous)
+            overlay_count["station_id"] = station_id
+            overlay_count["text"] = self._count_text(station_id)
+            return overlay_count["text"]
+
         # Función interna para mostrar contenido tras animar oculta
         def _do_show(code, left, top):
             info_overlay.disabled = False
             info_overlay.visible = True
-            station = next((s for s in stations if s.code == code), None)
+            station = stations_by_code.get(code)
             if station:
-                bike_count = sum(1 for b in available_bikes if b.current_station_id == station.id)
                 info_overlay.content.content = ft.Column([
                     ft.ListTile(
                         leading=ft.Icon(ft.icons.LOCATION_ON, color=ft.colors.BLUE),
@@ -59,12 +181,7 @@ class AvailabilityView(View):
                     ft.Container(
                         content=ft.Row([
                             ft.Icon(ft.icons.DIRECTIONS_BIKE, color=ft.colors.GREEN),
-                            ft.Text(
-                                f"{bike_count} bicicletas disponibles",
-                                size=14,
-                                weight=ft.FontWeight.BOLD,
-                                color=ft.colors.GREEN,
-                            ),
+                            _overlay_count_text(station.id),
                         ], alignment=ft.MainAxisAlignment.CENTER),
                         padding=10,
                     ),
@@ -112,7 +229,9 @@ class AvailabilityView(View):
 
         # Creador de pines
         def make_pin(code: str, left: int, top: int) -> ft.IconButton:
-            return ft.IconButton(
+            station = stations_by_code.get(code)
+            pin = ft.IconButton(
+                tooltip=self._count_label(self._available_count(station.id)) if station else None,
                 icon=ft.icons.LOCATION_ON,
                 icon_color=ft.colors.BLUE,
                 style=ft.ButtonStyle(bgcolor=ft.colors.TRANSPARENT),
@@ -121,6 +240,9 @@ class AvailabilityView(View):
                 top=top,
                 on_click=_show_overlay,
             )
+            if station:
+                self._pins[station.id] = pin
+            return pin
 
         # Pines
         pins = [
@@ -131,13 +253,9 @@ class AvailabilityView(View):
             make_pin("EST005", 315, 320),
         ]
 
-        # Obtener datos
-        stations = StationService.get_all_stations(db)
-        available_bikes = BicycleService.get_available_bicycles(db)
-
         # Montar mapa y overlay
         map_stack = ft.Stack(
-            controls=[ft.Image(src_base64=map_b64, width=self.MAP_WIDTH)] + pins + [info_overlay],
+            controls=[assets.image("campus_mapa.png", width=self.MAP_WIDTH)] + pins + [info_overlay],
             width=self.MAP_WIDTH,
             height=669,
         )
@@ -145,7 +263,6 @@ class AvailabilityView(View):
         # Tarjetas de disponibilidad (mismo estilo)
         availability_cards = []
         for station in stations:
-            bike_count = sum(1 for b in available_bikes if b.current_station_id == station.id)
             availability_cards.append(
                 ft.Card(
                     content=ft.Container(
@@ -158,12 +275,7 @@ class AvailabilityView(View):
                             ft.Container(
                                 content=ft.Row([
                                     ft.Icon(ft.icons.DIRECTIONS_BIKE, color=ft.colors.GREEN),
-                                    ft.Text(
-                                        f"{bike_count} bicicletas disponibles",
-                                        size=14,
-                                        weight=ft.FontWeight.BOLD,
-                                        color=ft.colors.GREEN,
-                                    ),
+                                    self._count_text(station.id),
                                 ], alignment=ft.MainAxisAlignment.CENTER),
                                 padding=10,
                             ),
@@ -188,10 +300,9 @@ class AvailabilityView(View):
             color=ft.colors.GREY_600,
         )
 
-        # Botón refrescar
+        # Botón refrescar: sólo re-consulta y parchea los conteos
         def _refresh(_: ft.ControlEvent) -> None:
-            self.app.content_area.content = AvailabilityView(self.app).build()
-            page.update()
+            self.refresh_counts()
 
         refresh_btn = ft.ElevatedButton(
             "Actualizar",
@@ -209,4 +320,7 @@ class AvailabilityView(View):
         ], horizontal_alignment=ft.CrossAxisAlignment.CENTER,
            scroll=ft.ScrollMode.AUTO)
 
-        return ft.Stack(controls=[content_column], expand=True)
+        self._root = ft.Stack(controls=[content_column], expand=True)
+        if self.auto_refresh_interval:
+            self.start_auto_refresh()
+        return self._root
@@ -1,5 +1,13 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator
+
 import flet as ft
+from sqlalchemy.orm import Session
+
+from database import session_scope
+from instrumentation import traced_function
 
 
 class View(ABC):
@@ -10,7 +18,41 @@ class View(ABC):
     aplicativo (VeciRunApp.content_area).
     """
 
+    # Temas de datos de los que depende la vista (ver view_cache.py). Si no
+    # está vacío, ``nav_change`` reutiliza lo construido hasta que un evento
+    # de dominio (events.py) toque alguno de ellos; las vistas con
+    # formularios no se cachean.
+    cache_topics: frozenset[str] = frozenset()
+    # Momento (UTC) en que lo construido deja de ser válido aunque no llegue
+    # ningún evento, p.ej. el fin de una sanción; lo fija ``build``.
+    cache_expires_at: datetime | None = None
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # Atribuye las consultas de cada ``build`` a la vista (instrumentation.py)
+        build = cls.__dict__.get("build")
+        if build is not None and not getattr(build, "__instrumented__", False):
+            cls.build = traced_function(build, f"{cls.__name__}.build")
+
     @abstractmethod
     def build(self) -> ft.Control:  # noqa: D401
         """Construye y devuelve el contenido Flet para la vista."""
         raise NotImplementedError
+
+    def on_live_event(self, domain_event) -> bool:
+        """Aplica un evento difundido por otra página (ver live_updates.py).
+
+        Se llama mientras la vista está montada; las vistas parchean sólo los
+        controles afectados y devuelven ``True`` si cambiaron algo.
+        """
+        return False
+
+    @contextmanager
+    def session(self) -> Iterator[Session]:
+        """Sesión de BD para una acción de la vista (ver ``session_scope``).
+
+        Usa ``app.db`` si la aplicación tiene una sesión fijada (pruebas).
+        """
+        app = getattr(self, "app", None)
+        with session_scope(getattr(app, "db", None)) as db:
+            yield db
@@ -151,39 +151,39 @@ class CreateUserView(View):
     def _create_user(self, e: ft.ControlEvent) -> None:  # noqa: D401
         """Callback para el botón *Crear Usuario*."""
         page = self.app.page
-        db = self.app.db
 
         try:
-            # Validación mínima
-            if not all(
-                [
-                    self.cedula_field.value,
-                    self.name_field.value,
-                    self.email_field.value,
-                    self.affiliation_dropdown.value,
-                ]
-            ):
-                self._set_result("Todos los campos son obligatorios", ft.colors.RED)
-                return
-
-            # Verificar duplicidad
-            if UserService.get_user_by_cedula(db, self.cedula_field.value):
-                self._set_result("Ya existe un usuario con esta cédula", ft.colors.RED)
-                return
-
-            # Crear usuario
-            user = UserService.create_user(
-                db,
-                cedula=self.cedula_field.value,
-                carnet="",  # carnet se genera automáticamente
-                full_name=self.name_field.value,
-                email=self.email_field.value,
-                affiliation=UserAffiliationEnum(self.affiliation_dropdown.value),
-                role=UserRoleEnum("usuario"), # Hard-code role to 'usuario'
-            )
-
-            self._set_result(f"Usuario creado exitosamente: {user.full_name}", ft.colors.GREEN)
-            self._clear_fields()
+            with self.session() as db:
+                # Validación mínima
+                if not all(
+                    [
+                        self.cedula_field.value,
+                        self.name_field.value,
+                        self.email_field.value,
+                        self.affiliation_dropdown.value,
+                    ]
+                ):
+                    self._set_result("Todos los campos son obligatorios", ft.colors.RED)
+                    return
+
+                # Verificar duplicidad
+                if UserService.get_user_by_cedula(db, self.cedula_field.value):
+                    self._set_result("Ya existe un usuario con esta cédula", ft.colors.RED)
+                    return
+
+                # Crear usuario
+                user = UserService.create_user(
+                    db,
+                    cedula=self.cedula_field.value,
+                    carnet="",  # carnet se genera automáticamente
+                    full_name=self.name_field.value,
+                    email=self.email_field.value,
+                    affiliation=UserAffiliationEnum(self.affiliation_dropdown.value),
+                    role=UserRoleEnum("usuario"), # Hard-code role to 'usuario'
+                )
+
+                self._set_result(f"Usuario creado exitosamente: {user.full_name}", ft.colors.GREEN)
+                self._clear_fields()
         except Exception as ex:  # noqa: BLE001
             self._set_result(f"Error: {str(ex)}", ft.colors.RED)
 
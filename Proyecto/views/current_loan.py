@@ -13,7 +13,7 @@ except ModuleNotFoundError:  # CI or environments without flet-material
 
     fm = _FMStub()  # type: ignore
 
-from services import LoanService, IncidentService
+from services import LoanService, IncidentService, SanctionService
 from models import LoanStatusEnum
 from .base import View
 
@@ -21,6 +21,8 @@ from .base import View
 class CurrentLoanView(View):
     """View that lets a *regular* user check their active loan."""
 
+    cache_topics = frozenset({"loans", "incidents", "sanctions"})
+
     def __init__(self, app: "VeciRunApp") -> None:  # noqa: F821
         self.app = app
 
@@ -30,11 +32,8 @@ class CurrentLoanView(View):
     def _show_incidents_dialog(self, loan):
         """Muestra un diálogo con los incidentes y posibles sanciones del préstamo"""
 
-        db = self.app.db
-
-        from models import Sanction  # Importar local para evitar ciclos
-
-        incidents = IncidentService.get_incidents_by_loan(db, loan.id)
+        # Los incidentes y sus sanciones vienen precargados desde build()
+        incidents = loan.incidents
 
         if not incidents:
             # Fallback: debería no ocurrir porque sólo se llama si hay incidentes,
@@ -58,9 +57,7 @@ class CurrentLoanView(View):
             severity_enum = IncidentService.SEVERITY_INT_TO_ENUM.get(incident.severity)
             severity_str = severity_enum.value.title() if severity_enum else str(incident.severity)
 
-            sanction = (
-                db.query(Sanction).filter(Sanction.incident_id == incident.id).first()
-            )
+            sanction = incident.sanctions[0] if incident.sanctions else None
 
             sanction_details: list[ft.Control]
             if sanction:
@@ -198,9 +195,11 @@ class CurrentLoanView(View):
         def _submit(_):  # noqa: D401
             text = appeal_field.value.strip()
             if text:
+                with self.session() as db:
+                    SanctionService.appeal_sanction(db, sanction.id, text)
+                # Mantener coherente la copia mostrada en pantalla
                 sanction.appeal_text = text
                 sanction.status = SanctionStatusEnum.apelada
-                self.app.db.commit()
                 self._close_dialog()
                 # Notificar al usuario
                 self.app.page.snack_bar = ft.SnackBar(
@@ -228,8 +227,6 @@ class CurrentLoanView(View):
     # Public API
     # ------------------------------------------------------------------
     def build(self) -> ft.Control:  # noqa: D401
-        db = self.app.db
-
         # ------------------------------------------------------------------
         # Mostrar TODOS los préstamos (historial completo) del usuario
         # ------------------------------------------------------------------
@@ -239,8 +236,10 @@ class CurrentLoanView(View):
         if user is None:
             return ft.Text("Error: ningún usuario autenticado.", color=ft.colors.RED, size=16)
 
-        # Obtener el historial completo de préstamos (abiertos y cerrados)
-        loans = LoanService.get_loans_by_user(db, user.id)
+        # Obtener el historial completo de préstamos (abiertos y cerrados) con
+        # incidentes y sanciones precargados en un número fijo de consultas
+        with self.session() as db:
+            loans = LoanService.get_loan_history_with_incidents(db, user.id)
 
         # ------------------------------------------------------------------
         # Sin préstamos registrados
@@ -294,36 +293,10 @@ class CurrentLoanView(View):
             # Comprobar incidentes y estado de sus sanciones
             # --------------------------------------------------
 
-            incidents = IncidentService.get_incidents_by_loan(db, loan.id)
-
-            from models import Sanction, SanctionStatusEnum  # import local para evitar ciclos
-
-            has_incident = bool(incidents)
-            # Determinar si todas las sanciones están expiradas
-            all_sanctions_expired = True
-            any_appeal_rejected = False
-
-            for incident in incidents:
-                sanction = (
-                    db.query(Sanction)
-                    .filter(Sanction.incident_id == incident.id)
-                    .first()
-                )
-
-                if sanction is None:
-                    all_sanctions_expired = False
-                    continue
-
-                # Verificar expiración
-                if sanction.status != SanctionStatusEnum.expirada:
-                    all_sanctions_expired = False
-
-                # Identificar apelaciones rechazadas
-                if (
-                    sanction.appeal_text
-                    and sanction.status == SanctionStatusEnum.activa
-                ):
-                    any_appeal_rejected = True
+            summary = IncidentService.summarize_loan_incidents(loan)
+            has_incident = summary["has_incident"]
+            all_sanctions_expired = summary["all_sanctions_expired"]
+            any_appeal_rejected = summary["any_appeal_rejected"]
 
             # Duración
             if loan.status == LoanStatusEnum.abierto and loan.time_out:
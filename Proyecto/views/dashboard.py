@@ -5,16 +5,44 @@ from views.current_loan import CurrentLoanView
 
 from .base import View
 from views.home import HomeView
-from services import FavoriteBikeService
-from datetime import datetime, timezone
+from services import FavoriteBikeService, SanctionService
+from events import SanctionAppealed, SanctionCreated, SanctionResolved
 from models import Sanction, SanctionStatusEnum
 
 
 class DashboardView(View):
     """Vista principal posterior al inicio de sesión (panel)."""
 
+    cache_topics = frozenset({"loans", "bikes", "incidents", "sanctions", "favorites"})
+
     def __init__(self, app: "VeciRunApp") -> None:  # noqa: F821
         self.app = app
+        self._sanction_banner: ft.Card | None = None
+        self._sanction_title: ft.Text | None = None
+
+    @staticmethod
+    def _sanction_label(blocked_until) -> str:
+        end_str = blocked_until.strftime("%d/%m/%Y %H:%M") if blocked_until else "N/A"
+        return f"¡Tienes una sanción activa hasta {end_str}!"
+
+    def _blocked_until(self, user_id):
+        # Desde la caché de sanciones: normalmente sin consultar la BD
+        with self.session() as db:
+            return SanctionService.blocked_until(db, user_id)
+
+    def on_live_event(self, domain_event) -> bool:
+        # Una sanción del usuario cambió en otra página: sólo se ajusta el aviso
+        if self._sanction_banner is None or not isinstance(
+            domain_event, (SanctionCreated, SanctionAppealed, SanctionResolved)
+        ):
+            return False
+        current_user = getattr(self.app, "current_user", None)
+        if current_user is None or domain_event.user_id != current_user.id:
+            return False
+        blocked_until = self._blocked_until(current_user.id)
+        self._sanction_title.value = self._sanction_label(blocked_until) if blocked_until else ""
+        self._sanction_banner.visible = blocked_until is not None
+        return True
 
     def build(self) -> ft.Control:  # noqa: D401
         page = self.app.page
@@ -62,21 +90,21 @@ class DashboardView(View):
             appeal_banner = None
             current_user_obj = getattr(self.app, "current_user", None)
             if current_user_obj is not None:
-                db = self.app.db
-                # Evitar valores de caché en la sesión para estados de sanción
-                db.expire_all()
                 from models import Incident
 
-                appealed_count = (
-                    db.query(Sanction)
-                    .join(Incident, Sanction.incident_id == Incident.id)
-                    .filter(
-                        Incident.reporter_id == current_user_obj.id,
-                        Sanction.status == SanctionStatusEnum.apelada,
-                        Sanction.appeal_response == None,  # noqa: E711
+                # Sesión nueva por construcción: los estados de sanción siempre
+                # se leen frescos de la BD
+                with self.session() as db:
+                    appealed_count = (
+                        db.query(Sanction)
+                        .join(Incident, Sanction.incident_id == Incident.id)
+                        .filter(
+                            Incident.reporter_id == current_user_obj.id,
+                            Sanction.status == SanctionStatusEnum.apelada,
+                            Sanction.appeal_response == None,  # noqa: E711
+                        )
+                        .count()
                     )
-                    .count()
-                )
 
                 if appealed_count > 0:
                     appeal_banner = ft.Card(
@@ -118,6 +146,16 @@ class DashboardView(View):
                 "EST005": "Edificio Ciencia y Tecnología",
             }.get(station, "No asignada")
 
+            # Ocupación de la estación desde el modelo en memoria
+            station_subtitle = f"Estación: {station_name}"
+            occupancy = getattr(self.app, "occupancy", None)
+            station_id = occupancy.station_id(station) if occupancy else None
+            if station_id is not None:
+                station_subtitle += (
+                    f" · {occupancy.available(station_id)} disponibles"
+                    f" · {occupancy.borrowed(station_id)} prestadas"
+                )
+
             admin_controls: list[ft.Control] = [ft.Container(height=30)]
 
             if appeal_banner:
@@ -136,7 +174,7 @@ class DashboardView(View):
                                         size=18,
                                         weight=ft.FontWeight.BOLD,
                                     ),
-                                    subtitle=ft.Text(f"Estación: {station_name}", size=14),
+                                    subtitle=ft.Text(station_subtitle, size=14),
                                 ),
                                 ft.Container(height=20),
                                 ft.Text(
@@ -265,76 +303,70 @@ class DashboardView(View):
             favorite_bike_info = None
             current_user = getattr(self.app, "current_user", None)
             if current_user:
-                db = self.app.db
-                favorite_bike = FavoriteBikeService.get_user_favorite_bike_by_cedula(db, current_user.cedula)
-                if favorite_bike:
-                    station_info = f"Estación: {favorite_bike.current_station.code} - {favorite_bike.current_station.name}" if favorite_bike.current_station else "Estación: No disponible"
-                    favorite_bike_info = {
-                        "code": favorite_bike.bike_code,
-                        "station": station_info,
-                        "status": favorite_bike.status.value.title()
-                    }
+                with self.session() as db:
+                    favorite_bike = FavoriteBikeService.get_user_favorite_bike_by_cedula(db, current_user.cedula)
+                    if favorite_bike:
+                        station_info = f"Estación: {favorite_bike.current_station.code} - {favorite_bike.current_station.name}" if favorite_bike.current_station else "Estación: No disponible"
+                        favorite_bike_info = {
+                            "code": favorite_bike.bike_code,
+                            "station": station_info,
+                            "status": favorite_bike.status.value.title()
+                        }
 
             # Verificar sanciones activas
+            # El aviso se construye siempre (oculto si no hay sanción) para
+            # poder mostrarlo u ocultarlo con los eventos en vivo
             sanction_banner = None
             if current_user:
-                db = self.app.db
-                now_utc = datetime.now(timezone.utc)
-                active_sanction = (
-                    db.query(Sanction)
-                    .filter(
-                        Sanction.user_id == current_user.id,
-                        Sanction.status == SanctionStatusEnum.activa,
-                        Sanction.start_at <= now_utc,
-                        Sanction.end_at >= now_utc,
-                    )
-                    .first()
+                blocked_until = self._blocked_until(current_user.id)
+                # La sanción vence sin emitir eventos: el panel cacheado también
+                self.cache_expires_at = blocked_until
+                self._sanction_title = ft.Text(
+                    self._sanction_label(blocked_until) if blocked_until else "",
+                    weight=ft.FontWeight.BOLD,
+                    color=ft.colors.RED_600,
                 )
 
-                if active_sanction:
-                    end_str = active_sanction.end_at.strftime("%d/%m/%Y %H:%M") if active_sanction.end_at else "N/A"
+                def _go_to_sanction(_):
+                    # Navegar a la vista "Mi Préstamo" (índice 2 en regulares)
+                    try:
+                        self.app.nav_rail.selected_index = 2
+                        self.app.mount(CurrentLoanView(self.app))
+                        self.app.page.update()
+                    except Exception:
+                        pass
 
-                    def _go_to_sanction(_):
-                        # Navegar a la vista "Mi Préstamo" (índice 2 en regulares)
-                        try:
-                            self.app.nav_rail.selected_index = 2
-                            self.app.content_area.content = CurrentLoanView(self.app).build()
-                            self.app.page.update()
-                        except Exception:
-                            pass
-
-                    sanction_banner = ft.Card(
-                        content=ft.Container(
-                            content=ft.Row(
-                                [
-                                    ft.Icon(ft.icons.GAVEL, color=ft.colors.RED, size=32),
-                                    ft.Container(width=10),
-                                    ft.Column(
-                                        [
-                                            ft.Text(
-                                                f"¡Tienes una sanción activa hasta {end_str}!",
-                                                weight=ft.FontWeight.BOLD,
-                                                color=ft.colors.RED_600,
-                                            ),
-                                            ft.Text(
-                                                "Puedes ver los detalles en la sección 'Mi Préstamo'.",
-                                                size=12,
-                                                color=ft.colors.GREY_700,
-                                            ),
-                                        ],
-                                        spacing=2,
-                                    ),
-                                    ft.Container(expand=True),
-                                    
-                                ],
-                                alignment=ft.MainAxisAlignment.START,
-                            ),
-                            padding=ft.padding.all(12),
-                            bgcolor=ft.colors.RED_50,
-                            border_radius=6,
+                sanction_banner = ft.Card(
+                    content=ft.Container(
+                        content=ft.Row(
+                            [
+                                ft.Icon(ft.icons.GAVEL, color=ft.colors.RED, size=32),
+                                ft.Container(width=10),
+                                ft.Column(
+                                    [
+                                        self._sanction_title,
+                                        ft.Text(
+                                            "Puedes ver los detalles en la sección 'Mi Préstamo'.",
+                                            size=12,
+                                            color=ft.colors.GREY_700,
+                                        ),
+                                    ],
+                                    spacing=2,
+                                ),
+                                ft.Container(expand=True),
+                                
+                            ],
+                            alignment=ft.MainAxisAlignment.START,
                         ),
-                        elevation=2,
-                    )
+                        padding=ft.padding.all(12),
+                        bgcolor=ft.colors.RED_50,
+                        border_radius=6,
+                    ),
+                    elevation=2,
+                    margin=ft.margin.only(bottom=20),
+                    visible=blocked_until is not None,
+                )
+                self._sanction_banner = sanction_banner
 
             # Ahora construir body_content completo
 
@@ -342,7 +374,6 @@ class DashboardView(View):
 
             if sanction_banner:
                 body_controls.append(sanction_banner)
-                body_controls.append(ft.Container(height=20))
 
             body_controls.append(
                 ft.Card(
@@ -468,7 +499,7 @@ class DashboardView(View):
             
             # Ocultar navegación y mostrar pantalla de login
             self.app.nav_rail.visible = False
-            self.app.content_area.content = HomeView(self.app).build()
+            self.app.mount(HomeView(self.app))
             page.update()
 
         logout_btn = ft.ElevatedButton(
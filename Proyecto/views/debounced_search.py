@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from threading import Lock, Timer
+from typing import Any, Callable
+
+from events import LoanClosed, LoanOpened, subscribe
+
+# Cambia con cada préstamo o devolución confirmados (events.py). Los resultados
+# guardados con una generación anterior ya no reflejan la BD y se descartan.
+_write_generation = 0
+
+
+def _on_loan_event(_domain_event) -> None:
+    global _write_generation
+    _write_generation += 1
+
+
+subscribe(LoanOpened, _on_loan_event)
+subscribe(LoanClosed, _on_loan_event)
+
+
+class DebouncedSearch:
+    """Búsqueda *as-you-type* con debounce, cancelación y caché de prefijos.
+
+    Cada pulsación llama a :meth:`submit`; sólo la última consulta tras
+    ``delay`` segundos sin escribir se ejecuta, y lo hace en el hilo del
+    ``Timer`` (fuera del hilo de la UI). Si llega una consulta nueva mientras
+    otra sigue en curso, el resultado viejo se descarta en lugar de pintarse.
+    Los resultados recientes se guardan en una caché LRU con vencimiento, de
+    modo que borrar y volver a escribir un prefijo no repite la consulta; un
+    préstamo o una devolución confirmados invalidan esa caché.
+
+    ``search_fn(query)`` hace el trabajo pesado (consultas a la BD) y
+    ``on_result(query, result)`` actualiza los controles.
+    """
+
+    def __init__(
+        self,
+        search_fn: Callable[[str], Any],
+        on_result: Callable[[str, Any], None],
+        *,
+        delay: float = 0.3,
+        cache_size: int = 32,
+        cache_ttl: float = 30.0,
+    ) -> None:
+        self.search_fn = search_fn
+        self.on_result = on_result
+        self.delay = delay
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+
+        self._cache: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
+        self._generation = 0
+        self._timer: Timer | None = None
+        self._lock = Lock()
+        # Serializa las consultas: la sesión de BD no admite uso concurrente
+        self._run_lock = Lock()
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+    def submit(self, query: str | None) -> None:
+        """Programa la búsqueda de *query*, cancelando la pendiente (si existe)."""
+        query = (query or "").strip()
+
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            cached = self._get_cached(query)
+            if cached is None:
+                self._timer = Timer(self.delay, self._run, args=(query, generation))
+                self._timer.start()
+                return
+
+        # Resultado en caché: se entrega de inmediato sin tocar la BD
+        self.on_result(query, cached[2])
+
+    def on_change(self, e) -> None:
+        """Handler listo para ``ft.TextField.on_change``."""
+        self.submit(getattr(e.control, "value", ""))
+
+    def cancel(self) -> None:
+        """Cancela la búsqueda pendiente y descarta la que esté en curso."""
+        with self._lock:
+            self._generation += 1
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def clear_cache(self) -> None:
+        """Olvida los resultados guardados (p.ej. tras modificar datos)."""
+        with self._lock:
+            self._cache.clear()
+
+    # ------------------------------------------------------------------
+    # Helpers internos
+    # ------------------------------------------------------------------
+    def _is_current(self, generation: int) -> bool:
+        with self._lock:
+            return generation == self._generation
+
+    def _get_cached(self, query: str) -> tuple[float, int, Any] | None:
+        entry = self._cache.get(query)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > self.cache_ttl or entry[1] != _write_generation:
+            del self._cache[query]
+            return None
+        self._cache.move_to_end(query)
+        return entry
+
+    def _store(self, query: str, write_generation: int, result: Any) -> None:
+        with self._lock:
+            self._cache[query] = (time.monotonic(), write_generation, result)
+            self._cache.move_to_end(query)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _run(self, query: str, generation: int) -> None:
+        with self._run_lock:
+            # Otra pulsación llegó mientras esperábamos turno
+            if not self._is_current(generation):
+                return
+            # Tomada antes de consultar: una escritura durante la consulta la invalida
+            write_generation = _write_generation
+            result = self.search_fn(query)
+
+        self._store(query, write_generation, result)
+
+        # Descartar resultados obsoletos en lugar de pintarlos
+        if self._is_current(generation):
+            self.on_result(query, result)
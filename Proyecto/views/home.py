@@ -3,6 +3,7 @@ import flet as ft
 from models import UserRoleEnum, User
 from services import UserService
 
+from . import assets
 from .base import View
 
 
@@ -15,7 +16,6 @@ class HomeView(View):
     # ------------------------------------------------------------------
     def build(self) -> ft.Control:  # noqa: D401
         page = self.app.page
-        db = self.app.db
 
         # Si ya hay usuario logeado, redirige a dashboard
         if hasattr(self.app, "current_user_role") and self.app.current_user_role:
@@ -104,14 +104,16 @@ class HomeView(View):
                 if not cedula_field.value:
                     _set_status("Por favor ingrese su cédula", ft.colors.RED)
                     return
-                user = UserService.get_user_by_cedula(db, cedula_field.value)
+                with self.session() as db:
+                    user = UserService.get_user_by_cedula(db, cedula_field.value)
                 if not user or user.role != UserRoleEnum.usuario:
                     _set_status("Usuario no encontrado o rol inválido", ft.colors.RED)
                     return
                 self.app.current_user = user
             else:  # admin
                 # Para administradores, usar un usuario admin por defecto
-                admin_user = db.query(User).filter(User.role == UserRoleEnum.admin).first()
+                with self.session() as db:
+                    admin_user = db.query(User).filter(User.role == UserRoleEnum.admin).first()
                 if not admin_user:
                     _set_status("No se encontró un usuario administrador en el sistema", ft.colors.RED)
                     return
@@ -160,8 +162,8 @@ class HomeView(View):
                         ft.Container(
                             content=ft.Row(
                                 [
-                                    ft.Image(
-                                        src="vecirunlogo.png",
+                                    assets.image(
+                                        "vecirunlogo.png",
                                         width=40,
                                         height=40,
                                     ),
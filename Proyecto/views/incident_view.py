@@ -2,12 +2,13 @@ import flet as ft
 from datetime import datetime, timezone, timedelta
 from services import IncidentService
 from models import IncidentTypeEnum, IncidentSeverityEnum
+from .base import View
 
 # Zona horaria de Colombia (UTC-5)
 CO_TZ = timezone(timedelta(hours=-5))
 
 
-class IncidentView:
+class IncidentView(View):
     """Vista para generar incidentes durante la devolución"""
 
     def __init__(self, app: "VeciRunApp", loan_id, bike_id, user_id, minutes_late: int = 0):  # noqa: F821
@@ -25,13 +26,14 @@ class IncidentView:
         # Crear incidente automático si hay retraso
         if self.minutes_late > 15:
             try:
-                auto_incident = IncidentService.create_automatic_late_incident(
-                    db=self.app.db,
-                    loan_id=self.loan_id,
-                    bike_id=self.bike_id,
-                    reporter_id=self.user_id,
-                    minutes_late=self.minutes_late,
-                )
+                with self.session() as db:
+                    auto_incident = IncidentService.create_automatic_late_incident(
+                        db=db,
+                        loan_id=self.loan_id,
+                        bike_id=self.bike_id,
+                        reporter_id=self.user_id,
+                        minutes_late=self.minutes_late,
+                    )
                 self.incidents.append(auto_incident)
             except Exception as e:
                 print(f"Error al crear incidente automático: {e}")
@@ -110,15 +112,16 @@ class IncidentView:
                 return
 
             try:
-                incident = IncidentService.create_incident(
-                    db=self.app.db,
-                    loan_id=self.loan_id,
-                    bike_id=self.bike_id,
-                    reporter_id=self.user_id,
-                    incident_type=IncidentTypeEnum(incident_type_dropdown.value),
-                    severity=IncidentSeverityEnum(severity_dropdown.value),
-                    description=description_field.value,
-                )
+                with self.session() as db:
+                    incident = IncidentService.create_incident(
+                        db=db,
+                        loan_id=self.loan_id,
+                        bike_id=self.bike_id,
+                        reporter_id=self.user_id,
+                        incident_type=IncidentTypeEnum(incident_type_dropdown.value),
+                        severity=IncidentSeverityEnum(severity_dropdown.value),
+                        description=description_field.value,
+                    )
                 
                 self.incidents.append(incident)
                 
@@ -182,12 +185,14 @@ class IncidentView:
         def finalize_report(_):
             try:
                 # Crear reporte de devolución
-                self.return_report = IncidentService.create_return_report(
-                    db=self.app.db,
-                    loan_id=self.loan_id,
-                    created_by=self.user_id,
-                    incidents=self.incidents,
-                )
+                with self.session() as db:
+                    # Los incidentes se crearon en otras sesiones: asociarlos a ésta
+                    self.return_report = IncidentService.create_return_report(
+                        db=db,
+                        loan_id=self.loan_id,
+                        created_by=self.user_id,
+                        incidents=[db.merge(incident) for incident in self.incidents],
+                    )
                 
                 self.app.page.show_snack_bar(
                     ft.SnackBar(
@@ -198,7 +203,7 @@ class IncidentView:
                 
                 # Volver a la vista de devoluciones
                 from .return_view import ReturnView
-                self.app.content_area.content = ReturnView(self.app).build()
+                self.app.mount(ReturnView(self.app))
                 self.app.page.update()
                 
             except Exception as e:
@@ -279,5 +284,5 @@ class IncidentView:
 
     def show(self):
         """Muestra la vista de incidentes"""
-        self.app.content_area.content = self.build()
+        self.app.mount(self)
         self.app.page.update() 
\ No newline at end of file
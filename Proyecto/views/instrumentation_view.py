@@ -0,0 +1,90 @@
+import flet as ft
+
+import instrumentation
+
+from .base import View
+
+
+class InstrumentationView(View):
+    """Panel de administración con las consultas SQL por servicio y vista."""
+
+    COLUMNS = (
+        "Ámbito",
+        "Llamadas",
+        "Sentencias",
+        "Sent./llamada",
+        "Máx. sent.",
+        "SQL (ms)",
+        "Total (ms)",
+    )
+
+    def __init__(self, app: "VeciRunApp") -> None:  # noqa: F821
+        self.app = app
+        self.table = ft.DataTable(
+            columns=[ft.DataColumn(ft.Text(name)) for name in self.COLUMNS],
+            rows=[],
+        )
+
+    # ------------------------------------------------------------------
+    def build(self) -> ft.Control:  # noqa: D401
+        if not instrumentation.is_enabled():
+            return ft.Text(
+                "La instrumentación está desactivada. Inicie la aplicación con "
+                "VECIRUN_INSTRUMENTATION=1 para medir las consultas.",
+                size=16,
+                color=ft.colors.GREY_700,
+            )
+
+        self._fill_rows()
+        return ft.Column(
+            [
+                ft.Text("Rendimiento de consultas", size=24, weight=ft.FontWeight.BOLD),
+                ft.Text(
+                    "Totales inclusivos: una vista incluye las consultas de los servicios que usa.",
+                    color=ft.colors.GREY_600,
+                ),
+                ft.Row(
+                    [
+                        ft.ElevatedButton(
+                            "Actualizar", icon=ft.icons.REFRESH, on_click=self._refresh
+                        ),
+                        ft.ElevatedButton(
+                            "Reiniciar", icon=ft.icons.DELETE_SWEEP, on_click=self._reset
+                        ),
+                    ]
+                ),
+                ft.Column([self.table], scroll=ft.ScrollMode.AUTO, expand=True),
+            ],
+            expand=True,
+        )
+
+    # ------------------------------------------------------------------
+    def _fill_rows(self) -> None:
+        snapshot = instrumentation.stats.snapshot()
+        ordered = sorted(snapshot.items(), key=lambda kv: kv[1]["statements"], reverse=True)
+        self.table.rows = [
+            ft.DataRow(cells=[ft.DataCell(ft.Text(value)) for value in self._row(label, entry)])
+            for label, entry in ordered
+        ]
+
+    @staticmethod
+    def _row(label: str, entry: dict) -> list[str]:
+        calls = entry["calls"]
+        per_call = f"{entry['statements'] / calls:.1f}" if calls else "-"
+        return [
+            label,
+            str(calls),
+            str(entry["statements"]),
+            per_call,
+            str(entry["max_statements"]),
+            f"{entry['sql_ms']:.1f}",
+            f"{entry['wall_ms']:.1f}",
+        ]
+
+    def _refresh(self, _e=None) -> None:
+        self._fill_rows()
+        self.app.page.update()
+
+    def _reset(self, _e=None) -> None:
+        instrumentation.stats.reset()
+        self._refresh()
@@ -15,6 +15,8 @@ except ModuleNotFoundError:  # Entorno sin flet-material
 
     fm = _FMStub()  # type: ignore
 
+from events import LoanClosed, LoanOpened
+from models import BikeStatusEnum
 from services import (
     UserService,
     BicycleService,
@@ -24,6 +26,7 @@ from services import (
 )
 
 from .base import View
+from .debounced_search import DebouncedSearch
 
 
 class LoanView(View):
@@ -31,10 +34,15 @@ class LoanView(View):
 
     def __init__(self, app: "VeciRunApp") -> None:  # noqa: F821
         self.app = app
+        self._apply_live_event = None
+
+    def on_live_event(self, domain_event) -> bool:
+        if self._apply_live_event is None:
+            return False
+        return self._apply_live_event(domain_event)
 
     def build(self) -> ft.Control:  # noqa: D401
         page = self.app.page
-        db = self.app.db
 
         # -----------------------
         # Campos del formulario
@@ -48,6 +56,29 @@ class LoanView(View):
             prefix_icon=ft.icons.BADGE,
         )
 
+        # Nombre del usuario encontrado mientras se escribe la cédula
+        user_lookup_text = ft.Text("", size=12, color=ft.colors.GREY_600)
+
+        def _lookup_user(cedula: str):
+            if not cedula:
+                return None
+            # Se ejecuta en el hilo del Timer: sesión propia
+            with self.session() as db:
+                return UserService.get_user_by_cedula(db, cedula)
+
+        def _show_user_lookup(cedula: str, user) -> None:
+            if not cedula:
+                user_lookup_text.value = ""
+            elif user:
+                user_lookup_text.value = f"Usuario: {user.full_name}"
+                user_lookup_text.color = ft.colors.GREEN_700
+            else:
+                user_lookup_text.value = "Usuario no encontrado"
+                user_lookup_text.color = ft.colors.RED
+            page.update()
+
+        user_lookup = DebouncedSearch(_lookup_user, _show_user_lookup)
+
         station_opts = [
             ft.dropdown.Option("EST001", "EST001 - Calle 26"),
             ft.dropdown.Option("EST002", "EST002 - Salida al Uriel Gutiérrez"),
@@ -102,24 +133,36 @@ class LoanView(View):
 
         # --- Vincular actualizaciones de estado ---
         station_in.on_change = lambda e: _update_save_button()
-        user_cedula.on_change = lambda e: _update_save_button()
 
-        # Bicicletas disponibles en el sistema
-        available_bikes = BicycleService.get_available_bicycles(db)
 
-        # -------------------------------------------------
-        # Filtrar por estación asignada al administrador
-        # -------------------------------------------------
-        # Si el administrador tiene una estación asociada (sección de
-        # inicio de sesión), solo mostraremos las bicicletas ubicadas en
-        # dicha estación. Esto evita que el operador seleccione vehículos
-        # que no estén físicamente en su punto de entrega.
-        if current_station:
-            available_bikes = [
-                bike
-                for bike in available_bikes
-                if bike.current_station and bike.current_station.code == current_station
-            ]
+        def _on_cedula_change(_: ft.ControlEvent) -> None:  # noqa: D401
+            _update_save_button()
+            user_lookup.submit(user_cedula.value)
+
+        user_cedula.on_change = _on_cedula_change
+
+        with self.session() as db:
+            # Bicicletas disponibles en el sistema
+            available_bikes = BicycleService.get_available_bicycles(db)
+
+            # -------------------------------------------------
+            # Filtrar por estación asignada al administrador
+            # -------------------------------------------------
+            # Si el administrador tiene una estación asociada (sección de
+            # inicio de sesión), solo mostraremos las bicicletas ubicadas en
+            # dicha estación. Esto evita que el operador seleccione vehículos
+            # que no estén físicamente en su punto de entrega.
+            if current_station:
+                available_bikes = [
+                    bike
+                    for bike in available_bikes
+                    if bike.current_station and bike.current_station.code == current_station
+                ]
+
+            # Dueños de las bicicletas que son favoritas de alguien
+            favorite_owners = FavoriteBikeService.get_favorite_owners(
+                db, [bike.id for bike in available_bikes]
+            )
         # -----------------------------
         # Selección de bicicleta (cards)
         # -----------------------------
@@ -127,6 +170,8 @@ class LoanView(View):
         selected_bike: dict[str, str | None] = {"code": None}
 
         bike_card_map: dict[str, ft.Card] = {}
+        # Código de cada bicicleta mostrada, para ubicar su tarjeta por ID
+        bike_codes: dict = {}
 
         def _make_bike_select_handler(code: str):
             """Genera handler de click para seleccionar bicicleta."""
@@ -145,19 +190,15 @@ class LoanView(View):
 
             return _handler
 
-        bike_cards: list[ft.Card] = []
         CARD_W, CARD_H = 110, 110  # un poco más grande y legible
 
-        for bike in available_bikes:
+        def _make_bike_card(bike, favorite_owner) -> ft.Card:
             # Verificar si la bicicleta es favorita de alguien
-            is_favorite = FavoriteBikeService.is_bike_favorite(db, bike.id)
-            favorite_owner = None
-            if is_favorite:
-                favorite_owner = FavoriteBikeService.get_favorite_bike_owner(db, bike.id)
-            
+            is_favorite = favorite_owner is not None
+
             # Crear tooltip con información adicional
             tooltip_text = f"Serie: {bike.serial_number}"
-            if is_favorite and favorite_owner:
+            if is_favorite:
                 tooltip_text += f"\nFavorita de: {favorite_owner.full_name}"
             
             # Color de fondo según si es favorita
@@ -200,10 +241,11 @@ class LoanView(View):
                 ),
             )
             bike_card_map[bike.bike_code] = card
-            bike_cards.append(card)
+            bike_codes[bike.id] = bike.bike_code
+            return card
 
         bikes_grid = ft.Row(
-            controls=bike_cards,
+            controls=[_make_bike_card(bike, favorite_owners.get(bike.id)) for bike in available_bikes],
             wrap=True,
             spacing=8,
             run_spacing=8,
@@ -211,6 +253,56 @@ class LoanView(View):
 
         result_text = ft.Text("", color=ft.colors.GREEN)
 
+        # Resumen de ocupación de la estación (desde memoria, sin consultar la BD)
+        occupancy = getattr(self.app, "occupancy", None)
+        occupancy_text = ft.Text("", size=12, color=ft.colors.GREY_600)
+
+        def _update_occupancy_text() -> None:
+            station_id = occupancy.station_id(current_station) if occupancy else None
+            if station_id is None:
+                occupancy_text.value = ""
+                return
+            occupancy_text.value = (
+                f"En estación: {occupancy.available(station_id)} disponibles · "
+                f"{occupancy.borrowed(station_id)} prestadas"
+            )
+
+        _update_occupancy_text()
+
+        # -------------------------------------------------
+        # Préstamos y devoluciones de otras páginas (pubsub)
+        # -------------------------------------------------
+        def _apply_live_event(domain_event) -> bool:
+            if isinstance(domain_event, LoanOpened):
+                # La bicicleta salió: se retira sólo su tarjeta
+                code = bike_codes.pop(domain_event.bike_id, None)
+                if code is None:
+                    return False
+                bikes_grid.controls.remove(bike_card_map.pop(code))
+                _update_occupancy_text()
+                if selected_bike["code"] == code:
+                    selected_bike["code"] = None
+                    _update_save_button()
+                return True
+
+            if isinstance(domain_event, LoanClosed) and domain_event.bike_id not in bike_codes:
+                # Devolución: se agrega la tarjeta si la bicicleta quedó en esta estación
+                with self.session() as db:
+                    bike = BicycleService.get_bicycle_by_id(db, domain_event.bike_id)
+                    if not bike or bike.status != BikeStatusEnum.disponible:
+                        return False
+                    if current_station and (
+                        not bike.current_station or bike.current_station.code != current_station
+                    ):
+                        return False
+                    owner = FavoriteBikeService.get_favorite_owners(db, [bike.id]).get(bike.id)
+                bikes_grid.controls.append(_make_bike_card(bike, owner))
+                _update_occupancy_text()
+                return True
+            return False
+
+        self._apply_live_event = _apply_live_event
+
         # -------------------
         # Guardar préstamo
         # -------------------
@@ -231,46 +323,50 @@ class LoanView(View):
                 )
                 return
 
-            user = UserService.get_user_by_cedula(db, user_cedula.value)
-            if not user:
-                _set_result("Usuario no encontrado", ft.colors.RED)
-                return
-
-            # ==============================
-            # NUEVA VALIDACIÓN:
-            # ==============================
-            open_loans = LoanService.get_open_loans_by_user(db, user.id)
-            if open_loans:
-                _set_result("El usuario ya tiene un préstamo activo y no puede registrar otro.", ft.colors.RED)
-                return
-
-            bike = BicycleService.get_bicycle_by_code(db, selected_bike["code"])
-            if not bike:
-                _set_result("Bicicleta no encontrada", ft.colors.RED)
-                return
-            st_out = StationService.get_station_by_code(db, station_out.value)
-            st_in = StationService.get_station_by_code(db, station_in.value)
-            if not st_out or not st_in:
-                _set_result("Estación no encontrada", ft.colors.RED)
-                return
-
-            # Registrar préstamo
-            try:
-                LoanService.create_loan(
-                    db,
-                    user_id=user.id,
-                    bike_id=bike.id,
-                    station_out_id=st_out.id,
-                    station_in_id=st_in.id,
-                )
-            except ValueError as exc:
-                _set_result(str(exc), ft.colors.RED)
-                return
+            with self.session() as db:
+                user = UserService.get_user_by_cedula(db, user_cedula.value)
+                if not user:
+                    _set_result("Usuario no encontrado", ft.colors.RED)
+                    return
+
+                # ==============================
+                # NUEVA VALIDACIÓN:
+                # ==============================
+                open_loans = LoanService.get_open_loans_by_user(db, user.id)
+                if open_loans:
+                    _set_result("El usuario ya tiene un préstamo activo y no puede registrar otro.", ft.colors.RED)
+                    return
+
+                bike = BicycleService.get_bicycle_by_code(db, selected_bike["code"])
+                if not bike:
+                    _set_result("Bicicleta no encontrada", ft.colors.RED)
+                    return
+                st_out = StationService.get_station_by_code(db, station_out.value)
+                st_in = StationService.get_station_by_code(db, station_in.value)
+                if not st_out or not st_in:
+                    _set_result("Estación no encontrada", ft.colors.RED)
+                    return
+
+                # Registrar préstamo
+                try:
+                    LoanService.create_loan(
+                        db,
+                        user_id=user.id,
+                        bike_id=bike.id,
+                        station_out_id=st_out.id,
+                        station_in_id=st_in.id,
+                    )
+                except ValueError as exc:
+                    _set_result(str(exc), ft.colors.RED)
+                    return
 
             _set_result("Préstamo registrado exitosamente", ft.colors.GREEN)
             # Limpiar campos
             user_cedula.value = ""
+            user_lookup.cancel()
+            user_lookup_text.value = ""
             station_in.value = None  # station_out permanece fijo
+            _update_occupancy_text()
 
             # Reset selección de bicicleta
             selected_bike["code"] = None
@@ -339,6 +435,7 @@ class LoanView(View):
         form_controls = ft.Column(
             [
                 user_cedula,
+                user_lookup_text,
                 station_out,
                 station_in,
                 ft.Container(height=10),
@@ -350,6 +447,7 @@ class LoanView(View):
         bikes_section = ft.Column(
             [
                 ft.Text("Seleccione una bicicleta", size=16, weight=ft.FontWeight.BOLD),
+                occupancy_text,
                 ft.Container(height=8),
                 bikes_grid,
             ]
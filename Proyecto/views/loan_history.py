@@ -17,6 +17,7 @@ except ModuleNotFoundError:  # CI or environments without flet-material
 from services import LoanService, UserService
 from models import LoanStatusEnum
 from .base import View
+from .debounced_search import DebouncedSearch
 
 
 class LoanHistoryView(View):
@@ -29,7 +30,7 @@ class LoanHistoryView(View):
             hint_text="Ingrese la cédula del usuario",
             width=300,
             border_color=ft.colors.BLUE_400,
-            on_change=self.search_history,  # Real-time search on each keystroke
+            on_change=self._on_cedula_change,  # Debounced search while typing
             on_submit=self.search_history,  # Trigger search on Enter key press
             suffix=ft.IconButton(
                 icon=ft.icons.CLEAR,
@@ -47,23 +48,27 @@ class LoanHistoryView(View):
 
         self.user_info = ft.Text("", size=16, weight=ft.FontWeight.BOLD, color=ft.colors.BLUE_700)
 
+        # Keystrokes are coalesced and queried off the UI thread
+        self.debounced_search = DebouncedSearch(self._query_first_page, self._show_search_results)
+
         # ---------------------------------------------------------
-        # Pre-load loans for the current admin station (or all)
+        # Load only the first page for the current admin station (or all)
         # ---------------------------------------------------------
-        db = self.app.db
         self.station_code: str | None = getattr(self.app, "current_user_station", None)
 
-        if self.station_code:
-            self.all_loans = LoanService.get_loans_by_station_code(db, self.station_code)
-        else:
-            # Fallback to every loan in the system (e.g., when no station assigned)
-            self.all_loans = LoanService.get_all_loans(db)
-
-        # Initialize pagination
-        self.filtered_loans = self.all_loans
+        # Initialize pagination; loans are fetched page by page from the DB
+        self.query = ""
+        self.filtered_loans: list = []
+        self.total = 0
         self.page_size = 5
         self.current_page = 1
-        self.max_pages = max(1, (len(self.filtered_loans) + self.page_size - 1) // self.page_size)
+        self.max_pages = 1
+        # Keyset cursors: page number -> (time_out, id) of the last loan of the previous page
+        self._page_cursors: dict[int, tuple | None] = {1: None}
+
+    def _load_initial_page(self):
+        """Consulta la primera página; se hace en ``build`` y no al construir la vista"""
+        self._fetch_page()
 
         # Populate initial page of loans
         if self.filtered_loans:
@@ -73,27 +78,63 @@ class LoanHistoryView(View):
                 "No hay préstamos registrados para este punto", color=ft.colors.GREY_600, size=16
             )
 
-    def search_history(self, e):
-        """Search for loan history by cedula"""
-        query = self.cedula_input.value.strip()
+    def _fetch_page(self):
+        """Fetch the current page of loans (and the total count) from the database"""
+        with self.session() as db:
+            self.filtered_loans, self.total = LoanService.search_loans(
+                db,
+                station_code=self.station_code,
+                cedula_prefix=self.query,
+                page=self.current_page,
+                page_size=self.page_size,
+                after=self._page_cursors.get(self.current_page),
+            )
+        self.max_pages = max(1, (self.total + self.page_size - 1) // self.page_size)
 
-        if not query:
-            # Reset: show all loans
-            self.user_info.value = ""
-            self.filtered_loans = self.all_loans
-        else:
-            # Filter loans by cedula substring (case-insensitive)
-            self.filtered_loans = [ln for ln in self.all_loans if ln.user and query.lower() in ln.user.cedula.lower()]
+        if self.filtered_loans:
+            last = self.filtered_loans[-1]
+            self._page_cursors[self.current_page + 1] = (last.time_out, last.id)
 
-            if self.filtered_loans:
-                user = self.filtered_loans[0].user
-                self.user_info.value = f"Usuario: {user.full_name} - Cédula: {user.cedula}"
-            else:
-                self.user_info.value = ""
+    def _on_cedula_change(self, e):
+        """Schedule a debounced search for the current input value"""
+        self.debounced_search.submit(self.cedula_input.value)
+
+    def _query_first_page(self, query: str):
+        """Fetch the first page of loans matching *query* (runs off the UI thread)"""
+        with self.session() as db:
+            return LoanService.search_loans(
+                db,
+                station_code=self.station_code,
+                cedula_prefix=query,
+                page=1,
+                page_size=self.page_size,
+            )
+
+    def search_history(self, e):
+        """Search for loan history by cedula prefix"""
+        # An explicit search supersedes any pending keystroke search
+        self.debounced_search.cancel()
+        query = (self.cedula_input.value or "").strip()
+        self._show_search_results(query, self._query_first_page(query))
+
+    def _show_search_results(self, query: str, result):
+        """Render the first page of a search result"""
+        self.query = query
+        self.filtered_loans, self.total = result
 
         # Reset to first page and recalculate
         self.current_page = 1
-        self.max_pages = max(1, (len(self.filtered_loans) + self.page_size - 1) // self.page_size)
+        self._page_cursors = {1: None}
+        self.max_pages = max(1, (self.total + self.page_size - 1) // self.page_size)
+        if self.filtered_loans:
+            last = self.filtered_loans[-1]
+            self._page_cursors[2] = (last.time_out, last.id)
+
+        if self.query and self.filtered_loans:
+            user = self.filtered_loans[0].user
+            self.user_info.value = f"Usuario: {user.full_name} - Cédula: {user.cedula}"
+        else:
+            self.user_info.value = ""
 
         if not self.filtered_loans:
             self.results_container.content = ft.Text(
@@ -116,13 +157,9 @@ class LoanHistoryView(View):
         self.search_history(e)
 
     def update_results(self):
-        """Update results container based on current page and filtered loans"""
-        start = (self.current_page - 1) * self.page_size
-        end = start + self.page_size
-        page_loans = self.filtered_loans[start:end]
-
+        """Update results container with the loans of the current page"""
         # Build the current page list
-        slice_list = self.build_loan_history_list(page_loans)
+        slice_list = self.build_loan_history_list(self.filtered_loans)
 
         # Pagination controls
         pagination = ft.Row([
@@ -154,12 +191,14 @@ class LoanHistoryView(View):
         """Go to previous page of results"""
         if self.current_page > 1:
             self.current_page -= 1
+            self._fetch_page()
             self.update_results()
 
     def next_page(self, e):
         """Go to next page of results"""
         if self.current_page < self.max_pages:
             self.current_page += 1
+            self._fetch_page()
             self.update_results()
 
     def build_loan_history_list(self, loans: list) -> ft.Control:
@@ -254,7 +293,7 @@ class LoanHistoryView(View):
         # Calculate pagination header values
         start = (self.current_page - 1) * self.page_size + 1
         end = start + len(loans) - 1
-        total = len(self.filtered_loans)
+        total = self.total
 
         return ft.Column(
             [
@@ -277,6 +316,7 @@ class LoanHistoryView(View):
 
     def build(self) -> ft.Control:
         """Build the loan history view"""
+        self._load_initial_page()
         return ft.Column([
             ft.Text(
                 "Historial de Préstamos",
@@ -1,48 +1,44 @@
 import flet as ft
-from services import IncidentService
+from services import IncidentService, ReturnReportService, SanctionService
 from models import IncidentSeverityEnum
+from .base import View
 
 
-class ReturnReportView:
+class ReturnReportView(View):
     """Vista para mostrar reportes de devolución"""
 
+    PAGE_SIZE = 10
+
     def __init__(self, app: "VeciRunApp"):  # noqa: F821
         self.app = app
+        self.current_page = 1
 
     def build(self) -> ft.Control:
         """Construye la vista de reportes de devolución"""
-        
-        # Obtener todos los reportes de devolución
-        from models import ReturnReport, Loan, User, Incident
-        from sqlalchemy.orm import joinedload
-        
-        reports = (
-            self.app.db.query(ReturnReport)
-            .options(
-                joinedload(ReturnReport.loan).joinedload(Loan.user),
-                joinedload(ReturnReport.loan).joinedload(Loan.bike),
-                joinedload(ReturnReport.incidents),
-                joinedload(ReturnReport.creator),
-            )
-            .order_by(ReturnReport.created_at.desc())
-            .all()
-        )
 
         # ------------------------------------------------------------------
         # Filtrar reportes por estación cuando el usuario es administrador
         # ------------------------------------------------------------------
+        station_code = None
         current_role = getattr(self.app, "current_user_role", None)
         if current_role == "admin":
             station_code = getattr(self.app, "current_user_station", None)
-            if station_code:
-                reports = [
-                    r for r in reports
-                    if (
-                        (r.loan.station_in and r.loan.station_in.code == station_code)
-                        or (r.loan.station_out and r.loan.station_out.code == station_code)
-                    )
-                ]
-        
+
+        # Página actual con incidentes y sanciones precargados
+        with self.session() as db:
+            reports, total = ReturnReportService.get_reports_page(
+                db,
+                station_code=station_code,
+                page=self.current_page,
+                page_size=self.PAGE_SIZE,
+            )
+        self.max_pages = max(1, (total + self.PAGE_SIZE - 1) // self.PAGE_SIZE)
+
+        # La página actual pudo quedar fuera de rango (p.ej. tras un filtro)
+        if not reports and self.current_page > self.max_pages:
+            self.current_page = self.max_pages
+            return self.build()
+
         if not reports:
             return ft.Column([
                 ft.Text(
@@ -56,12 +52,8 @@ class ReturnReportView:
         report_cards = []
         
         for report in reports:
-            # Obtener incidentes del reporte
-            incidents = (
-                self.app.db.query(Incident)
-                .filter(Incident.return_report_id == report.id)
-                .all()
-            )
+            # Incidentes del reporte (precargados)
+            incidents = report.incidents
             
             # Crear lista de incidentes
             incidents_list = ft.Column(spacing=5)
@@ -72,12 +64,7 @@ class ReturnReportView:
                 )
 
                 # Verificar si ya existe una sanción para este incidente
-                from models import Sanction
-                existing_sanction = (
-                    self.app.db.query(Sanction)
-                    .filter(Sanction.incident_id == incident.id)
-                    .first()
-                )
+                existing_sanction = incident.sanctions[0] if incident.sanctions else None
 
                 # Definir el botón según exista o no la sanción
                 if existing_sanction:
@@ -153,7 +140,7 @@ class ReturnReportView:
                             ft.Column([
                                 ft.Text("Est. Llegada:", weight=ft.FontWeight.BOLD, size=12),
                                 ft.Text(
-                                    f"{report.loan.station_in.code} - {report.loan.station_in.name}" if report.loan.station_out else "-",
+                                    f"{report.loan.station_in.code} - {report.loan.station_in.name}" if report.loan.station_in else "-",
                                     size=12,
                                 ),
                             ], expand=True),
@@ -189,7 +176,7 @@ class ReturnReportView:
             ),
             ft.Divider(),
             ft.Text(
-                f"Total de reportes: {len(reports)}",
+                f"Total de reportes: {total}",
                 size=16,
                 color=ft.colors.GREY_600,
             ),
@@ -199,13 +186,35 @@ class ReturnReportView:
                 scroll=ft.ScrollMode.AUTO,
                 expand=True,
             ),
+            ft.Row([
+                ft.IconButton(
+                    icon=ft.icons.CHEVRON_LEFT,
+                    disabled=self.current_page == 1,
+                    on_click=self.prev_page,
+                ),
+                ft.Text(f"Página {self.current_page}/{self.max_pages}", weight=ft.FontWeight.BOLD),
+                ft.IconButton(
+                    icon=ft.icons.CHEVRON_RIGHT,
+                    disabled=self.current_page >= self.max_pages,
+                    on_click=self.next_page,
+                ),
+            ], alignment=ft.MainAxisAlignment.CENTER),
         ], expand=True, scroll=ft.ScrollMode.AUTO, spacing=10)
 
+    def prev_page(self, e):
+        """Ir a la página anterior de reportes"""
+        if self.current_page > 1:
+            self.current_page -= 1
+            self.show()
+
+    def next_page(self, e):
+        """Ir a la página siguiente de reportes"""
+        if self.current_page < self.max_pages:
+            self.current_page += 1
+            self.show()
+
     def _generate_sanction(self, incident):
         """Genera una sanción básica para el incidente proporcionado y muestra confirmación"""
-        from models import Sanction
-        from datetime import datetime, timedelta, timezone
-
         # Calcular duración en días basado en severidad
         days = IncidentService.SEVERITY_DAYS.get(incident.severity, 0)
         if days == 0:
@@ -223,18 +232,11 @@ class ReturnReportView:
         if current_user_obj is not None:
             operator_uuid = current_user_obj.id
 
-        sanction = Sanction(
-            user_id=incident.loan.user_id,
-            incident_id=incident.id,
-            operator_id=operator_uuid,
-            start_at=datetime.now(timezone.utc),
-            end_at=datetime.now(timezone.utc) + timedelta(days=days),
-        )
-        self.app.db.add(sanction)
-        self.app.db.commit()
+        with self.session() as db:
+            sanction = SanctionService.create_sanction(db, incident.id, operator_uuid, days)
 
         # Refrescar la vista para que el botón cambie a "Ver Sanción"
-        self.app.content_area.content = self.build()
+        self.app.mount(self)
         self.app.page.update()
 
         # Mostrar información de la sanción recién creada
@@ -243,7 +245,6 @@ class ReturnReportView:
     def _view_sanction(self, sanction):
         """Muestra un diálogo con los detalles de la sanción"""
         import datetime as _dt
-        from models import SanctionStatusEnum
 
         def _close(_):
             dialog.open = False
@@ -252,10 +253,9 @@ class ReturnReportView:
         status_text = sanction.status.value if hasattr(sanction.status, "value") else str(sanction.status)
 
         # Obtener datos del usuario para mostrar nombre y cédula
-        user_obj = getattr(sanction, "user", None)
-        if user_obj is None:
-            from models import User
-            user_obj = self.app.db.query(User).filter(User.id == sanction.user_id).first()
+        from models import User
+        with self.session() as db:
+            user_obj = db.get(User, sanction.user_id)
 
         user_line = "Desconocido"
         if user_obj is not None:
@@ -306,14 +306,13 @@ class ReturnReportView:
             response_field = ft.TextField(label="Respuesta a la apelación", multiline=True, width=400)
 
             def _resolve(approve: bool):  # noqa: D401
-                sanction.appeal_response = response_field.value.strip()
-                if approve:
-                    from datetime import datetime, timezone
-                    sanction.status = SanctionStatusEnum.expirada
-                    sanction.end_at = datetime.now(timezone.utc)
-                else:
-                    sanction.status = SanctionStatusEnum.activa
-                self.app.db.commit()
+                with self.session() as db:
+                    db_sanction = SanctionService.resolve_appeal(
+                        db, sanction.id, approve, response_field.value.strip()
+                    )
+                # Mantener coherente la copia mostrada en pantalla
+                for attr in ("appeal_response", "status", "end_at"):
+                    setattr(sanction, attr, getattr(db_sanction, attr))
                 _close(None)
                 self.app.page.snack_bar = ft.SnackBar(
                     content=ft.Text("Apelación resuelta."),
@@ -350,5 +349,5 @@ class ReturnReportView:
 
     def show(self):
         """Muestra la vista de reportes"""
-        self.app.content_area.content = self.build()
+        self.app.mount(self)
         self.app.page.update() 
\ No newline at end of file
@@ -13,6 +13,9 @@ except ModuleNotFoundError:  # Entorno sin flet-material (p.ej. CI)
 
     fm = _FMStub()  # type: ignore
 
+from sqlalchemy.orm import joinedload
+
+from events import LoanClosed, LoanOpened
 from services import UserService, StationService, LoanService
 
 from .base import View
@@ -23,6 +26,12 @@ class ReturnView(View):
 
     def __init__(self, app: "VeciRunApp") -> None:  # noqa: F821
         self.app = app
+        self._apply_live_event = None
+
+    def on_live_event(self, domain_event) -> bool:
+        if self._apply_live_event is None:
+            return False
+        return self._apply_live_event(domain_event)
 
     def build(self) -> ft.Control:  # noqa: D401
         """Construye la vista de devoluciones basadas en la estación del administrador.
@@ -34,7 +43,6 @@ class ReturnView(View):
         cierra al instante.
         """
         page = self.app.page
-        db = self.app.db
 
         # ------------------------------------------------------------------
         # Validación de contexto: se requiere estación asignada
@@ -47,37 +55,30 @@ class ReturnView(View):
                 size=16,
             )
 
-        station = StationService.get_station_by_code(db, station_code)
-        if not station:
-            return ft.Text(
-                f"Error: Estación desconocida: {station_code}",
-                color=ft.colors.RED,
-                size=16,
-            )
-
         # ------------------------------------------------------------------
         # Consultar préstamos abiertos previstos para esta estación
         # ------------------------------------------------------------------
         from models import LoanStatusEnum, Loan  # import local para evitar ciclos
 
-        open_loans: list[Loan] = (
-            db.query(Loan)
-            .filter(
-                Loan.status == LoanStatusEnum.abierto,
-                Loan.station_in_id == station.id,
-            )
-            .all()
-        )
-
-        if not open_loans:
-            return ft.Column(
-                [
-                    ft.Text(
-                        f"No hay devoluciones pendientes para la estación {station.code} - {station.name}.",
-                        size=18,
-                        color=ft.colors.GREY_700,
+        with self.session() as db:
+            station = StationService.get_station_by_code(db, station_code)
+            open_loans: list[Loan] = []
+            if station:
+                open_loans = (
+                    db.query(Loan)
+                    .options(joinedload(Loan.user), joinedload(Loan.bike))
+                    .filter(
+                        Loan.status == LoanStatusEnum.abierto,
+                        Loan.station_in_id == station.id,
                     )
-                ]
+                    .all()
+                )
+
+        if not station:
+            return ft.Text(
+                f"Error: Estación desconocida: {station_code}",
+                color=ft.colors.RED,
+                size=16,
             )
 
         # ------------------------------------------------------------------
@@ -101,32 +102,33 @@ class ReturnView(View):
         # ------------------------------------------------------------------
         # Generar las filas de préstamos
         # ------------------------------------------------------------------
-        loan_rows: list[ft.Control] = []
+        loan_tiles: dict = {}  # loan_id -> ft.Card
 
         def _make_return_handler(loan_id):
             def _handler(_: ft.ControlEvent):
                 try:
-                    # Obtener el préstamo antes de devolverlo
-                    loan = LoanService.get_loan_by_id(db, loan_id)
-                    if not loan:
-                        _set_result("Préstamo no encontrado", ft.colors.RED)
-                        return
+                    with self.session() as db:
+                        # Obtener el préstamo antes de devolverlo
+                        loan = LoanService.get_loan_by_id(db, loan_id)
+                        if not loan:
+                            _set_result("Préstamo no encontrado", ft.colors.RED)
+                            return
                     
-                    # Calcular minutos de retraso
-                    minutes_late = 0
-                    if loan.time_out:
-                        loan_time = loan.time_out
-                        if loan_time.tzinfo is None:
-                            loan_time = loan_time.replace(tzinfo=CO_TZ)
-                        minutes_late = int((now - loan_time).total_seconds() // 60)
-                        if minutes_late <= 15:  # No es tardío
-                            minutes_late = 0
+                        # Calcular minutos de retraso
+                        minutes_late = 0
+                        if loan.time_out:
+                            loan_time = loan.time_out
+                            if loan_time.tzinfo is None:
+                                loan_time = loan_time.replace(tzinfo=CO_TZ)
+                            minutes_late = int((now - loan_time).total_seconds() // 60)
+                            if minutes_late <= 15:  # No es tardío
+                                minutes_late = 0
                     
-                    # Registrar la devolución solo si no está cerrado
-                    if loan.status == LoanStatusEnum.abierto:
-                        LoanService.return_loan(db, loan_id=loan_id, station_in_id=station.id)
-                    else:
-                        print(f"Préstamo ya está cerrado con status: {loan.status}")
+                        # Registrar la devolución solo si no está cerrado
+                        if loan.status == LoanStatusEnum.abierto:
+                            LoanService.return_loan(db, loan_id=loan_id, station_in_id=station.id)
+                        else:
+                            print(f"Préstamo ya está cerrado con status: {loan.status}")
                     
                     # Redirigir a la vista de incidentes
                     print("Creando vista de incidentes con:")
@@ -166,7 +168,7 @@ class ReturnView(View):
 
         now = datetime.now(CO_TZ)
 
-        for loan in open_loans:
+        def _make_loan_tile(loan) -> ft.Card:
             user_label = f"{loan.user.full_name} (CC {loan.user.cedula})"
             bike_label = loan.bike.bike_code
             date_label = loan.time_out.strftime("%d/%m/%Y %H:%M") if loan.time_out else "-"
@@ -179,7 +181,7 @@ class ReturnView(View):
                 loan_time = loan.time_out
                 if loan_time.tzinfo is None:
                     loan_time = loan_time.replace(tzinfo=CO_TZ)
-                minutes_elapsed = int((now - loan_time).total_seconds() // 60)
+                minutes_elapsed = int((datetime.now(CO_TZ) - loan_time).total_seconds() // 60)
                 is_late = minutes_elapsed > ALERT_MINUTES
 
             # Alerta visual si es tardío
@@ -227,7 +229,50 @@ class ReturnView(View):
                 ),
                 margin=ft.margin.only(bottom=10),
             )
-            loan_rows.append(tile)
+            loan_tiles[loan.id] = tile
+            return tile
+
+        loan_rows = ft.Column(
+            [_make_loan_tile(loan) for loan in open_loans],
+            spacing=5,
+            scroll=ft.ScrollMode.AUTO,
+            expand=True,
+        )
+        empty_text = ft.Text(
+            f"No hay devoluciones pendientes para la estación {station.code} - {station.name}.",
+            size=18,
+            color=ft.colors.GREY_700,
+            visible=not open_loans,
+        )
+
+        # ------------------------------------------------------------------
+        # Préstamos y devoluciones de otras páginas (pubsub)
+        # ------------------------------------------------------------------
+        def _apply_live_event(domain_event) -> bool:
+            if isinstance(domain_event, LoanClosed):
+                # Préstamo devuelto (aquí o en otra estación): se retira su fila
+                tile = loan_tiles.pop(domain_event.loan_id, None)
+                if tile is None:
+                    return False
+                loan_rows.controls.remove(tile)
+            elif isinstance(domain_event, LoanOpened) and domain_event.station_in_id == station.id:
+                # Nuevo préstamo con llegada prevista en esta estación
+                with self.session() as db:
+                    loan = (
+                        db.query(Loan)
+                        .options(joinedload(Loan.user), joinedload(Loan.bike))
+                        .filter(Loan.id == domain_event.loan_id, Loan.status == LoanStatusEnum.abierto)
+                        .first()
+                    )
+                if loan is None or loan.id in loan_tiles:
+                    return False
+                loan_rows.controls.append(_make_loan_tile(loan))
+            else:
+                return False
+            empty_text.visible = not loan_tiles
+            return True
+
+        self._apply_live_event = _apply_live_event
 
         # ------------------------------------------------------------------
         # Layout final
@@ -240,7 +285,8 @@ class ReturnView(View):
                     weight=ft.FontWeight.BOLD,
                 ),
                 ft.Divider(),
-                ft.Column(loan_rows, spacing=5, scroll=ft.ScrollMode.AUTO, expand=True),
+                empty_text,
+                loan_rows,
                 ft.Container(height=20),
                 result_text,
             ],
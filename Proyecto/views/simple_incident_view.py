@@ -43,11 +43,11 @@ class SimpleIncidentView:
     def _go_back(self, _):
         """Volver a la vista de devoluciones"""
         from .return_view import ReturnView
-        self.app.content_area.content = ReturnView(self.app).build()
+        self.app.mount(ReturnView(self.app))
         self.app.page.update()
 
     def show(self):
         """Muestra la vista de incidentes"""
         print("SimpleIncidentView.show() llamado")
-        self.app.content_area.content = self.build()
+        self.app.mount(self)
         self.app.page.update() 
\ No newline at end of file